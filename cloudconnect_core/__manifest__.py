@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 {
     'name': 'CloudConnect Core',
-    'version': '17.0.1.0.0',
+    'version': '17.0.1.0.1',
     'category': 'Hospitality',
     'summary': 'Core module for Cloudbeds PMS integration',
     'description': """
@@ -35,6 +35,7 @@ This module serves as the foundation for all CloudConnect extension modules.
         
         # Wizards
         'wizards/cloudconnect_setup_wizard_views.xml',
+        'wizards/cloudconnect_sync_log_export_wizard_views.xml',
         
         # Views - Ordenadas para que las acciones se definan antes de ser referenciadas
         'views/cloudconnect_property_views.xml',  # Define action_cloudconnect_property
@@ -1,3 +1,4 @@
 # -*- coding: utf-8 -*-
 
-from . import webhook_controller
\ No newline at end of file
+from . import webhook_controller
+from . import sync_log_export_controller
\ No newline at end of file
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+from odoo import http
+from odoo.http import request, content_disposition
+from werkzeug.exceptions import NotFound
+import csv
+import io
+import logging
+
+_logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+class _StreamSink(io.RawIOBase):
+    """Write-only file object collecting the bytes written since the last drain."""
+    
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+    
+    def writable(self):
+        return True
+    
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self):
+        return self._position
+    
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class CloudConnectSyncLogExportController(http.Controller):
+    """Controller streaming sync log exports."""
+    
+    @http.route('/cloudconnect/sync_log/export/<int:wizard_id>', type='http', auth='user')
+    def export_sync_logs(self, wizard_id, **kwargs):
+        """
+        Stream the sync logs selected in an export wizard.
+        
+        Rows are read through a server-side cursor, cloudconnect.export_itersize
+        rows at a time, and written out as they arrive, so memory use does not
+        depend on the size of the exported range.
+        """
+        wizard = request.env['cloudconnect.sync.log.export.wizard'].browse(wizard_id).exists()
+        if not wizard:
+            raise NotFound()
+            
+        ICP = request.env['ir.config_parameter'].sudo()
+        itersize = int(ICP.get_param('cloudconnect.export_itersize', '2000'))
+        query = wizard._get_export_query()
+        columns = wizard._get_columns()
+        batches = self._fetch_batches(request.env.registry, query, itersize)
+        
+        if wizard.file_format == 'csv':
+            body = self._stream_csv(columns, batches)
+            content_type = 'text/csv; charset=utf-8'
+        elif wizard.file_format == 'parquet':
+            body = self._stream_parquet(columns, batches)
+            content_type = 'application/vnd.apache.parquet'
+        else:
+            body = self._stream_arrow(columns, batches)
+            content_type = 'application/vnd.apache.arrow.stream'
+            
+        _logger.info(f"Streaming {wizard.file_format} export of sync logs for user {request.env.uid}")
+        return request.make_response(body, headers=[
+            ('Content-Type', content_type),
+            ('Content-Disposition', content_disposition(wizard._get_filename())),
+        ])
+    
+    def _fetch_batches(self, registry, query, itersize):
+        """
+        Yield lists of rows from a named (server-side) cursor.
+        
+        The response body is consumed after the request cursor is closed, so
+        rows are read with a dedicated cursor opened by the generator itself.
+        """
+        with registry.cursor() as cr:
+            named_cursor = cr._cnx.cursor(name='cloudconnect_sync_log_export')
+            named_cursor.itersize = itersize
+            try:
+                named_cursor.execute(query.code, query.params)
+                while True:
+                    rows = named_cursor.fetchmany(itersize)
+                    if not rows:
+                        break
+                    yield rows
+            finally:
+                named_cursor.close()
+    
+    def _stream_csv(self, columns, batches):
+        """Yield the CSV export, one chunk per batch of rows."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow([column for column, _type in columns])
+        
+        for rows in batches:
+            writer.writerows(rows)
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+            
+        # Header only when no row matched
+        if buffer.tell():
+            yield buffer.getvalue().encode('utf-8')
+    
+    def _get_arrow_schema(self, columns):
+        """Build the Arrow schema of the exported columns."""
+        types = {
+            'int64': pyarrow.int64(),
+            'float64': pyarrow.float64(),
+            'string': pyarrow.string(),
+            'timestamp': pyarrow.timestamp('us'),
+        }
+        return pyarrow.schema([(column, types[type_name]) for column, type_name in columns])
+    
+    def _to_record_batch(self, schema, rows):
+        """Convert a batch of rows to an Arrow record batch."""
+        return pyarrow.RecordBatch.from_arrays(
+            [
+                pyarrow.array([row[index] for row in rows], type=field.type)
+                for index, field in enumerate(schema)
+            ],
+            schema=schema,
+        )
+    
+    def _stream_parquet(self, columns, batches):
+        """Yield the Parquet export, one row group per batch of rows."""
+        schema = self._get_arrow_schema(columns)
+        sink = _StreamSink()
+        writer = pyarrow.parquet.ParquetWriter(sink, schema)
+        
+        for rows in batches:
+            writer.write_table(pyarrow.Table.from_batches([self._to_record_batch(schema, rows)]))
+            yield sink.drain()
+            
+        writer.close()
+        yield sink.drain()
+    
+    def _stream_arrow(self, columns, batches):
+        """Yield the export as an Arrow IPC stream, one record batch at a time."""
+        schema = self._get_arrow_schema(columns)
+        sink = _StreamSink()
+        writer = pyarrow.ipc.new_stream(sink, schema)
+        
+        for rows in batches:
+            writer.write_batch(self._to_record_batch(schema, rows))
+            yield sink.drain()
+            
+        writer.close()
+        yield sink.drain()
\ No newline at end of file
@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    """Drop the display_name column of sync logs, no longer stored."""
+    cr.execute("ALTER TABLE cloudconnect_sync_log DROP COLUMN IF EXISTS display_name")
+    _logger.info("Dropped the stored display_name column of cloudconnect_sync_log")
\ No newline at end of file
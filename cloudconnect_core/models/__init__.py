@@ -3,4 +3,8 @@
 from . import cloudconnect_config
 from . import cloudconnect_property
 from . import cloudconnect_webhook
-from . import cloudconnect_sync_log
\ No newline at end of file
+from . import cloudconnect_sync_log
+from . import cloudconnect_sync_log_rollup
+from . import cloudconnect_sync_log_spool
+from . import cloudconnect_sync_fingerprint
+from . import cloudconnect_sync_checkpoint
\ No newline at end of file
@@ -85,6 +85,17 @@ class CloudConnectProperty(models.Model):
         readonly=True
     )
     
+    sync_interval_hours = fields.Float(
+        string='Sync Interval (hours)',
+        readonly=True,
+        help='Interval between scheduled syncs, adapted to the activity of the property'
+    )
+    
+    next_sync_date = fields.Datetime(
+        string='Next Scheduled Sync',
+        readonly=True
+    )
+    
     # Related records counts
     sync_log_count = fields.Integer(
         string='Sync Logs',
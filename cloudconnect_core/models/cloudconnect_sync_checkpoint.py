@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api
+from datetime import timedelta
+import json
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class CloudConnectSyncCheckpoint(models.Model):
+    _name = 'cloudconnect.sync.checkpoint'
+    _description = 'CloudConnect Synchronization Checkpoint'
+    _rec_name = 'operation'
+    _order = 'property_id, id'
+    
+    property_id = fields.Many2one(
+        'cloudconnect.property',
+        string='Property',
+        required=True,
+        ondelete='cascade'
+    )
+    
+    operation = fields.Char(
+        string='Operation',
+        required=True,
+        help='Sync operation this checkpoint belongs to (e.g. Reservations)'
+    )
+    
+    state = fields.Selection([
+        ('running', 'Running'),
+        ('done', 'Done'),
+    ], string='State', required=True, default='running')
+    
+    page_number = fields.Integer(
+        string='Last Committed Page',
+        default=0,
+        help='Last page whose records were processed and committed'
+    )
+    
+    cursor = fields.Text(
+        string='Cursor',
+        help='JSON filters of the interrupted run, reused so a resumed run reads the same window'
+    )
+    
+    records_processed = fields.Integer(
+        string='Records Processed',
+        default=0
+    )
+    
+    started_at = fields.Datetime(
+        string='Started At',
+        default=fields.Datetime.now
+    )
+    
+    _sql_constraints = [
+        ('operation_unique', 'unique(property_id, operation)',
+         'Only one checkpoint per property and operation is allowed.'),
+    ]
+    
+    @api.model
+    def get_resume_state(self, property_record):
+        """
+        Return checkpoints left behind by an interrupted sync of a property.
+        
+        Checkpoints older than cloudconnect.checkpoint_max_age_hours are
+        discarded so a very old failure does not pin the sync window forever.
+        
+        :param property_record: cloudconnect.property record
+        :return: Dictionary mapping operation name to checkpoint record
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        max_age_hours = int(ICP.get_param('cloudconnect.checkpoint_max_age_hours', '24'))
+        checkpoints = self.search([('property_id', '=', property_record.id)])
+        
+        stale = checkpoints.filtered(
+            lambda c: c.started_at < fields.Datetime.now() - timedelta(hours=max_age_hours)
+        )
+        if stale:
+            _logger.info(f"Discarding {len(stale)} stale sync checkpoints for {property_record.name}")
+            stale.unlink()
+            
+        return {checkpoint.operation: checkpoint for checkpoint in checkpoints - stale}
+    
+    @api.model
+    def begin(self, property_record, operation, cursor):
+        """
+        Start or resume a paginated operation.
+        
+        A running checkpoint is resumed. A done one, left over when the
+        operation runs outside sync_property(), is reset for a fresh run:
+        there is only one checkpoint per property and operation.
+        
+        :param property_record: cloudconnect.property record
+        :param operation: Operation name
+        :param cursor: Dictionary of filters for a fresh run
+        :return: cloudconnect.sync.checkpoint record
+        """
+        checkpoint = self.search([
+            ('property_id', '=', property_record.id),
+            ('operation', '=', operation),
+        ], limit=1)
+        
+        if checkpoint.state == 'running':
+            _logger.info(
+                f"Resuming {operation} for {property_record.name} after page {checkpoint.page_number}"
+            )
+            return checkpoint
+            
+        if checkpoint:
+            checkpoint.write({
+                'state': 'running',
+                'page_number': 0,
+                'cursor': json.dumps(cursor),
+                'records_processed': 0,
+                'started_at': fields.Datetime.now(),
+            })
+            return checkpoint
+            
+        return self.create({
+            'property_id': property_record.id,
+            'operation': operation,
+            'cursor': json.dumps(cursor),
+        })
+    
+    def get_cursor(self):
+        """Return the stored filters as a dictionary."""
+        self.ensure_one()
+        return json.loads(self.cursor) if self.cursor else {}
+    
+    def advance(self, page_number, record_count):
+        """Record that a page has been fully processed."""
+        self.ensure_one()
+        self.write({
+            'page_number': page_number,
+            'records_processed': self.records_processed + record_count,
+        })
+    
+    @api.model
+    def mark_done(self, property_record, operation):
+        """Flag an operation as completed within the current run."""
+        checkpoint = self.search([
+            ('property_id', '=', property_record.id),
+            ('operation', '=', operation),
+        ], limit=1)
+        
+        if checkpoint:
+            checkpoint.state = 'done'
+        else:
+            self.create({
+                'property_id': property_record.id,
+                'operation': operation,
+                'state': 'done',
+            })
+    
+    @api.model
+    def clear(self, property_record):
+        """
+        Remove checkpoints of completed operations once a run finishes.
+        
+        Checkpoints of operations that failed are kept so the next run picks
+        them up from their last committed page.
+        """
+        self.search([
+            ('property_id', '=', property_record.id),
+            ('state', '=', 'done'),
+        ]).unlink()
\ No newline at end of file
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api
+from odoo.tools import SQL
+import hashlib
+import json
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class CloudConnectSyncFingerprint(models.Model):
+    _name = 'cloudconnect.sync.fingerprint'
+    _description = 'CloudConnect Record Fingerprint'
+    _rec_name = 'cloudbeds_id'
+    _order = 'property_id, entity_type, cloudbeds_id'
+    
+    property_id = fields.Many2one(
+        'cloudconnect.property',
+        string='Property',
+        required=True,
+        ondelete='cascade'
+    )
+    
+    entity_type = fields.Selection([
+        ('room_type', 'Room Type'),
+        ('room', 'Room'),
+        ('guest', 'Guest'),
+        ('reservation', 'Reservation'),
+    ], string='Entity Type', required=True)
+    
+    cloudbeds_id = fields.Char(
+        string='Cloudbeds ID',
+        required=True,
+        help='ID of the object in Cloudbeds'
+    )
+    
+    fingerprint = fields.Char(
+        string='Fingerprint',
+        required=True,
+        help='SHA-256 hash of the normalized Cloudbeds payload'
+    )
+    
+    last_changed = fields.Datetime(
+        string='Last Changed',
+        default=fields.Datetime.now,
+        help='Last time a different payload was received for this record'
+    )
+    
+    _sql_constraints = [
+        ('entity_unique', 'unique(property_id, entity_type, cloudbeds_id)',
+         'A fingerprint already exists for this Cloudbeds record.'),
+    ]
+    
+    # Payload keys that change on every fetch without the record itself changing
+    _VOLATILE_KEYS = frozenset([
+        'dateModified',
+        'dateModifiedUTC',
+        'lastUpdated',
+        'timestamp',
+    ])
+    
+    @api.model
+    def _normalize_payload(self, payload):
+        """Strip volatile keys so only meaningful changes alter the hash."""
+        if isinstance(payload, dict):
+            return {
+                key: self._normalize_payload(value)
+                for key, value in payload.items()
+                if key not in self._VOLATILE_KEYS
+            }
+        if isinstance(payload, (list, tuple)):
+            return [self._normalize_payload(value) for value in payload]
+        return payload
+    
+    @api.model
+    def compute_fingerprint(self, payload):
+        """Return a stable hash of a Cloudbeds payload."""
+        normalized = json.dumps(
+            self._normalize_payload(payload),
+            sort_keys=True,
+            separators=(',', ':'),
+            default=str,
+        )
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+    
+    @api.model
+    def split_changed(self, property_record, entity_type, records, id_key):
+        """
+        Separate changed records from those whose fingerprint is unchanged.
+        
+        Fingerprints are looked up with a single query for the whole batch and
+        nothing is written; call store_fingerprints() once the changed records
+        have been processed.
+        
+        :param property_record: cloudconnect.property record
+        :param entity_type: Entity type key (see entity_type selection)
+        :param records: List of Cloudbeds payload dictionaries
+        :param id_key: Payload key holding the Cloudbeds ID
+        :return: Tuple (changed, unchanged_count) where changed is a list of
+                 (payload, cloudbeds_id, fingerprint) tuples
+        """
+        candidates = []
+        for payload in records:
+            cloudbeds_id = payload.get(id_key) if isinstance(payload, dict) else None
+            candidates.append((
+                payload,
+                str(cloudbeds_id) if cloudbeds_id not in (None, '') else False,
+                self.compute_fingerprint(payload),
+            ))
+            
+        known_ids = [cb_id for _payload, cb_id, _hash in candidates if cb_id]
+        stored = {}
+        if known_ids:
+            for fp in self.search_read([
+                ('property_id', '=', property_record.id),
+                ('entity_type', '=', entity_type),
+                ('cloudbeds_id', 'in', known_ids),
+            ], ['cloudbeds_id', 'fingerprint']):
+                stored[fp['cloudbeds_id']] = fp['fingerprint']
+                
+        changed = []
+        unchanged_count = 0
+        for payload, cloudbeds_id, fingerprint in candidates:
+            # Records without an ID cannot be tracked and are always processed
+            if cloudbeds_id and stored.get(cloudbeds_id) == fingerprint:
+                unchanged_count += 1
+            else:
+                changed.append((payload, cloudbeds_id, fingerprint))
+                
+        return changed, unchanged_count
+    
+    @api.model
+    def store_fingerprints(self, property_record, entity_type, changed):
+        """
+        Persist fingerprints for records returned by split_changed().
+        
+        Known records are updated with a single UPDATE statement and new ones
+        are created in one batch, so a page costs two queries at most.
+        
+        :param property_record: cloudconnect.property record
+        :param entity_type: Entity type key
+        :param changed: List of (payload, cloudbeds_id, fingerprint) tuples
+        """
+        latest = {
+            cloudbeds_id: fingerprint
+            for _payload, cloudbeds_id, fingerprint in changed
+            if cloudbeds_id
+        }
+        if not latest:
+            return
+            
+        self.flush_model()
+        now = self.env.cr.now()
+        rows = SQL(', ').join(
+            SQL('(%s, %s)', cloudbeds_id, fingerprint)
+            for cloudbeds_id, fingerprint in latest.items()
+        )
+        self.env.cr.execute(SQL("""
+            UPDATE %(table)s AS fp
+               SET fingerprint = v.fingerprint,
+                   last_changed = %(now)s,
+                   write_uid = %(uid)s,
+                   write_date = %(now)s
+              FROM (VALUES %(rows)s) AS v(cloudbeds_id, fingerprint)
+             WHERE fp.property_id = %(property_id)s
+               AND fp.entity_type = %(entity_type)s
+               AND fp.cloudbeds_id = v.cloudbeds_id
+         RETURNING fp.id, fp.cloudbeds_id
+        """,
+            table=SQL.identifier(self._table),
+            now=now,
+            uid=self.env.uid,
+            rows=rows,
+            property_id=property_record.id,
+            entity_type=entity_type,
+        ))
+        updated = self.env.cr.fetchall()
+        if updated:
+            self.browse([fp_id for fp_id, _cb_id in updated]).invalidate_recordset()
+        for _fp_id, cloudbeds_id in updated:
+            latest.pop(cloudbeds_id)
+            
+        if latest:
+            self.create([{
+                'property_id': property_record.id,
+                'entity_type': entity_type,
+                'cloudbeds_id': cloudbeds_id,
+                'fingerprint': fingerprint,
+                'last_changed': now,
+            } for cloudbeds_id, fingerprint in latest.items()])
+    
+    @api.model
+    def reset_fingerprints(self, property_record, entity_type=None):
+        """Forget stored fingerprints so the next sync processes every record."""
+        domain = [('property_id', '=', property_record.id)]
+        if entity_type:
+            domain.append(('entity_type', '=', entity_type))
+        self.search(domain).unlink()
\ No newline at end of file
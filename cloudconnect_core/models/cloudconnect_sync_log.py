@@ -1,9 +1,15 @@
 # -*- coding: utf-8 -*-
 
 from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+from odoo.tools import SQL, sql
+from odoo.tools.sql import create_index, drop_index
 from datetime import datetime, timedelta
+from dateutil.relativedelta import relativedelta
 import json
 import logging
+import re
+import time
 
 _logger = logging.getLogger(__name__)
 
@@ -12,7 +18,7 @@ class CloudConnectSyncLog(models.Model):
     _name = 'cloudconnect.sync.log'
     _description = 'CloudConnect Synchronization Log'
     _order = 'sync_date desc'
-    _rec_name = 'display_name'
+    _rec_name = 'model_name'
     
     # Basic fields
     operation_type = fields.Selection([
@@ -21,7 +27,7 @@ class CloudConnectSyncLog(models.Model):
         ('webhook', 'Webhook Triggered'),
         ('api_call', 'API Call'),
         ('token_refresh', 'Token Refresh'),
-    ], string='Operation Type', required=True, index=True)
+    ], string='Operation Type', required=True)
     
     model_name = fields.Char(
         string='Model',
@@ -54,7 +60,7 @@ class CloudConnectSyncLog(models.Model):
         ('success', 'Success'),
         ('error', 'Error'),
         ('warning', 'Warning'),
-    ], string='Status', required=True, default='pending', index=True)
+    ], string='Status', required=True, default='pending')
     
     # Related records
     config_id = fields.Many2one(
@@ -66,8 +72,7 @@ class CloudConnectSyncLog(models.Model):
     
     property_id = fields.Many2one(
         'cloudconnect.property',
-        string='Property',
-        index=True
+        string='Property'
     )
     
     # Details
@@ -79,13 +84,17 @@ class CloudConnectSyncLog(models.Model):
         string='Warning Message'
     )
     
+    # Large JSON payloads are only loaded when actually read, not prefetched
+    # along with the other fields of list and dashboard rows
     request_data = fields.Text(
         string='Request Data',
+        prefetch=False,
         help='JSON data sent in the request'
     )
     
     response_data = fields.Text(
         string='Response Data',
+        prefetch=False,
         help='JSON data received in the response'
     )
     
@@ -101,6 +110,14 @@ class CloudConnectSyncLog(models.Model):
         help='API endpoint that was called'
     )
     
+    http_method = fields.Selection([
+        ('GET', 'GET'),
+        ('POST', 'POST'),
+        ('PUT', 'PUT'),
+        ('PATCH', 'PATCH'),
+        ('DELETE', 'DELETE'),
+    ], string='HTTP Method', help='HTTP method of the API call, used to replay it')
+    
     http_status = fields.Integer(
         string='HTTP Status Code'
     )
@@ -133,22 +150,397 @@ class CloudConnectSyncLog(models.Model):
         string='Next Retry'
     )
     
-    # Display
-    display_name = fields.Char(
-        string='Display Name',
-        compute='_compute_display_name',
-        store=True
-    )
+    def init(self):
+        """
+        Create the indexes backing the hot sync log queries.
+        
+        status, operation_type and property_id have no single-column index:
+        they are low-cardinality or lead a composite index below, and every
+        extra index slows down the log inserts. See
+        scripts/benchmark_sync_log_indexes.py for the query plans.
+        
+        This runs on every module update: it must stay idempotent and cheap.
+        Converting the table to partitions is an explicit maintenance step,
+        see scripts/partition_sync_log.py.
+        """
+        super().init()
+        for field_name in ('status', 'operation_type', 'property_id'):
+            drop_index(self._cr, f'{self._table}__{field_name}_index', self._table)
+        # Retry cron: failed operations due for retry, per configuration
+        create_index(
+            self._cr,
+            'cloudconnect_sync_log_retry_idx',
+            self._table,
+            ['config_id', 'next_retry'],
+            where="status = 'error' AND next_retry IS NOT NULL",
+        )
+        # Sync history, webhook activity and API calls of a property
+        create_index(
+            self._cr,
+            'cloudconnect_sync_log_property_operation_date_idx',
+            self._table,
+            ['property_id', 'operation_type', 'sync_date'],
+        )
+        # API call budget of a configuration; also serves the config_id cascade
+        create_index(
+            self._cr,
+            'cloudconnect_sync_log_config_operation_date_idx',
+            self._table,
+            ['config_id', 'operation_type', 'sync_date'],
+        )
+        # Webhook and API call lookups by endpoint
+        create_index(
+            self._cr,
+            'cloudconnect_sync_log_operation_endpoint_idx',
+            self._table,
+            ['operation_type', 'api_endpoint', 'property_id'],
+        )
+        # Covers the time-window GROUP BY of get_dashboard_stats (index-only scan)
+        create_index(
+            self._cr,
+            'cloudconnect_sync_log_date_status_model_idx',
+            self._table,
+            ['sync_date', 'status', 'model_name'],
+        )
+        # Recent errors: tiny compared to the full table
+        create_index(
+            self._cr,
+            'cloudconnect_sync_log_error_date_idx',
+            self._table,
+            ['sync_date DESC'],
+            where="status = 'error'",
+        )
+        # Incremental rollup refresh looks up recently written logs
+        create_index(
+            self._cr,
+            'cloudconnect_sync_log_write_date_idx',
+            self._table,
+            ['write_date'],
+        )
+        # Sync run statistics (get_sync_statistics): index-only scan of sync runs
+        self._cr.execute(f"""
+            CREATE INDEX IF NOT EXISTS cloudconnect_sync_log_sync_runs_idx
+                ON {self._table} (sync_date)
+                INCLUDE (property_id, operation_type, status, duration)
+             WHERE operation_type IN ('manual', 'scheduled')
+        """)
+    
+    # ------------------------------------------------------------
+    # Partitioning
+    # ------------------------------------------------------------
+    
+    # Partition names encode the first day (daily) or month (monthly) they hold
+    _PARTITION_SUFFIX = re.compile(r'_p(\d{4})_(\d{2})(?:_(\d{2}))?$')
+    
+    def _auto_init(self):
+        """
+        Update the schema of a partitioned log table without recreating it.
+        
+        tools.sql.table_exists() only knows regular tables, views and
+        materialized views (relkind r, v, m), so the ORM takes a partitioned
+        table for a missing one and would try to create it again. For a
+        partitioned table only the column and constraint updates are applied.
+        The registry check of missing tables still lists the model on
+        startup; it only calls init(), which is harmless.
+        """
+        if not self._is_partitioned():
+            return super()._auto_init()
+            
+        self = self.with_context(prefetch_fields=False)
+        update_custom_fields = self._context.get('update_custom_fields', False)
+        self._check_removed_columns(log=False)
+        columns = sql.table_columns(self._cr, self._table)
+        for field in self._fields.values():
+            if not field.store or (field.manual and not update_custom_fields):
+                continue
+            field.update_db(self, columns)
+        self._add_sql_constraints()
     
-    # Summary for dashboard
-    summary = fields.Text(
-        string='Summary',
-        compute='_compute_summary'
-    )
+    @api.model
+    def _get_partition_interval(self):
+        """
+        Return the configured partition interval: 'monthly', 'daily' or 'none'.
+        
+        Partitioning is off by default. The interval is used by
+        setup_partitioning() and by the cleanup of a partitioned table.
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        interval = ICP.get_param('cloudconnect.log_partition_interval', 'none')
+        return interval if interval in ('monthly', 'daily', 'none') else 'none'
+    
+    @api.model
+    def _is_partitioned(self):
+        """Return whether the log table is a partitioned table."""
+        self._cr.execute("""
+            SELECT c.relkind
+              FROM pg_class c
+              JOIN pg_namespace n ON n.oid = c.relnamespace
+             WHERE c.relname = %s AND n.nspname = current_schema()
+        """, [self._table])
+        row = self._cr.fetchone()
+        return bool(row) and row[0] == 'p'
+    
+    @api.model
+    def _get_period(self, date, interval):
+        """Return the (start, end) bounds of the partition holding a date."""
+        if interval == 'daily':
+            start = date.replace(hour=0, minute=0, second=0, microsecond=0)
+            return start, start + timedelta(days=1)
+        start = date.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        return start, start + relativedelta(months=1)
+    
+    @api.model
+    def _get_partitions(self):
+        """
+        List the range partitions of the log table.
+        
+        :return: List of (name, start, end) tuples sorted by start
+        """
+        self._cr.execute("""
+            SELECT c.relname
+              FROM pg_inherits i
+              JOIN pg_class c ON c.oid = i.inhrelid
+             WHERE i.inhparent = %s::regclass
+        """, [self._table])
+        partitions = []
+        for name, in self._cr.fetchall():
+            match = self._PARTITION_SUFFIX.search(name)
+            if not match:
+                continue  # default partition
+            year, month, day = match.groups()
+            if day:
+                start = datetime(int(year), int(month), int(day))
+                partitions.append((name, start, start + timedelta(days=1)))
+            else:
+                start = datetime(int(year), int(month), 1)
+                partitions.append((name, start, start + relativedelta(months=1)))
+        return sorted(partitions, key=lambda partition: partition[1])
+    
+    @api.model
+    def _ensure_partitions(self, interval, since=None):
+        """
+        Create the partitions from ``since`` up to a few periods ahead.
+        
+        Periods already covered by an existing partition (for instance after
+        switching from monthly to daily partitions) are skipped. Rows that
+        landed in the default partition for a new period are moved into it.
+        
+        :param interval: 'monthly' or 'daily'
+        :param since: First datetime to cover, defaults to now
+        :return: Number of partitions created
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        premake = int(ICP.get_param('cloudconnect.log_partition_premake', '3'))
+        cr = self._cr
+        table = self._table
+        existing = self._get_partitions()
+        
+        now = fields.Datetime.now()
+        start, end = self._get_period(since or now, interval)
+        last_end = self._get_period(now, interval)[1]
+        for _i in range(premake):
+            last_end = self._get_period(last_end, interval)[1]
+            
+        created = 0
+        while start < last_end:
+            if not any(p_start < end and start < p_end for _name, p_start, p_end in existing):
+                suffix = start.strftime('%Y_%m_%d' if interval == 'daily' else '%Y_%m')
+                partition = f'{table}_p{suffix}'
+                cr.execute(f'CREATE TABLE "{partition}" (LIKE "{table}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+                cr.execute(f"""
+                    WITH moved AS (
+                        DELETE FROM "{table}_default"
+                         WHERE sync_date >= %s AND sync_date < %s
+                     RETURNING *
+                    )
+                    INSERT INTO "{partition}" SELECT * FROM moved
+                """, [start, end])
+                cr.execute(
+                    f'ALTER TABLE "{table}" ATTACH PARTITION "{partition}" FOR VALUES FROM (%s) TO (%s)',
+                    [start, end],
+                )
+                created += 1
+            start, end = end, self._get_period(end, interval)[1]
+            
+        if created:
+            _logger.info(f"Created {created} sync log partitions")
+        return created
+    
+    @api.model
+    def setup_partitioning(self, interval):
+        """
+        Convert the log table to a table partitioned by sync_date.
+        
+        This is an explicit maintenance step (see scripts/partition_sync_log.py),
+        never run on module install or update. The existing rows are copied
+        once into the new partitions, in the current transaction, and the
+        primary key becomes (id, sync_date). Indexes and foreign keys are
+        recreated on the partitioned table. Rows older than the retention
+        period go to the default partition and are removed by the next
+        cleanup.
+        
+        :param interval: 'monthly' or 'daily'
+        :return: Number of copied logs
+        """
+        if interval not in ('monthly', 'daily'):
+            raise UserError(_("Unknown partition interval: %s") % interval)
+        if self._is_partitioned():
+            raise UserError(_("The sync log table is already partitioned."))
+            
+        self.env.flush_all()
+        self.env['ir.config_parameter'].sudo().set_param('cloudconnect.log_partition_interval', interval)
+        cr = self._cr
+        table = self._table
+        legacy = f'{table}_legacy'
+        
+        cr.execute("""
+            SELECT indexdef FROM pg_indexes
+             WHERE schemaname = current_schema() AND tablename = %s AND indexname != %s
+        """, [table, f'{table}_pkey'])
+        index_defs = [row[0] for row in cr.fetchall()]
+        cr.execute("""
+            SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+             WHERE conrelid = %s::regclass AND contype = 'f'
+        """, [table])
+        foreign_keys = cr.fetchall()
+        cr.execute(f'SELECT MIN(sync_date), COUNT(*) FROM "{table}"')
+        oldest, row_count = cr.fetchone()
+        
+        _logger.info(f"Converting {table} ({row_count} rows) to {interval} partitions")
+        cr.execute(f'ALTER TABLE "{table}" RENAME TO "{legacy}"')
+        cr.execute(f'ALTER TABLE "{legacy}" RENAME CONSTRAINT "{table}_pkey" TO "{legacy}_pkey"')
+        cr.execute(f"""
+            CREATE TABLE "{table}" (LIKE "{legacy}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+            PARTITION BY RANGE (sync_date)
+        """)
+        # The partition key must be part of the primary key
+        cr.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{table}_pkey" PRIMARY KEY (id, sync_date)')
+        cr.execute(f'ALTER SEQUENCE "{table}_id_seq" OWNED BY "{table}".id')
+        cr.execute(f'CREATE TABLE "{table}_default" PARTITION OF "{table}" DEFAULT')
+        
+        if oldest:
+            ICP = self.env['ir.config_parameter'].sudo()
+            retention_days = int(ICP.get_param('cloudconnect.log_retention_days', '30'))
+            oldest = max(oldest, fields.Datetime.now() - timedelta(days=retention_days))
+        self._ensure_partitions(interval, since=oldest)
+        
+        _logger.info(f"Copying {row_count} rows into the partitions of {table}")
+        cr.execute(f'INSERT INTO "{table}" SELECT * FROM "{legacy}"')
+        cr.execute(f'DROP TABLE "{legacy}"')
+        _logger.info(f"Recreating {len(index_defs)} indexes and {len(foreign_keys)} foreign keys on {table}")
+        for index_def in index_defs:
+            cr.execute(index_def)
+        for name, definition in foreign_keys:
+            cr.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" {definition}')
+            
+        # The next module update must see the table as existing
+        self._auto_init()
+        self.invalidate_model()
+        _logger.info(f"{table} is now partitioned by sync_date ({interval})")
+        return row_count
+    
+    @api.model
+    def _drop_expired_partitions(self, cutoff_date):
+        """
+        Detach and drop the partitions that only hold logs older than the cutoff.
+        
+        Pending and warning logs are kept like in the row-by-row cleanup: they
+        are moved to the default partition before their partition is dropped.
+        
+        :return: Number of dropped partitions
+        """
+        cr = self._cr
+        table = self._table
+        dropped = 0
+        
+        for name, _start, end in self._get_partitions():
+            if end > cutoff_date:
+                break
+            cr.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"')
+            cr.execute(f"""
+                INSERT INTO "{table}"
+                SELECT * FROM "{name}" WHERE status NOT IN ('success', 'error')
+            """)
+            cr.execute(f'DROP TABLE "{name}"')
+            dropped += 1
+            
+        if dropped:
+            _logger.info(f"Dropped {dropped} expired sync log partitions")
+            self.invalidate_model()
+        return dropped
+    
+    @api.model
+    def _delete_old_logs_chunked(self, table, cutoff_date, deadline=None):
+        """
+        Delete old success/error logs in small chunks, committing in between.
+        
+        Each chunk is a short transaction, so the cleanup never holds locks on
+        a large number of rows and autovacuum can keep up.
+        
+        :param table: Table to clean (the log table or its default partition)
+        :param deadline: Optional time.monotonic() value after which to stop
+        :return: Tuple (deleted, finished)
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        chunk_size = int(ICP.get_param('cloudconnect.cleanup_chunk_size', '5000'))
+        deleted = 0
+        finished = False
+        
+        while True:
+            self._cr.execute(f"""
+                DELETE FROM "{table}"
+                 WHERE id IN (
+                    SELECT id FROM "{table}"
+                     WHERE sync_date < %s AND status IN ('success', 'error')
+                     LIMIT %s
+                 )
+            """, [cutoff_date, chunk_size])
+            deleted += self._cr.rowcount
+            if self._cr.rowcount < chunk_size:
+                finished = True
+                break
+            self._commit_cron_progress(f"Deleted {deleted} old sync logs so far")
+            if deadline and time.monotonic() > deadline:
+                break
+                
+        if deleted:
+            self.invalidate_model()
+        return deleted, finished
+    
+    # ------------------------------------------------------------
+    # Cron helpers
+    # ------------------------------------------------------------
+    
+    @api.model
+    def _get_cron_deadline(self):
+        """
+        Return the time.monotonic() value at which a cron run should stop.
+        
+        cloudconnect.cron_time_budget must stay below the server cron time
+        limit, so a large backlog is worked off over several runs instead of
+        being killed and rolled back.
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        budget = int(ICP.get_param('cloudconnect.cron_time_budget', '90'))
+        return time.monotonic() + budget
+    
+    @api.model
+    def _commit_cron_progress(self, message):
+        """Commit the work done so far and report progress."""
+        _logger.info(message)
+        if not self.env.registry.in_test_mode():
+            self.env.cr.commit()
+    
+    @api.model
+    def _reschedule_cron(self, xmlid):
+        """Trigger a cron again right away to continue an unfinished run."""
+        cron = self.env.ref(xmlid, raise_if_not_found=False)
+        if cron:
+            cron.sudo()._trigger()
     
     @api.depends('model_name', 'action', 'sync_date', 'status')
     def _compute_display_name(self):
-        """Compute display name for log entry."""
+        """Render the display name at read time; it is not stored."""
         for record in self:
             date_str = fields.Datetime.to_string(record.sync_date)[:19]
             status_icon = {
@@ -160,18 +552,106 @@ class CloudConnectSyncLog(models.Model):
             
             record.display_name = f"{status_icon} {record.model_name} - {record.action} - {date_str}"
     
-    @api.depends('status', 'error_message', 'warning_message', 'model_name', 'action')
-    def _compute_summary(self):
-        """Compute summary for dashboard display."""
-        for record in self:
-            if record.status == 'success':
-                record.summary = _("Successfully %s %s") % (record.action, record.model_name)
-            elif record.status == 'error':
-                record.summary = record.error_message or _("Error during %s") % record.action
-            elif record.status == 'warning':
-                record.summary = record.warning_message or _("Warning during %s") % record.action
-            else:
-                record.summary = _("Pending %s for %s") % (record.action, record.model_name)
+    def _write_status(self, vals):
+        """
+        Write status transition values with a single UPDATE statement.
+        
+        Status transitions happen for every logged operation; this path skips
+        the ORM write machinery (value conversion, recompute triggers) that a
+        plain write() goes through. Only plain stored columns of the log may
+        be written. write_date is set too, the rollup refresh relies on it.
+        
+        :param vals: Dictionary of column values, already in database format.
+                     SQL values are evaluated per row by PostgreSQL.
+        """
+        if not self:
+            return
+        self.flush_recordset(list(vals))
+        columns = dict(vals, write_uid=self.env.uid, write_date=self.env.cr.now())
+        assignments = SQL(', ').join(
+            SQL('%s = %s', SQL.identifier(name), value) for name, value in columns.items()
+        )
+        self.env.cr.execute(SQL(
+            'UPDATE %s SET %s WHERE id IN %s',
+            SQL.identifier(self._table), assignments, tuple(self.ids),
+        ))
+        self.invalidate_recordset(list(columns))
+    
+    @api.model
+    def _next_retry_sql(self, retry_count, max_retries, next_retry):
+        """
+        SQL expression of the next retry date of a failed log.
+        
+        Exponential backoff computed per row (1min, 2min, 4min...); logs
+        without retries left keep their current value.
+        """
+        return SQL(
+            "CASE WHEN %s < %s THEN %s + power(2, %s) * interval '1 minute' ELSE %s END",
+            retry_count, max_retries, self.env.cr.now(), retry_count, next_retry,
+        )
+    
+    @api.model
+    def _format_response_data(self, response_data):
+        """Serialize response data for storage."""
+        if not response_data:
+            return None
+        if isinstance(response_data, dict):
+            return json.dumps(response_data, indent=2)
+        return str(response_data)
+    
+    @api.model
+    def mark_batch(self, outcomes):
+        """
+        Apply status transitions to many logs with a single UPDATE statement.
+        
+        Unlike mark_success/mark_error/mark_warning, every log may get its own
+        outcome; this is what batch processors use to record their results.
+        
+        :param outcomes: List of dictionaries with 'id' and 'status', and
+                         optionally 'message' (error or warning message),
+                         'response_data', 'duration' and 'http_status'
+        """
+        if not outcomes:
+            return
+        logs = self.browse([outcome['id'] for outcome in outcomes])
+        logs.flush_recordset()
+        
+        rows = SQL(', ').join(
+            SQL(
+                '(%s, %s, %s, %s, %s, %s)',
+                outcome['id'],
+                outcome['status'],
+                outcome.get('message'),
+                self._format_response_data(outcome.get('response_data')),
+                outcome.get('duration'),
+                outcome.get('http_status'),
+            )
+            for outcome in outcomes
+        )
+        next_retry = self._next_retry_sql(
+            SQL('l.retry_count'), SQL('l.max_retries'), SQL('l.next_retry'),
+        )
+        self.env.cr.execute(SQL("""
+            UPDATE %(table)s AS l
+               SET status = v.status,
+                   error_message = CASE WHEN v.status = 'error' THEN v.message ELSE l.error_message END,
+                   warning_message = CASE WHEN v.status = 'warning' THEN v.message ELSE l.warning_message END,
+                   response_data = COALESCE(v.response_data, l.response_data),
+                   duration = COALESCE(v.duration::float8, l.duration),
+                   http_status = COALESCE(v.http_status::int, l.http_status),
+                   next_retry = CASE WHEN v.status = 'error' THEN %(next_retry)s ELSE l.next_retry END,
+                   write_uid = %(uid)s,
+                   write_date = %(now)s
+              FROM (VALUES %(rows)s) AS v(id, status, message, response_data, duration, http_status)
+             WHERE l.id = v.id::int
+        """,
+            table=SQL.identifier(self._table),
+            next_retry=next_retry,
+            uid=self.env.uid,
+            now=self.env.cr.now(),
+            rows=rows,
+        ))
+        logs.invalidate_recordset()
     
     @api.model
     def create_log(self, operation_type, model_name, action, config_id, **kwargs):
@@ -187,51 +667,50 @@ class CloudConnectSyncLog(models.Model):
         
         return self.create(vals)
     
-    def mark_success(self, response_data=None, duration=None):
-        """Mark log entry as successful."""
-        self.ensure_one()
+    def mark_success(self, response_data=None, duration=None, http_status=None, request_id=None):
+        """Mark log entries as successful, with a single UPDATE."""
         vals = {
             'status': 'success',
             'duration': duration,
         }
         
         if response_data:
-            if isinstance(response_data, dict):
-                vals['response_data'] = json.dumps(response_data, indent=2)
-            else:
-                vals['response_data'] = str(response_data)
+            vals['response_data'] = self._format_response_data(response_data)
+        if http_status:
+            vals['http_status'] = http_status
+        if request_id:
+            vals['request_id'] = request_id
         
-        self.write(vals)
+        self._write_status(vals)
     
-    def mark_error(self, error_message, http_status=None, response_data=None):
-        """Mark log entry as error."""
-        self.ensure_one()
+    def mark_error(self, error_message, http_status=None, response_data=None, request_id=None):
+        """
+        Mark log entries as error, with a single UPDATE.
+        
+        The next retry date is computed per log from its own retry count.
+        """
         vals = {
             'status': 'error',
             'error_message': error_message,
+            # Calculate next retry time if retries remaining
+            'next_retry': self._next_retry_sql(
+                SQL.identifier('retry_count'), SQL.identifier('max_retries'), SQL.identifier('next_retry'),
+            ),
         }
         
         if http_status:
             vals['http_status'] = http_status
+        if request_id:
+            vals['request_id'] = request_id
         
         if response_data:
-            if isinstance(response_data, dict):
-                vals['response_data'] = json.dumps(response_data, indent=2)
-            else:
-                vals['response_data'] = str(response_data)
-        
-        # Calculate next retry time if retries remaining
-        if self.retry_count < self.max_retries:
-            # Exponential backoff: 1min, 2min, 4min...
-            wait_minutes = 2 ** self.retry_count
-            vals['next_retry'] = fields.Datetime.now() + timedelta(minutes=wait_minutes)
+            vals['response_data'] = self._format_response_data(response_data)
         
-        self.write(vals)
+        self._write_status(vals)
     
     def mark_warning(self, warning_message):
-        """Mark log entry with warning."""
-        self.ensure_one()
-        self.write({
+        """Mark log entries with warning, with a single UPDATE."""
+        self._write_status({
             'status': 'warning',
             'warning_message': warning_message,
         })
@@ -253,8 +732,11 @@ class CloudConnectSyncLog(models.Model):
         if not self.can_retry():
             return False
         
-        # Increment retry count
-        self.retry_count += 1
+        # Increment retry count; the retry log now carries the retry schedule
+        self.write({
+            'retry_count': self.retry_count + 1,
+            'next_retry': False,
+        })
         
         # Create new log entry for retry
         retry_log = self.copy({
@@ -263,6 +745,7 @@ class CloudConnectSyncLog(models.Model):
             'retry_count': self.retry_count,
             'error_message': False,
             'response_data': False,
+            'next_retry': False,
             'sync_date': fields.Datetime.now(),
         })
         
@@ -272,40 +755,117 @@ class CloudConnectSyncLog(models.Model):
     
     @api.model
     def _cron_cleanup_old_logs(self):
-        """Cron job to clean up old log entries."""
+        """
+        Cron job to clean up old log entries.
+        
+        On a partitioned table expired partitions are dropped as a whole, and
+        only the default partition is cleaned row by row. Logs are then kept
+        until their whole partition has expired. Plain tables fall back to a
+        chunked delete.
+        """
         # Get retention period from config
         ICP = self.env['ir.config_parameter'].sudo()
         retention_days = int(ICP.get_param('cloudconnect.log_retention_days', '30'))
         
         # Calculate cutoff date
         cutoff_date = fields.Datetime.now() - timedelta(days=retention_days)
+        deadline = self._get_cron_deadline()
+        self.flush_model()
         
-        # Find old logs
-        old_logs = self.search([
-            ('sync_date', '<', cutoff_date),
-            ('status', 'in', ['success', 'error']),  # Keep pending logs
-        ])
-        
-        # Log deletion
-        if old_logs:
-            _logger.info(f"Deleting {len(old_logs)} old sync logs")
-            old_logs.unlink()
+        table = self._table
+        dropped = 0
+        if self._is_partitioned():
+            interval = self._get_partition_interval()
+            self._ensure_partitions(interval if interval != 'none' else 'monthly')
+            dropped = self._drop_expired_partitions(cutoff_date)
+            table = f'{self._table}_default'
+            self._commit_cron_progress(f"Dropped {dropped} expired sync log partitions")
+            
+        # Keep pending and warning logs
+        deleted, finished = self._delete_old_logs_chunked(table, cutoff_date, deadline)
+        if deleted:
+            _logger.info(f"Deleted {deleted} old sync logs")
+        if not finished:
+            _logger.info("Sync log cleanup ran out of time, continuing in a new run")
+            self._reschedule_cron('cloudconnect_core.ir_cron_cloudconnect_cleanup_logs')
+            
+        return {
+            'dropped_partitions': dropped,
+            'deleted': deleted,
+            'finished': finished,
+        }
     
     @api.model
     def _cron_retry_failed_operations(self):
-        """Cron job to retry failed operations."""
+        """
+        Cron job to retry failed operations.
+        
+        Retries are grouped per configuration and limited to
+        cloudconnect.retry_batch_size operations per configuration and run,
+        so a backlog is replayed in rate-limited batches instead of flooding
+        the Cloudbeds API. Operations left over are picked up by the next run.
+        
+        Work is committed every cloudconnect.retry_commit_size operations. When
+        the run exceeds cloudconnect.cron_time_budget it stops and triggers
+        itself again, so already replayed operations are never rolled back.
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        batch_size = int(ICP.get_param('cloudconnect.retry_batch_size', '50'))
+        commit_size = int(ICP.get_param('cloudconnect.retry_commit_size', '10'))
+        deadline = self._get_cron_deadline()
+        
         # Find operations ready for retry
-        failed_logs = self.search([
+        domain = [
             ('status', '=', 'error'),
             ('retry_count', '<', 3),
             ('next_retry', '<=', fields.Datetime.now()),
-        ])
+        ]
         
-        for log in failed_logs:
-            try:
-                log.retry_operation()
-            except Exception as e:
-                _logger.error(f"Error retrying operation {log.id}: {str(e)}")
+        results = {}
+        out_of_time = False
+        for config, count in self._read_group(domain, ['config_id'], ['__count']):
+            if out_of_time:
+                break
+                
+            config_logs = self.search(domain + [('config_id', '=', config.id)], order='next_retry', limit=batch_size)
+            to_retry = self.env['cloudconnect.api.service'].reject_unreplayable(config_logs)
+            recovered = 0
+            failed = len(config_logs) - len(to_retry)
+            
+            for start in range(0, len(to_retry), commit_size):
+                for log in to_retry[start:start + commit_size]:
+                    try:
+                        if log.retry_operation():
+                            recovered += 1
+                        else:
+                            failed += 1
+                    except Exception as e:
+                        failed += 1
+                        _logger.error(f"Error retrying operation {log.id}: {str(e)}")
+                        
+                self._commit_cron_progress(
+                    f"Retrying failed operations for {config.name}: "
+                    f"{recovered + failed}/{len(config_logs)} done"
+                )
+                if time.monotonic() > deadline:
+                    out_of_time = True
+                    break
+                    
+            results[config.name] = {
+                'recovered': recovered,
+                'failed': failed,
+                'deferred': count - recovered - failed,
+            }
+            _logger.info(
+                f"Retried failed operations for {config.name}: {recovered} recovered, "
+                f"{failed} failed, {results[config.name]['deferred']} deferred to next run"
+            )
+            
+        if out_of_time:
+            _logger.info("Retry of failed operations ran out of time, continuing in a new run")
+            self._reschedule_cron('cloudconnect_core.ir_cron_cloudconnect_retry_failed')
+            
+        return results
     
     def action_view_details(self):
         """Action to view detailed log information."""
@@ -349,45 +909,55 @@ class CloudConnectSyncLog(models.Model):
     
     @api.model
     def get_dashboard_stats(self, hours=24):
-        """Get statistics for dashboard display."""
-        since = fields.Datetime.now() - timedelta(hours=hours)
+        """
+        Get statistics for dashboard display.
         
-        logs = self.search([('sync_date', '>=', since)])
+        Counts are read from the hourly rollup (plus the raw logs of the
+        hours not rolled up yet), so the cost does not depend on the number
+        of logs in the window.
+        """
+        since = fields.Datetime.now() - timedelta(hours=hours)
         
         stats = {
-            'total': len(logs),
-            'success': len(logs.filtered(lambda l: l.status == 'success')),
-            'error': len(logs.filtered(lambda l: l.status == 'error')),
-            'warning': len(logs.filtered(lambda l: l.status == 'warning')),
-            'pending': len(logs.filtered(lambda l: l.status == 'pending')),
+            'total': 0,
+            'success': 0,
+            'error': 0,
+            'warning': 0,
+            'pending': 0,
             'by_model': {},
             'recent_errors': [],
         }
         
-        # Count by model
-        for log in logs:
-            if log.model_name not in stats['by_model']:
-                stats['by_model'][log.model_name] = {
-                    'total': 0,
-                    'success': 0,
-                    'error': 0,
-                }
+        # Count by model and status
+        counts = self.env['cloudconnect.sync.log.rollup'].read_counts(since, ['model_name', 'status'])
+        for (model_name, status), totals in counts.items():
+            count = totals['count']
+            stats['total'] += count
+            stats[status] += count
             
-            stats['by_model'][log.model_name]['total'] += 1
-            if log.status == 'success':
-                stats['by_model'][log.model_name]['success'] += 1
-            elif log.status == 'error':
-                stats['by_model'][log.model_name]['error'] += 1
+            by_model = stats['by_model'].setdefault(model_name, {
+                'total': 0,
+                'success': 0,
+                'error': 0,
+            })
+            by_model['total'] += count
+            if status in ('success', 'error'):
+                by_model[status] += count
         
         # Recent errors
-        error_logs = logs.filtered(lambda l: l.status == 'error').sorted('sync_date', reverse=True)[:5]
+        error_logs = self.search_read(
+            [('sync_date', '>=', since), ('status', '=', 'error')],
+            ['model_name', 'action', 'error_message', 'sync_date'],
+            order='sync_date desc',
+            limit=5,
+        )
         for log in error_logs:
             stats['recent_errors'].append({
-                'id': log.id,
-                'model': log.model_name,
-                'action': log.action,
-                'error': log.error_message or 'Unknown error',
-                'date': log.sync_date,
+                'id': log['id'],
+                'model': log['model_name'],
+                'action': log['action'],
+                'error': log['error_message'] or 'Unknown error',
+                'date': log['sync_date'],
             })
         
         return stats
\ No newline at end of file
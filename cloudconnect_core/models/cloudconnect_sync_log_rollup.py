@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api
+from datetime import timedelta
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class CloudConnectSyncLogRollup(models.Model):
+    _name = 'cloudconnect.sync.log.rollup'
+    _description = 'CloudConnect Hourly Sync Metrics'
+    _order = 'hour desc'
+    _rec_name = 'hour'
+    
+    hour = fields.Datetime(
+        string='Hour',
+        required=True,
+        readonly=True,
+        index=True
+    )
+    
+    config_id = fields.Many2one(
+        'cloudconnect.config',
+        string='Configuration',
+        readonly=True,
+        ondelete='cascade'
+    )
+    
+    property_id = fields.Many2one(
+        'cloudconnect.property',
+        string='Property',
+        readonly=True,
+        ondelete='cascade'
+    )
+    
+    model_name = fields.Char(
+        string='Model',
+        readonly=True
+    )
+    
+    operation_type = fields.Selection(
+        selection=lambda self: self.env['cloudconnect.sync.log']._fields['operation_type'].selection,
+        string='Operation Type',
+        readonly=True
+    )
+    
+    status = fields.Selection(
+        selection=lambda self: self.env['cloudconnect.sync.log']._fields['status'].selection,
+        string='Status',
+        readonly=True
+    )
+    
+    log_count = fields.Integer(
+        string='Logs',
+        readonly=True
+    )
+    
+    error_count = fields.Integer(
+        string='Errors',
+        readonly=True
+    )
+    
+    duration_sum = fields.Float(
+        string='Total Duration (sec)',
+        readonly=True
+    )
+    
+    # Logs written this long before the watermark are re-aggregated again,
+    # covering transactions that committed after the previous refresh
+    _REFRESH_OVERLAP = timedelta(minutes=15)
+    
+    @api.model
+    def _get_watermark(self):
+        """Return the write_date up to which logs have been rolled up."""
+        value = self.env['ir.config_parameter'].sudo().get_param('cloudconnect.rollup_watermark')
+        return fields.Datetime.to_datetime(value) if value else None
+    
+    @api.model
+    def _get_horizon(self):
+        """
+        Return the first hour that is not known to be fully rolled up.
+        
+        Figures before the horizon are read from the rollup, figures after it
+        from the raw log table.
+        """
+        watermark = self._get_watermark()
+        if not watermark:
+            return None
+        return watermark.replace(minute=0, second=0, microsecond=0)
+    
+    @api.model
+    def refresh(self):
+        """
+        Re-aggregate every hour touched by logs written since the last refresh.
+        
+        Touched hours are rebuilt from the raw logs with one DELETE and one
+        INSERT ... SELECT, so the refresh is idempotent and only costs as
+        much as the hours that actually changed.
+        
+        Only hours after the log retention cutoff are rebuilt. Older hours
+        may have been partly purged (pending and warning logs survive the
+        cleanup), and rebuilding them from the surviving rows would replace
+        their history; late changes to such logs are not rolled up.
+        
+        :return: Number of hours refreshed
+        """
+        SyncLog = self.env['cloudconnect.sync.log']
+        SyncLog.flush_model()
+        cr = self.env.cr
+        
+        cr.execute("SELECT now() AT TIME ZONE 'UTC'")
+        refresh_time = cr.fetchone()[0]
+        watermark = self._get_watermark()
+        ICP = self.env['ir.config_parameter'].sudo()
+        retention_days = int(ICP.get_param('cloudconnect.log_retention_days', '30'))
+        # First hour whose raw logs are all still there
+        complete_since = refresh_time - timedelta(days=retention_days)
+        
+        if watermark:
+            cr.execute("""
+                SELECT DISTINCT date_trunc('hour', sync_date)
+                  FROM cloudconnect_sync_log
+                 WHERE write_date > %s AND date_trunc('hour', sync_date) >= %s
+            """, [watermark - self._REFRESH_OVERLAP, complete_since])
+        else:
+            cr.execute("""
+                SELECT DISTINCT date_trunc('hour', sync_date)
+                  FROM cloudconnect_sync_log
+                 WHERE date_trunc('hour', sync_date) >= %s
+            """, [complete_since])
+        hours = [row[0] for row in cr.fetchall()]
+        
+        if hours:
+            cr.execute("DELETE FROM cloudconnect_sync_log_rollup WHERE hour = ANY(%s)", [hours])
+            cr.execute("""
+                INSERT INTO cloudconnect_sync_log_rollup (
+                    hour, config_id, property_id, model_name, operation_type, status,
+                    log_count, error_count, duration_sum,
+                    create_uid, create_date, write_uid, write_date
+                )
+                SELECT date_trunc('hour', l.sync_date), l.config_id, l.property_id,
+                       l.model_name, l.operation_type, l.status,
+                       COUNT(*),
+                       COUNT(*) FILTER (WHERE l.status = 'error'),
+                       SUM(COALESCE(l.duration, 0)),
+                       %(uid)s, %(now)s, %(uid)s, %(now)s
+                  FROM cloudconnect_sync_log l
+                  JOIN unnest(%(hours)s::timestamp[]) AS h(hour)
+                    ON l.sync_date >= h.hour AND l.sync_date < h.hour + interval '1 hour'
+              GROUP BY 1, 2, 3, 4, 5, 6
+            """, {'uid': self.env.uid, 'now': refresh_time, 'hours': hours})
+            self.invalidate_model()
+            
+        self.env['ir.config_parameter'].sudo().set_param(
+            'cloudconnect.rollup_watermark', fields.Datetime.to_string(refresh_time)
+        )
+        return len(hours)
+    
+    @api.model
+    def read_counts(self, since, groupby, domain=None):
+        """
+        Aggregate log counts since a date, grouped by the given fields.
+        
+        Hours before the horizon come from the rollup, the most recent ones
+        from the raw logs. The rollup only holds whole hours, so a partial
+        first hour is read from the raw logs as well.
+        
+        :param since: Start datetime
+        :param groupby: List of field names present on both models
+                        (config_id, property_id, model_name, operation_type,
+                        status), plus 'hour' for hourly buckets
+        :param domain: Optional extra domain on those fields
+        :return: Dictionary mapping groupby value tuples to dictionaries with
+                 count, error_count and duration_sum
+        """
+        domain = domain or []
+        # Hour buckets are always UTC, whatever the user timezone
+        self = self.with_context(tz=None)
+        horizon = self._get_horizon()
+        results = {}
+        
+        rollup_since = since.replace(minute=0, second=0, microsecond=0)
+        if rollup_since < since:
+            rollup_since += timedelta(hours=1)
+        
+        def add(key, count, error_count, duration_sum):
+            totals = results.setdefault(key, {'count': 0, 'error_count': 0, 'duration_sum': 0.0})
+            totals['count'] += count
+            totals['error_count'] += error_count
+            totals['duration_sum'] += duration_sum or 0.0
+            
+        raw_domain = [('sync_date', '>=', since)]
+        if horizon and horizon > rollup_since:
+            rollup_groupby = ['hour:hour' if field == 'hour' else field for field in groupby]
+            for row in self._read_group(
+                [('hour', '>=', rollup_since), ('hour', '<', horizon)] + domain,
+                rollup_groupby,
+                ['log_count:sum', 'error_count:sum', 'duration_sum:sum'],
+            ):
+                add(self._group_key(row[:len(groupby)]), *row[len(groupby):])
+            raw_domain = [
+                ('sync_date', '>=', since),
+                '|', ('sync_date', '<', rollup_since), ('sync_date', '>=', horizon),
+            ]
+            
+        # Partial first hour and live tail: hours not rolled up yet
+        raw_groupby = ['sync_date:hour' if field == 'hour' else field for field in groupby]
+        status_added = 'status' not in groupby
+        if status_added:
+            raw_groupby.append('status')
+        for row in self.env['cloudconnect.sync.log'].with_context(tz=None)._read_group(
+            raw_domain + domain,
+            raw_groupby,
+            ['__count', 'duration:sum'],
+        ):
+            count, duration_sum = row[-2:]
+            status = row[len(raw_groupby) - 1] if status_added else row[groupby.index('status')]
+            add(
+                self._group_key(row[:len(groupby)]),
+                count,
+                count if status == 'error' else 0,
+                duration_sum,
+            )
+            
+        return results
+    
+    @api.model
+    def _group_key(self, values):
+        """Turn _read_group values (records, datetimes...) into a hashable key."""
+        return tuple(value.id if isinstance(value, models.BaseModel) else value for value in values)
+    
+    @api.model
+    def _cron_refresh_rollup(self):
+        """Cron job to roll up new sync logs and purge expired rollups."""
+        refreshed = self.refresh()
+        if refreshed:
+            _logger.info(f"Refreshed {refreshed} hours of sync log rollup")
+            
+        ICP = self.env['ir.config_parameter'].sudo()
+        retention_days = int(ICP.get_param('cloudconnect.rollup_retention_days', '730'))
+        self.search([
+            ('hour', '<', fields.Datetime.now() - timedelta(days=retention_days)),
+        ]).unlink()
\ No newline at end of file
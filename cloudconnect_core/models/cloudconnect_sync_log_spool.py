@@ -0,0 +1,395 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api
+from odoo.tools import config, split_every
+from psycopg2 import errors
+import psycopg2
+from datetime import datetime, timedelta
+import csv
+import glob
+import io
+import json
+import logging
+import os
+import socket
+import threading
+import time
+
+_logger = logging.getLogger(__name__)
+
+# Per database: monotonic time until which log inserts go straight to the spool
+_breaker_open_until = {}
+_spool_lock = threading.Lock()
+
+
+class SpooledLogEntry:
+    """
+    Stand-in for a cloudconnect.sync.log record whose insert was diverted
+    to the spool.
+    
+    It supports what the API and webhook layers do with a fresh log: read
+    and set log fields and mark the outcome. Any other attribute raises
+    AttributeError, it is not a record. The entry is appended to the spool
+    by CloudConnectSyncLogSpool.finalize() once its call is finished, so
+    every change made during the call is kept, and loaded into the log
+    table later.
+    """
+    
+    id = False
+    ids = []
+    
+    def __init__(self, spool, vals):
+        object.__setattr__(self, '_spool', spool)
+        object.__setattr__(self, '_vals', dict(vals))
+        object.__setattr__(self, '_spooled', False)
+    
+    def __bool__(self):
+        return True
+    
+    def __repr__(self):
+        return f"SpooledLogEntry({self._vals.get('operation_type')}, {self._vals.get('status')})"
+    
+    def _check_field(self, name):
+        if name.startswith('_') or name not in self._spool.env['cloudconnect.sync.log']._fields:
+            raise AttributeError(f"{type(self).__name__} has no attribute {name!r}")
+    
+    def __getattr__(self, name):
+        self._check_field(name)
+        return self._vals.get(name, False)
+    
+    def __setattr__(self, name, value):
+        self.write({name: value})
+    
+    def ensure_one(self):
+        return self
+    
+    def write(self, vals):
+        for name in vals:
+            self._check_field(name)
+        if self._spooled:
+            _logger.warning(f"{self!r} written after being spooled, change not logged: {vals}")
+            return True
+        self._vals.update(vals)
+        return True
+    
+    def _finalize(self):
+        """Append the final state of the entry to the spool, once."""
+        if not self._spooled:
+            self._spool.append(self._vals)
+            object.__setattr__(self, '_spooled', True)
+    
+    def _write_status(self, vals):
+        self.write(vals)
+    
+    def mark_success(self, response_data=None, duration=None, http_status=None, request_id=None):
+        vals = {
+            'status': 'success',
+            'duration': duration,
+        }
+        if response_data:
+            vals['response_data'] = self._spool.env['cloudconnect.sync.log']._format_response_data(response_data)
+        if http_status:
+            vals['http_status'] = http_status
+        if request_id:
+            vals['request_id'] = request_id
+        self.write(vals)
+    
+    def mark_error(self, error_message, http_status=None, response_data=None, request_id=None):
+        vals = {
+            'status': 'error',
+            'error_message': error_message,
+        }
+        if http_status:
+            vals['http_status'] = http_status
+        if request_id:
+            vals['request_id'] = request_id
+        if response_data:
+            vals['response_data'] = self._spool.env['cloudconnect.sync.log']._format_response_data(response_data)
+        # Same backoff as cloudconnect.sync.log._next_retry_sql()
+        if self._vals['retry_count'] < self._vals['max_retries']:
+            vals['next_retry'] = fields.Datetime.now() + timedelta(minutes=2 ** self._vals['retry_count'])
+        self.write(vals)
+    
+    def mark_warning(self, warning_message):
+        self.write({
+            'status': 'warning',
+            'warning_message': warning_message,
+        })
+    
+    def _apply_outcome(self, outcome):
+        """Record an outcome in the format of cloudconnect.sync.log.mark_batch()."""
+        if outcome['status'] == 'error':
+            self.mark_error(outcome.get('message'), outcome.get('http_status'), outcome.get('response_data'))
+        elif outcome['status'] == 'warning':
+            self.mark_warning(outcome.get('message'))
+        else:
+            self.mark_success(outcome.get('response_data'), outcome.get('duration'), outcome.get('http_status'))
+
+
+class CloudConnectSyncLogSpool(models.AbstractModel):
+    """
+    Local JSONL spool for sync logs, used while the log table is slow.
+    
+    Spool files live under the data_dir of the host that wrote them. On a
+    multi-host deployment data_dir must be shared between the hosts, as the
+    filestore already requires: the loading cron runs on one host at a time
+    and only sees the files on its own disk. File names include the host
+    name, so processes of different hosts never write to the same file.
+    """
+    _name = 'cloudconnect.sync.log.spool'
+    _description = 'CloudConnect Sync Log Spool'
+    
+    # Columns loaded from the spool, in COPY order
+    _COLUMNS = [
+        'operation_type', 'model_name', 'action', 'cloudbeds_id', 'odoo_id', 'status',
+        'config_id', 'property_id', 'error_message', 'warning_message', 'request_data',
+        'response_data', 'request_id', 'api_endpoint', 'http_method', 'http_status',
+        'sync_date', 'duration', 'retry_count', 'max_retries', 'next_retry',
+        'create_uid', 'create_date', 'write_uid', 'write_date',
+    ]
+    
+    @api.model
+    def _get_params(self):
+        """Read spool tuning parameters from system parameters."""
+        ICP = self.env['ir.config_parameter'].sudo()
+        return {
+            'enabled': ICP.get_param('cloudconnect.log_spool_enabled', 'False').lower() in ('1', 'true'),
+            'timeout_ms': int(ICP.get_param('cloudconnect.log_spool_timeout_ms', '200')),
+            'breaker_seconds': int(ICP.get_param('cloudconnect.log_spool_breaker_seconds', '30')),
+        }
+    
+    @api.model
+    def _get_spool_dir(self):
+        """Directory of the spool files of the current database."""
+        return os.path.join(config['data_dir'], 'cloudconnect_spool', self.env.cr.dbname)
+    
+    @api.model
+    def create_log(self, vals):
+        """
+        Create a sync log, or spool it when the database is under pressure.
+        
+        With cloudconnect.log_spool_enabled, the insert runs with a short
+        lock and statement timeout. When it times out, the log goes to the
+        spool, and so do the following ones until the circuit breaker closes
+        again after cloudconnect.log_spool_breaker_seconds.
+        
+        The caller must pass the result to finalize() once its call is
+        finished, including when it fails.
+        
+        :param vals: Values of the new cloudconnect.sync.log
+        :return: cloudconnect.sync.log record or SpooledLogEntry
+        """
+        return self.create_logs([vals])[0]
+    
+    @api.model
+    def create_logs(self, vals_list):
+        """
+        Batch version of create_log(): one INSERT, or spooled as a whole.
+        
+        :param vals_list: List of values of the new cloudconnect.sync.log
+        :return: cloudconnect.sync.log recordset or list of SpooledLogEntry
+        """
+        SyncLog = self.env['cloudconnect.sync.log']
+        params = self._get_params()
+        if not params['enabled']:
+            return SyncLog.create(vals_list)
+            
+        dbname = self.env.cr.dbname
+        if _breaker_open_until.get(dbname, 0) > time.monotonic():
+            return [self._spooled_entry(vals) for vals in vals_list]
+            
+        cr = self.env.cr
+        timeout = f"{params['timeout_ms']}ms"
+        cr.execute("SELECT current_setting('lock_timeout'), current_setting('statement_timeout')")
+        previous = cr.fetchone()
+        set_timeouts = "SELECT set_config('lock_timeout', %s, true), set_config('statement_timeout', %s, true)"
+        try:
+            with cr.savepoint():
+                cr.execute(set_timeouts, [timeout, timeout])
+                sync_logs = SyncLog.create(vals_list)
+                cr.execute(set_timeouts, previous)
+            return sync_logs
+        except (errors.LockNotAvailable, errors.QueryCanceled):
+            _logger.warning(
+                f"Sync log insert exceeded {timeout}, spooling logs for {params['breaker_seconds']} seconds"
+            )
+            _breaker_open_until[dbname] = time.monotonic() + params['breaker_seconds']
+            return [self._spooled_entry(vals) for vals in vals_list]
+    
+    @api.model
+    def finalize(self, sync_logs):
+        """
+        Spool the final state of entries returned by create_log(s).
+        
+        Real sync logs are left alone, they are already in the database.
+        
+        :param sync_logs: cloudconnect.sync.log recordset, SpooledLogEntry
+                          or list of SpooledLogEntry
+        """
+        if isinstance(sync_logs, SpooledLogEntry):
+            sync_logs = [sync_logs]
+        if isinstance(sync_logs, list):
+            for entry in sync_logs:
+                entry._finalize()
+    
+    @api.model
+    def mark_batch(self, sync_logs, outcomes):
+        """
+        Record the outcomes of logs created by create_logs(), in order.
+        
+        :param sync_logs: cloudconnect.sync.log recordset or list of SpooledLogEntry
+        :param outcomes: One outcome per log, in the format of
+                         cloudconnect.sync.log.mark_batch()
+        """
+        if isinstance(sync_logs, models.BaseModel):
+            sync_logs.mark_batch(outcomes)
+            return
+        for entry, outcome in zip(sync_logs, outcomes):
+            entry._apply_outcome(outcome)
+        self.finalize(sync_logs)
+    
+    @api.model
+    def _spooled_entry(self, vals):
+        """Build a SpooledLogEntry with the defaults of cloudconnect.sync.log."""
+        entry_vals = {
+            'status': 'pending',
+            'sync_date': fields.Datetime.now(),
+            'retry_count': 0,
+            'max_retries': 3,
+        }
+        entry_vals.update(vals)
+        return SpooledLogEntry(self, entry_vals)
+    
+    @api.model
+    def append(self, vals):
+        """
+        Append a log entry to the spool.
+        
+        Each process writes to its own file, bucketed per minute, so the
+        loader only reads files no process writes to anymore.
+        """
+        entry = {
+            column: fields.Datetime.to_string(value) if isinstance(value, datetime) else value
+            for column, value in vals.items()
+            if column in self._COLUMNS
+        }
+        entry['create_uid'] = self.env.uid
+        
+        spool_dir = self._get_spool_dir()
+        path = os.path.join(
+            spool_dir, f"{datetime.utcnow():%Y%m%d%H%M}-{socket.gethostname()}-{os.getpid()}.jsonl"
+        )
+        line = json.dumps(entry, default=str) + '\n'
+        with _spool_lock:
+            os.makedirs(spool_dir, exist_ok=True)
+            with open(path, 'a', encoding='utf-8') as spool_file:
+                spool_file.write(line)
+                spool_file.flush()
+                os.fsync(spool_file.fileno())
+    
+    @api.model
+    def _copy_file(self, path):
+        """
+        Bulk-load one spool file into the log table with COPY.
+        
+        Lines are copied cloudconnect.log_spool_copy_batch_size at a time, so
+        memory use does not depend on the size of the file.
+        
+        :return: Number of loaded entries
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        batch_size = int(ICP.get_param('cloudconnect.log_spool_copy_batch_size', '5000'))
+        now = fields.Datetime.to_string(self.env.cr.now())
+        count = 0
+        
+        # Binary mode: an undecodable line is skipped, it does not stop the file
+        with open(path, 'rb') as spool_file:
+            for lines in split_every(batch_size, enumerate(spool_file, 1)):
+                count += self._copy_lines(path, lines, now)
+        return count
+    
+    @api.model
+    def _copy_lines(self, path, lines, now):
+        """
+        COPY a batch of spool lines into the log table.
+        
+        Lines that cannot be decoded are logged and skipped.
+        
+        :param lines: Iterable of (line number, line as bytes) tuples
+        :return: Number of loaded entries
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        count = 0
+        
+        for line_number, line in lines:
+            try:
+                entry = json.loads(line.decode('utf-8'))
+            except ValueError:
+                # Torn write of a crashed process (UnicodeDecodeError is a ValueError)
+                entry = None
+            if not isinstance(entry, dict):
+                _logger.warning(f"Skipping unreadable line {line_number} of {path}")
+                continue
+            # The rollup refresh picks up logs by write_date
+            entry.update({
+                'create_date': entry.get('sync_date'),
+                'write_uid': entry.get('create_uid'),
+                'write_date': now,
+            })
+            writer.writerow([
+                None if entry.get(column) is False else entry.get(column)
+                for column in self._COLUMNS
+            ])
+            count += 1
+            
+        if count:
+            buffer.seek(0)
+            self.env.cr._obj.copy_expert(
+                f"COPY cloudconnect_sync_log ({', '.join(self._COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        return count
+    
+    @api.model
+    def _cron_load_spool(self):
+        """
+        Cron job loading spooled sync logs into the database.
+        
+        Files are loaded one by one and deleted after the commit. A crash in
+        between loads the file again: delivery is at least once.
+        
+        A file the database rejects (e.g. a log of a deleted configuration or
+        a bad value) is renamed to *.failed and left for inspection, so it
+        does not block the files after it.
+        """
+        SyncLog = self.env['cloudconnect.sync.log']
+        deadline = SyncLog._get_cron_deadline()
+        current_bucket = f"{datetime.utcnow():%Y%m%d%H%M}"
+        loaded = 0
+        
+        paths = sorted(glob.glob(os.path.join(self._get_spool_dir(), '*.jsonl')))
+        for path in paths:
+            # Files of the current minute may still be written to
+            if os.path.basename(path) >= current_bucket:
+                continue
+            if time.monotonic() > deadline:
+                SyncLog._reschedule_cron('cloudconnect_core.ir_cron_cloudconnect_load_log_spool')
+                break
+                
+            try:
+                with self.env.cr.savepoint():
+                    count = self._copy_file(path)
+            except (psycopg2.DataError, psycopg2.IntegrityError) as e:
+                failed_path = f"{path}.failed"
+                os.replace(path, failed_path)
+                _logger.error(f"Could not load spool file {path}, moved to {failed_path}: {e}")
+                continue
+                
+            loaded += count
+            SyncLog._commit_cron_progress(f"Loaded {loaded} spooled sync logs")
+            os.remove(path)
+            
+        if loaded:
+            SyncLog.invalidate_model()
+        return loaded
\ No newline at end of file
@@ -308,17 +308,22 @@ class CloudConnectWebhook(models.Model):
             message_type='notification'
         )
     
-    def record_event_received(self, success=True, error_message=None):
-        """Record that an event was received."""
+    def record_event_received(self, success=True, error_message=None, count=1, error_count=1):
+        """
+        Record that events were received.
+        
+        :param count: Number of events received
+        :param error_count: Number of failed events, when success is False
+        """
         self.ensure_one()
         
         vals = {
             'last_received': fields.Datetime.now(),
-            'total_received': self.total_received + 1,
+            'total_received': self.total_received + count,
         }
         
         if not success:
-            vals['total_errors'] = self.total_errors + 1
+            vals['total_errors'] = self.total_errors + error_count
             vals['last_error'] = error_message or 'Unknown error'
         
         self.write(vals)
@@ -350,6 +355,18 @@ class CloudConnectWebhook(models.Model):
         try:
             # Process through webhook processor service
             processor = self.env['cloudconnect.webhook.processor']
+            
+            # Batched deliveries carry a list of events
+            if isinstance(data, list):
+                processed, errors = processor.process_events(webhook, data)
+                webhook.record_event_received(
+                    success=not errors,
+                    error_message=errors[-1] if errors else None,
+                    count=len(data),
+                    error_count=len(errors),
+                )
+                return not errors
+                
             processor.process_event(webhook, data)
             
             webhook.record_event_received(success=True)
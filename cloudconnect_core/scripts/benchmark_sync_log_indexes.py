@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark the cloudconnect.sync.log indexes on a large seeded table.
+
+Seeds millions of sync logs, then checks with EXPLAIN that PostgreSQL
+answers each hot query with the expected index, and prints its execution
+time. Everything is rolled back at the end.
+
+Run it from an Odoo shell on a disposable database with the module
+installed:
+
+    odoo-bin shell -d <database> < cloudconnect_core/scripts/benchmark_sync_log_indexes.py
+
+Set CLOUDCONNECT_BENCH_ROWS to change the number of seeded logs.
+"""
+
+import json
+import os
+import time
+
+ROWS = int(os.environ.get('CLOUDCONNECT_BENCH_ROWS', '2000000'))
+PROPERTIES = 50
+
+# (name, query, expected index)
+QUERIES = [
+    (
+        'retry cron',
+        """
+        SELECT id FROM cloudconnect_sync_log
+         WHERE status = 'error' AND retry_count < 3
+           AND next_retry <= now() AT TIME ZONE 'UTC' AND config_id = %(config_id)s
+      ORDER BY next_retry LIMIT 50
+        """,
+        'cloudconnect_sync_log_retry_idx',
+    ),
+    (
+        'dashboard window',
+        """
+        SELECT model_name, status, COUNT(*) FROM cloudconnect_sync_log
+         WHERE sync_date >= now() AT TIME ZONE 'UTC' - interval '24 hours'
+      GROUP BY model_name, status
+        """,
+        'cloudconnect_sync_log_date_status_model_idx',
+    ),
+    (
+        'recent errors',
+        """
+        SELECT id FROM cloudconnect_sync_log
+         WHERE status = 'error'
+      ORDER BY sync_date DESC LIMIT 5
+        """,
+        'cloudconnect_sync_log_error_date_idx',
+    ),
+    (
+        'sync history',
+        """
+        SELECT id, status, response_data FROM cloudconnect_sync_log
+         WHERE property_id = %(property_id)s
+           AND operation_type IN ('manual', 'scheduled') AND status != 'pending'
+      ORDER BY sync_date DESC LIMIT 10
+        """,
+        'cloudconnect_sync_log_property_operation_date_idx',
+    ),
+    (
+        'webhook activity',
+        """
+        SELECT property_id, status, COUNT(*) FROM cloudconnect_sync_log
+         WHERE operation_type = 'webhook' AND property_id IN %(property_ids)s
+           AND sync_date >= now() AT TIME ZONE 'UTC' - interval '24 hours'
+      GROUP BY property_id, status
+        """,
+        'cloudconnect_sync_log_property_operation_date_idx',
+    ),
+    (
+        'API budget',
+        """
+        SELECT COUNT(*) FROM cloudconnect_sync_log
+         WHERE config_id = %(config_id)s AND operation_type = 'api_call'
+           AND sync_date >= now() AT TIME ZONE 'UTC' - interval '1 hour'
+        """,
+        'cloudconnect_sync_log_config_operation_date_idx',
+    ),
+    (
+        'API calls of a property',
+        """
+        SELECT COUNT(*) FROM cloudconnect_sync_log
+         WHERE property_id = %(property_id)s AND operation_type = 'api_call'
+           AND sync_date >= now() AT TIME ZONE 'UTC' - interval '2 hours'
+        """,
+        'cloudconnect_sync_log_property_operation_date_idx',
+    ),
+    (
+        'webhook event lookup',
+        """
+        SELECT id FROM cloudconnect_sync_log
+         WHERE operation_type = 'webhook' AND api_endpoint = 'reservation/created'
+           AND property_id = %(property_id)s
+         LIMIT 20
+        """,
+        'cloudconnect_sync_log_operation_endpoint_idx',
+    ),
+    (
+        'rollup refresh',
+        """
+        SELECT DISTINCT date_trunc('hour', sync_date) FROM cloudconnect_sync_log
+         WHERE write_date > now() AT TIME ZONE 'UTC' - interval '20 minutes'
+        """,
+        'cloudconnect_sync_log_write_date_idx',
+    ),
+]
+
+
+def seed(env):
+    """Insert ROWS logs spread over 30 days, with a realistic status mix."""
+    config = env['cloudconnect.config'].create({
+        'name': 'Index benchmark',
+        'client_id': 'benchmark',
+    })
+    properties = env['cloudconnect.property'].create([{
+        'name': f'Benchmark property {i}',
+        'config_id': config.id,
+        'cloudbeds_id': f'bench-{i}',
+    } for i in range(PROPERTIES)])
+    property_ids = properties.ids
+
+    env.cr.execute("""
+        INSERT INTO cloudconnect_sync_log (
+            operation_type, model_name, action, status, config_id, property_id,
+            api_endpoint, sync_date, duration, retry_count, max_retries, next_retry,
+            create_uid, create_date, write_uid, write_date
+        )
+        SELECT op.operation_type,
+               'cloudconnect.property',
+               'fetch',
+               CASE WHEN g % 50 = 0 THEN 'error' WHEN g % 97 = 0 THEN 'warning' ELSE 'success' END,
+               %(config_id)s,
+               (%(property_ids)s::int[])[1 + g % %(properties)s],
+               CASE op.operation_type
+                    WHEN 'webhook' THEN 'reservation/created'
+                    WHEN 'api_call' THEN 'getReservations'
+               END,
+               d.sync_date,
+               random() * 5,
+               g % 3,
+               3,
+               CASE WHEN g % 50 = 0 AND g % 3 < 2 THEN d.sync_date + interval '10 minutes' END,
+               1, d.sync_date, 1, d.sync_date
+          FROM generate_series(1, %(rows)s) AS g
+         CROSS JOIN LATERAL (
+               SELECT (ARRAY['api_call', 'api_call', 'api_call', 'webhook', 'scheduled', 'manual'])[1 + g % 6]
+                      AS operation_type
+         ) op
+         CROSS JOIN LATERAL (
+               SELECT now() AT TIME ZONE 'UTC' - (g::float / %(rows)s) * interval '30 days' AS sync_date
+         ) d
+    """, {
+        'config_id': config.id,
+        'property_ids': property_ids,
+        'properties': PROPERTIES,
+        'rows': ROWS,
+    })
+    env.cr.execute("ANALYZE cloudconnect_sync_log")
+    return {
+        'config_id': config.id,
+        'property_id': property_ids[0],
+        'property_ids': tuple(property_ids[:10]),
+    }
+
+
+def plan_indexes(plan):
+    """Collect the index names used anywhere in an EXPLAIN JSON plan."""
+    names = set()
+    if 'Index Name' in plan:
+        names.add(plan['Index Name'])
+    for child in plan.get('Plans', []):
+        names |= plan_indexes(child)
+    return names
+
+
+def parent_index(env, name):
+    """Map an index of a partition to the index declared on the log table."""
+    env.cr.execute("""
+        SELECT p.relname
+          FROM pg_inherits i
+          JOIN pg_class p ON p.oid = i.inhparent
+         WHERE i.inhrelid = %s::regclass
+    """, [name])
+    row = env.cr.fetchone()
+    return row[0] if row else name
+
+
+def run(env):
+    started = time.monotonic()
+    params = seed(env)
+    print(f"Seeded {ROWS} sync logs in {time.monotonic() - started:.1f}s")
+
+    failures = []
+    for name, query, expected in QUERIES:
+        env.cr.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {query}", params)
+        result = env.cr.fetchone()[0]
+        explain = result[0] if isinstance(result, list) else json.loads(result)[0]
+        used = {parent_index(env, index) for index in plan_indexes(explain['Plan'])}
+        ok = expected in used
+        print(f"{'OK  ' if ok else 'FAIL'} {name:<25} {explain['Execution Time']:>9.2f} ms  {sorted(used)}")
+        if not ok:
+            failures.append(name)
+
+    env.cr.rollback()
+    assert not failures, f"Expected index not used by: {', '.join(failures)}"
+    print("All queries use their index")
+
+
+run(env)  # noqa: F821 - provided by odoo-bin shell
\ No newline at end of file
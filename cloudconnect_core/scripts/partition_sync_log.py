@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+Convert the cloudconnect.sync.log table to date partitions.
+
+Partitioning is opt-in. The conversion renames the table, copies every log
+into monthly (or daily) partitions and changes the primary key to
+(id, sync_date), all in a single transaction that locks the log table.
+Run it during a maintenance window, with the Odoo workers stopped, from an
+Odoo shell:
+
+    odoo-bin shell -d <database> < cloudconnect_core/scripts/partition_sync_log.py
+
+Set CLOUDCONNECT_PARTITION_INTERVAL to 'daily' for daily partitions.
+Afterwards the nightly cleanup drops expired partitions instead of deleting
+rows.
+"""
+
+import os
+import time
+
+INTERVAL = os.environ.get('CLOUDCONNECT_PARTITION_INTERVAL', 'monthly')
+
+
+def run(env):
+    SyncLog = env['cloudconnect.sync.log']
+    started = time.monotonic()
+    copied = SyncLog.setup_partitioning(INTERVAL)
+
+    # Same check as a module update: the ORM must not try to recreate the table
+    SyncLog._auto_init()
+    partitions = SyncLog._get_partitions()
+    env.cr.commit()
+
+    print(f"Copied {copied} sync logs in {time.monotonic() - started:.1f}s")
+    print(f"{len(partitions)} {INTERVAL} partitions, from {partitions[0][1]:%Y-%m-%d} to {partitions[-1][2]:%Y-%m-%d}")
+
+
+run(env)  # noqa: F821 - provided by odoo-bin shell
\ No newline at end of file
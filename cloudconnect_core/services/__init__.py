@@ -2,4 +2,5 @@
 
 from . import cloudbeds_api_service
 from . import webhook_processor
-from . import sync_manager
\ No newline at end of file
+from . import sync_manager
+from . import sync_scheduler
\ No newline at end of file
@@ -11,6 +11,10 @@ from functools import wraps
 
 _logger = logging.getLogger(__name__)
 
+# Rate limiters shared by all requests of a configuration, keyed by
+# (database, config id, rate limit)
+_rate_limiters = {}
+
 
 def rate_limit(calls_per_second):
     """Decorator to implement rate limiting."""
@@ -43,10 +47,21 @@ class CloudbedsAPIService(models.AbstractModel):
             'Accept': 'application/json',
         }
     
+    def _get_rate_limiter(self, config):
+        """Get the rate limiter shared by all requests of a configuration."""
+        key = (self.env.cr.dbname, config.id, config.rate_limit)
+        if key not in _rate_limiters:
+            _rate_limiters[key] = rate_limit(config.rate_limit)
+        return _rate_limiters[key]
+    
     def _make_request(self, config, method, endpoint, params=None, data=None, retry_count=0):
         """
         Make HTTP request to Cloudbeds API with retry logic.
         
+        When the context holds ``cloudconnect_replay_log_id`` the request is
+        recorded on that existing sync log instead of a new one, which is how
+        failed calls are replayed (see replay_request).
+        
         :param config: cloudconnect.config record
         :param method: HTTP method (GET, POST, PUT, DELETE)
         :param endpoint: API endpoint (e.g., 'getReservation')
@@ -57,16 +72,26 @@ class CloudbedsAPIService(models.AbstractModel):
         """
         max_retries = 3
         
-        # Create sync log
-        sync_log = self.env['cloudconnect.sync.log'].create({
-            'operation_type': 'api_call',
-            'model_name': 'cloudconnect.api.service',
-            'action': 'fetch',
-            'config_id': config.id,
-            'api_endpoint': endpoint,
-            'request_data': json.dumps(data or params or {}, indent=2),
-            'status': 'pending',
-        })
+        replay_log_id = self.env.context.get('cloudconnect_replay_log_id')
+        if replay_log_id:
+            sync_log = self.env['cloudconnect.sync.log'].browse(replay_log_id)
+            sync_log.write({
+                'http_method': method,
+                'status': 'pending',
+            })
+        else:
+            # Create sync log, spooled when the log table is under pressure
+            sync_log = self.env['cloudconnect.sync.log.spool'].create_log({
+                'operation_type': 'api_call',
+                'model_name': 'cloudconnect.api.service',
+                'action': 'fetch',
+                'config_id': config.id,
+                'property_id': self.env.context.get('cloudconnect_property_id', False),
+                'api_endpoint': endpoint,
+                'http_method': method,
+                'request_data': json.dumps(data or params or {}, indent=2),
+                'status': 'pending',
+            })
         
         start_time = time.time()
         
@@ -77,7 +102,7 @@ class CloudbedsAPIService(models.AbstractModel):
                 config.refresh_access_token()
             
             # Apply rate limiting based on config
-            rate_limiter = rate_limit(config.rate_limit)
+            rate_limiter = self._get_rate_limiter(config)
             
             @rate_limiter
             def make_request():
@@ -103,10 +128,8 @@ class CloudbedsAPIService(models.AbstractModel):
             response = make_request()
             duration = time.time() - start_time
             
-            # Extract request ID for tracking
+            # Extract request ID for tracking, written along with the outcome
             request_id = response.headers.get('X-Request-ID', '')
-            sync_log.request_id = request_id
-            sync_log.http_status = response.status_code
             
             # Handle response
             if response.status_code == 200:
@@ -114,28 +137,31 @@ class CloudbedsAPIService(models.AbstractModel):
                 
                 # Check Cloudbeds API success flag
                 if response_data.get('success', True):
-                    sync_log.mark_success(response_data, duration)
+                    sync_log.mark_success(response_data, duration, response.status_code, request_id)
                     return response_data
                 else:
                     # API returned success=false
                     error_msg = response_data.get('message', 'Unknown API error')
-                    sync_log.mark_error(error_msg, response.status_code, response_data)
+                    sync_log.mark_error(error_msg, response.status_code, response_data, request_id)
                     raise UserError(_("Cloudbeds API Error: %s") % error_msg)
             
             elif response.status_code == 401:
                 # Unauthorized - try refreshing token
                 if retry_count == 0:
                     _logger.info("Got 401, attempting token refresh...")
+                    sync_log._write_status({'http_status': 401, 'request_id': request_id or None})
                     config.refresh_access_token()
                     return self._make_request(config, method, endpoint, params, data, retry_count + 1)
                 else:
-                    sync_log.mark_error("Authentication failed after token refresh", 401)
+                    sync_log.mark_error("Authentication failed after token refresh", 401, request_id=request_id)
                     raise UserError(_("Authentication failed. Please re-authenticate."))
             
             elif response.status_code == 429:
                 # Rate limit exceeded
                 retry_after = int(response.headers.get('Retry-After', 60))
-                sync_log.mark_error(f"Rate limit exceeded. Retry after {retry_after} seconds", 429)
+                sync_log.mark_error(
+                    f"Rate limit exceeded. Retry after {retry_after} seconds", 429, request_id=request_id
+                )
                 
                 if retry_count < max_retries:
                     _logger.warning(f"Rate limit hit, waiting {retry_after} seconds...")
@@ -147,7 +173,9 @@ class CloudbedsAPIService(models.AbstractModel):
             else:
                 # Other error
                 error_text = response.text
-                sync_log.mark_error(f"HTTP {response.status_code}: {error_text}", response.status_code)
+                sync_log.mark_error(
+                    f"HTTP {response.status_code}: {error_text}", response.status_code, request_id=request_id
+                )
                 
                 if retry_count < max_retries and response.status_code >= 500:
                     # Retry on server errors
@@ -176,6 +204,114 @@ class CloudbedsAPIService(models.AbstractModel):
         except Exception as e:
             sync_log.mark_error(f"Unexpected error: {str(e)}", 0)
             raise
+        
+        finally:
+            # A spooled log is written out with its final state
+            self.env['cloudconnect.sync.log.spool'].finalize(sync_log)
+    
+    # Replay of logged calls
+    def _get_replay_handlers(self):
+        """
+        Map replayable endpoints to the service call that produced them.
+        
+        Each entry is ``endpoint: (http_method, handler)`` where the handler
+        takes the configuration and the logged request payload. Endpoints
+        creating records (postReservation, postPayment...) are deliberately
+        left out: replaying them could create duplicates in Cloudbeds.
+        Updates (putReservation, putGuest) are left out too: replayed later,
+        a logged payload would overwrite changes made in Cloudbeds since the
+        original call.
+        
+        :return: Dictionary of replay handlers
+        """
+        return {
+            'getHotels': ('GET', lambda config, payload: self.get_properties(config)),
+            'getHotelDetails': ('GET', lambda config, payload: self.get_property_details(
+                config, payload.get('propertyID'))),
+            'getReservation': ('GET', lambda config, payload: self.get_reservation(
+                config, payload['reservationID'])),
+            'getReservations': ('GET', lambda config, payload: self.get_reservations(config, payload)),
+            'getGuest': ('GET', lambda config, payload: self.get_guest(
+                config, payload.get('guestID'), payload.get('reservationID'))),
+            'getGuestList': ('GET', lambda config, payload: self.get_guests(config, payload)),
+            'getRoomTypes': ('GET', lambda config, payload: self.get_room_types(
+                config, str(payload['propertyIDs']).split(',') if payload.get('propertyIDs') else None)),
+            'getRooms': ('GET', lambda config, payload: self.get_rooms(config, payload)),
+            'getAvailableRoomTypes': ('GET', lambda config, payload: self.get_available_room_types(
+                config, payload['startDate'], payload['endDate'], payload['adults'],
+                payload['children'], payload.get('rooms', 1))),
+            'getRate': ('GET', lambda config, payload: self.get_rates(
+                config, payload['roomTypeID'], payload['startDate'], payload['endDate'],
+                payload.get('adults', 1), payload.get('children', 0))),
+            'getPayments': ('GET', lambda config, payload: self.get_payments(
+                config, payload.get('reservationID'), payload.get('guestID'))),
+            'getWebhooks': ('GET', lambda config, payload: self.get_webhooks(config)),
+            'deleteWebhook': ('DELETE', lambda config, payload: self.delete_webhook(
+                config, payload['subscriptionID'])),
+            'getHousekeepingStatus': ('GET', lambda config, payload: self.get_housekeeping_status(
+                config, payload)),
+            'getDashboard': ('GET', lambda config, payload: self.get_dashboard(
+                config, payload.get('date'))),
+        }
+    
+    def is_replayable(self, sync_log):
+        """Check whether a logged API call can be replayed safely."""
+        handler = self._get_replay_handlers().get(sync_log.api_endpoint)
+        if not handler:
+            return False
+        return not sync_log.http_method or sync_log.http_method == handler[0]
+    
+    def reject_unreplayable(self, sync_logs):
+        """
+        Stop retrying logged API calls that cannot be replayed.
+        
+        All rejected logs are updated with a single statement instead of
+        going through the retry machinery one by one.
+        
+        :param sync_logs: cloudconnect.sync.log recordset about to be retried
+        :return: The logs that remain to be retried
+        """
+        handlers = self._get_replay_handlers()
+        rejected = sync_logs.filtered(lambda log: log.operation_type == 'api_call' and (
+            log.api_endpoint not in handlers
+            or (log.http_method and log.http_method != handlers[log.api_endpoint][0])
+        ))
+        
+        if rejected:
+            _logger.info(f"Stopping retries of {len(rejected)} API calls that cannot be replayed")
+            rejected._write_status({
+                'error_message': _("Retry not supported for this API call"),
+                'next_retry': None,
+            })
+            
+        return sync_logs - rejected
+    
+    def replay_request(self, sync_log):
+        """
+        Re-execute the API call recorded in a sync log.
+        
+        The outcome (success, HTTP status, error) is recorded on the given
+        sync log itself.
+        
+        :param sync_log: cloudconnect.sync.log record of an api_call operation
+        :return: Response data
+        """
+        sync_log.ensure_one()
+        
+        if not self.is_replayable(sync_log):
+            raise UserError(_("API call %s %s cannot be replayed.") % (
+                sync_log.http_method or '', sync_log.api_endpoint or ''
+            ))
+            
+        payload = json.loads(sync_log.request_data) if sync_log.request_data else {}
+        
+        # Handlers are bound to a service whose context routes the request
+        # to the existing log
+        service = self.with_context(cloudconnect_replay_log_id=sync_log.id)
+        handler = service._get_replay_handlers()[sync_log.api_endpoint][1]
+        
+        _logger.info(f"Replaying API call to {sync_log.api_endpoint} (log {sync_log.id})")
+        return handler(sync_log.config_id, payload)
     
     # Property Management
     def get_properties(self, config):
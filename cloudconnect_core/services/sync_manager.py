@@ -2,6 +2,7 @@
 
 from odoo import models, api, fields, _
 from odoo.exceptions import UserError
+import json
 import logging
 from datetime import datetime, timedelta
 from queue import Queue, PriorityQueue, Empty
@@ -30,11 +31,12 @@ class SyncManager(models.AbstractModel):
             self.__class__._active_syncs = {}
     
     @api.model
-    def sync_property(self, property_record):
+    def sync_property(self, property_record, operation_type='manual'):
         """
         Synchronize all data for a property.
         
         :param property_record: cloudconnect.property record
+        :param operation_type: 'manual' or 'scheduled', recorded on the sync log
         :return: Action dictionary with results
         """
         # Initialize sync manager if needed
@@ -52,13 +54,31 @@ class SyncManager(models.AbstractModel):
                 raise UserError(_("Synchronization is already running for this property."))
             self.__class__._active_syncs[property_record.id] = datetime.now()
         
+        # Tag API calls made during this sync with the property
+        self = self.with_context(cloudconnect_property_id=property_record.id)
+        SyncLog = self.env['cloudconnect.sync.log']
+        
         try:
+            run_log = SyncLog.create({
+                'operation_type': operation_type,
+                'model_name': 'cloudconnect.property',
+                'action': 'sync',
+                'config_id': property_record.config_id.id,
+                'property_id': property_record.id,
+                'cloudbeds_id': property_record.cloudbeds_id,
+                'status': 'pending',
+                # Whole syncs are rescheduled by the sync scheduler, not retried
+                'max_retries': 0,
+            })
+            
             results = {
                 'property': property_record.name,
                 'start_time': datetime.now(),
                 'success': [],
                 'errors': [],
-                'warnings': []
+                'warnings': [],
+                'fingerprint_hits': 0,
+                'fingerprint_misses': 0,
             }
             
             # Sync in order of dependencies
@@ -71,18 +91,38 @@ class SyncManager(models.AbstractModel):
                 ('Transactions', self._sync_transactions),
             ]
             
+            # Resume from checkpoints left by an interrupted run, if any
+            Checkpoint = self.env['cloudconnect.sync.checkpoint']
+            checkpoints = Checkpoint.get_resume_state(property_record)
+            results['resumed'] = bool(checkpoints)
+            
             for operation_name, operation_method in sync_operations:
                 if not self._should_sync_model(property_record, operation_name):
                     continue
                 
+                checkpoint = checkpoints.get(operation_name)
+                if checkpoint and checkpoint.state == 'done':
+                    results['success'].append({
+                        'operation': operation_name,
+                        'count': checkpoint.records_processed,
+                        'message': _("Completed before interruption, skipped"),
+                    })
+                    continue
+                    
                 try:
                     _logger.info(f"Syncing {operation_name} for {property_record.name}")
                     operation_result = operation_method(property_record)
+                    Checkpoint.mark_done(property_record, operation_name)
+                    self._commit_progress()
                     results['success'].append({
                         'operation': operation_name,
                         'count': operation_result.get('count', 0),
-                        'message': operation_result.get('message', 'Success')
+                        'message': operation_result.get('message', 'Success'),
+                        'fingerprint_hits': operation_result.get('fingerprint_hits', 0),
+                        'fingerprint_misses': operation_result.get('fingerprint_misses', 0),
                     })
+                    results['fingerprint_hits'] += operation_result.get('fingerprint_hits', 0)
+                    results['fingerprint_misses'] += operation_result.get('fingerprint_misses', 0)
                 except Exception as e:
                     _logger.error(f"Error syncing {operation_name}: {str(e)}")
                     results['errors'].append({
@@ -90,6 +130,8 @@ class SyncManager(models.AbstractModel):
                         'error': str(e)
                     })
             
+            Checkpoint.clear(property_record)
+            
             # Update property sync status
             if results['errors']:
                 status = 'partial' if results['success'] else 'failed'
@@ -101,6 +143,9 @@ class SyncManager(models.AbstractModel):
                 self._format_sync_message(results)
             )
             
+            self._log_sync_run(run_log, status, results)
+            self.env['cloudconnect.sync.scheduler'].update_schedule(property_record)
+            
             # Return action to show results
             return {
                 'type': 'ir.actions.client',
@@ -118,6 +163,33 @@ class SyncManager(models.AbstractModel):
             with self.__class__._sync_lock:
                 self.__class__._active_syncs.pop(property_record.id, None)
     
+    def _log_sync_run(self, run_log, status, results):
+        """Record the outcome of a sync run, used by the adaptive scheduler."""
+        duration = (datetime.now() - results['start_time']).total_seconds()
+        summary = {
+            'records': sum(item.get('count', 0) for item in results['success']),
+            'changed': results['fingerprint_misses'],
+            'unchanged': results['fingerprint_hits'],
+            'errors': len(results['errors']),
+            'api_calls': self.env['cloudconnect.sync.log'].search_count([
+                ('property_id', '=', run_log.property_id.id),
+                ('operation_type', '=', 'api_call'),
+                ('sync_date', '>=', run_log.sync_date),
+            ]),
+        }
+        
+        if status == 'success':
+            run_log.mark_success(summary, duration)
+        elif status == 'partial':
+            run_log.write({
+                'duration': duration,
+                'response_data': json.dumps(summary, indent=2),
+            })
+            run_log.mark_warning(self._format_sync_message(results))
+        else:
+            run_log.mark_error(self._format_sync_message(results), response_data=summary)
+            run_log.duration = duration
+    
     def _should_sync_model(self, property_record, model_name):
         """Check if model should be synced based on property settings."""
         model_settings = {
@@ -131,6 +203,9 @@ class SyncManager(models.AbstractModel):
         """Format sync results into readable message."""
         lines = []
         
+        if results.get('resumed'):
+            lines.append(_("Resumed from the last checkpoint of an interrupted sync."))
+            
         if results['success']:
             lines.append(_("Successful operations:"))
             for item in results['success']:
@@ -146,6 +221,11 @@ class SyncManager(models.AbstractModel):
             for item in results['warnings']:
                 lines.append(f"  • {item['warning']}")
         
+        if results.get('fingerprint_hits') or results.get('fingerprint_misses'):
+            lines.append(_("\nUnchanged records skipped: %d, changed records processed: %d") % (
+                results['fingerprint_hits'], results['fingerprint_misses']
+            ))
+            
         return '\n'.join(lines)
     
     def _sync_room_types(self, property_record):
@@ -158,12 +238,11 @@ class SyncManager(models.AbstractModel):
                 [property_record.cloudbeds_id]
             )
             
-            # Process room types - just count for now
-            # Extension modules will handle actual room type creation
-            return {
-                'count': len(room_types),
-                'message': _("%d room types found") % len(room_types)
-            }
+            result = self._process_records(property_record, 'room_type', room_types, 'roomTypeID')
+            result['message'] = _("%d room types found, %d changed") % (
+                result['count'], result['fingerprint_misses']
+            )
+            return result
             
         except Exception as e:
             raise UserError(_("Failed to sync room types: %s") % str(e))
@@ -178,10 +257,19 @@ class SyncManager(models.AbstractModel):
                 {'propertyIDs': property_record.cloudbeds_id}
             )
             
-            return {
-                'count': len(rooms),
-                'message': _("%d rooms found") % len(rooms)
-            }
+            # getRooms groups rooms per property
+            room_list = []
+            for item in rooms:
+                if isinstance(item, dict) and 'rooms' in item:
+                    room_list.extend(item['rooms'] or [])
+                else:
+                    room_list.append(item)
+                    
+            result = self._process_records(property_record, 'room', room_list, 'roomID')
+            result['message'] = _("%d rooms found, %d changed") % (
+                result['count'], result['fingerprint_misses']
+            )
+            return result
             
         except Exception as e:
             raise UserError(_("Failed to sync rooms: %s") % str(e))
@@ -206,12 +294,13 @@ class SyncManager(models.AbstractModel):
                 'includeGuestInfo': True,
             }
             
-            guests = api_service.get_guests(property_record.config_id, filters)
-            
-            return {
-                'count': len(guests),
-                'message': _("%d guests found") % len(guests)
-            }
+            result = self._sync_paginated(
+                property_record, 'Guests', api_service.get_guests, filters, 'guest', 'guestID'
+            )
+            result['message'] = _("%d guests found, %d changed") % (
+                result['count'], result['fingerprint_misses']
+            )
+            return result
             
         except Exception as e:
             raise UserError(_("Failed to sync guests: %s") % str(e))
@@ -228,16 +317,223 @@ class SyncManager(models.AbstractModel):
                 'includeGuestsDetails': True,
             }
             
-            reservations = api_service.get_reservations(property_record.config_id, filters)
-            
-            return {
-                'count': len(reservations),
-                'message': _("%d reservations found") % len(reservations)
-            }
+            result = self._sync_paginated(
+                property_record, 'Reservations', api_service.get_reservations, filters,
+                'reservation', 'reservationID'
+            )
+            result['message'] = _("%d reservations found, %d changed") % (
+                result['count'], result['fingerprint_misses']
+            )
+            return result
             
         except Exception as e:
             raise UserError(_("Failed to sync reservations: %s") % str(e))
     
+    def _sync_paginated(self, property_record, operation_name, fetch_method, filters,
+                        entity_type, id_key):
+        """
+        Stream a paginated Cloudbeds listing through the sync pipeline.
+        
+        Progress is checkpointed and committed after every page, so a run
+        killed by a worker limit resumes from the last committed page using
+        the same filters instead of downloading everything again.
+        
+        :param property_record: cloudconnect.property record
+        :param operation_name: Operation name used for the checkpoint
+        :param fetch_method: API service method taking (config, filters)
+        :param filters: Filters for a fresh run
+        :param entity_type: Entity type key used by the fingerprint store
+        :param id_key: Payload key holding the Cloudbeds ID
+        :return: Dictionary with count and fingerprint hit/miss counters
+        """
+        checkpoint = self.env['cloudconnect.sync.checkpoint'].begin(
+            property_record, operation_name, filters
+        )
+        context = self._get_pipeline_context(property_record, entity_type, id_key, checkpoint)
+        context['fetch_method'] = fetch_method
+        
+        return self._run_pipeline(context, self._pipeline_fetch(context))
+    
+    def _process_records(self, property_record, entity_type, records, id_key):
+        """
+        Run an already fetched, unpaginated list through the sync pipeline.
+        
+        :param property_record: cloudconnect.property record
+        :param entity_type: Entity type key used by the fingerprint store
+        :param records: List of Cloudbeds payload dictionaries
+        :param id_key: Payload key holding the Cloudbeds ID
+        :return: Dictionary with count and fingerprint hit/miss counters
+        """
+        context = self._get_pipeline_context(property_record, entity_type, id_key)
+        return self._run_pipeline(context, iter([(1, records)]))
+    
+    def _commit_progress(self):
+        """Commit work done so far so it survives an interrupted sync."""
+        if not self.env.registry.in_test_mode():
+            self.env.cr.commit()
+    
+    # Sync pipeline
+    #
+    # Records flow through chained generators:
+    #   fetch -> normalize -> filter unchanged -> batch -> upsert
+    # Every stage pulls from the previous one, so a page is only fetched
+    # once the previous one has been written (backpressure) and at most one
+    # page of records is held in memory at any time.
+    
+    def _get_pipeline_context(self, property_record, entity_type, id_key, checkpoint=None):
+        """Build the state shared by the stages of one pipeline run."""
+        ICP = self.env['ir.config_parameter'].sudo()
+        # The page size is the memory ceiling of the pipeline
+        page_size = min(
+            int(ICP.get_param('cloudconnect.sync_page_size', '100')),
+            int(ICP.get_param('cloudconnect.sync_max_page_size', '500')),
+        )
+        batch_size = min(int(ICP.get_param('cloudconnect.sync_batch_size', '50')), page_size)
+        
+        return {
+            'property': property_record,
+            'entity_type': entity_type,
+            'id_key': id_key,
+            'checkpoint': checkpoint,
+            'page_size': page_size,
+            'batch_size': batch_size,
+            'stats': {
+                'count': checkpoint.records_processed if checkpoint else 0,
+                'fingerprint_hits': 0,
+                'fingerprint_misses': 0,
+            },
+        }
+    
+    def _get_pipeline_stages(self, entity_type):
+        """
+        Return the transformation stages between fetch and upsert.
+        
+        Each stage takes (context, stream) and returns a generator of pages
+        ``(page_number, fetched_count, records)``, except the batch stage
+        which must stay last. Records are plain payloads before the filter
+        stage and (payload, cloudbeds_id, fingerprint) tuples after it.
+        Extension modules may override this method to insert their own
+        stages, e.g. enrichment or extra filtering.
+        """
+        return [
+            self._pipeline_normalize,
+            self._pipeline_filter_unchanged,
+            self._pipeline_batch,
+        ]
+    
+    def _run_pipeline(self, context, pages):
+        """
+        Chain the pipeline stages over a stream of pages and drain it.
+        
+        :param context: Dictionary from _get_pipeline_context()
+        :param pages: Iterator of (page_number, records) tuples
+        :return: Dictionary with count and fingerprint hit/miss counters
+        """
+        stream = ((page_number, len(records), records) for page_number, records in pages)
+        for stage in self._get_pipeline_stages(context['entity_type']):
+            stream = stage(context, stream)
+        
+        self._pipeline_upsert(context, stream)
+        return context['stats']
+    
+    def _pipeline_fetch(self, context):
+        """Stage: fetch pages from Cloudbeds, starting after the last checkpoint."""
+        checkpoint = context['checkpoint']
+        filters = checkpoint.get_cursor()
+        page_number = checkpoint.page_number + 1
+        
+        while True:
+            page_filters = dict(filters, pageNumber=page_number, pageSize=context['page_size'])
+            records = context['fetch_method'](context['property'].config_id, page_filters)
+            
+            yield page_number, records
+            
+            if len(records) < context['page_size']:
+                break
+            page_number += 1
+    
+    def _pipeline_normalize(self, context, pages):
+        """Stage: normalize payloads, dropping the ones the hook rejects."""
+        for page_number, fetched_count, records in pages:
+            context['stats']['count'] += fetched_count
+            normalized = []
+            for payload in records:
+                record = self._normalize_record(context['entity_type'], payload)
+                if record is not None:
+                    normalized.append(record)
+            yield page_number, fetched_count, normalized
+    
+    def _normalize_record(self, entity_type, payload):
+        """
+        Normalize a single Cloudbeds payload before change detection.
+        
+        :param entity_type: Entity type key
+        :param payload: Cloudbeds payload dictionary
+        :return: Normalized payload, or None to skip the record
+        """
+        return payload
+    
+    def _pipeline_filter_unchanged(self, context, pages):
+        """Stage: drop records whose fingerprint did not change (one query per page)."""
+        Fingerprint = self.env['cloudconnect.sync.fingerprint']
+        
+        for page_number, fetched_count, records in pages:
+            changed, unchanged_count = Fingerprint.split_changed(
+                context['property'], context['entity_type'], records, context['id_key']
+            )
+            context['stats']['fingerprint_hits'] += unchanged_count
+            context['stats']['fingerprint_misses'] += len(changed)
+            yield page_number, fetched_count, changed
+    
+    def _pipeline_batch(self, context, pages):
+        """
+        Stage: split changed records into write batches.
+        
+        Yields ``('batch', page_number, items)`` for every batch and a final
+        ``('page_end', page_number, fetched_count)`` marker per page, so the
+        upsert stage checkpoints only fully written pages.
+        """
+        batch_size = context['batch_size']
+        
+        for page_number, fetched_count, changed in pages:
+            for start in range(0, len(changed), batch_size):
+                yield 'batch', page_number, changed[start:start + batch_size]
+            yield 'page_end', page_number, fetched_count
+    
+    def _pipeline_upsert(self, context, items):
+        """Stage: write batches through _dispatch_records() and checkpoint pages."""
+        Fingerprint = self.env['cloudconnect.sync.fingerprint']
+        property_record = context['property']
+        entity_type = context['entity_type']
+        checkpoint = context['checkpoint']
+        
+        for kind, page_number, payload in items:
+            if kind == 'batch':
+                self._dispatch_records(
+                    property_record,
+                    entity_type,
+                    [record for record, _cloudbeds_id, _fingerprint in payload]
+                )
+                # Only remember fingerprints once the records were processed
+                Fingerprint.store_fingerprints(property_record, entity_type, payload)
+            elif checkpoint:
+                checkpoint.advance(page_number, payload)
+                self._commit_progress()
+    
+    def _dispatch_records(self, property_record, entity_type, records):
+        """
+        Write a batch of changed records (upsert stage hook).
+        
+        The core module has no local models for Cloudbeds objects; extension
+        modules override this method to create or update their records.
+        Batches never exceed cloudconnect.sync_batch_size records.
+        
+        :param property_record: cloudconnect.property record
+        :param entity_type: Entity type key ('room_type', 'room', 'guest', 'reservation')
+        :param records: List of changed Cloudbeds payload dictionaries
+        """
+        return True
+    
     def _sync_transactions(self, property_record):
         """Sync transactions for property."""
         # Basic implementation - extension modules will enhance
@@ -275,25 +571,31 @@ class SyncManager(models.AbstractModel):
             return False
     
     def _retry_api_call(self, sync_log):
-        """Retry a failed API call."""
-        # Parse original request data
-        try:
-            import json
-            request_data = json.loads(sync_log.request_data) if sync_log.request_data else {}
-            
-            # Recreate API call based on endpoint
-            api_service = self.env['cloudconnect.api.service']
-            config = sync_log.config_id
-            
-            # This is simplified - real implementation would need to map endpoints to methods
-            _logger.info(f"Retrying API call to {sync_log.api_endpoint}")
+        """
+        Retry a failed API call by replaying the logged request.
+        
+        The logged endpoint, HTTP method and parameters are mapped back to the
+        matching cloudconnect.api.service call, whose real outcome is recorded
+        on the retry log.
+        """
+        api_service = self.env['cloudconnect.api.service']
+        
+        if not api_service.is_replayable(sync_log):
+            sync_log.mark_error(_("Retry not supported for %s %s") % (
+                sync_log.http_method or '', sync_log.api_endpoint or ''
+            ))
+            # Replaying will never work, stop scheduling retries
+            sync_log.next_retry = False
+            return False
             
-            # Mark as successful for now
-            sync_log.mark_success({'retry': True})
-            return True
+        try:
+            api_service.replay_request(sync_log)
+            return sync_log.status == 'success'
             
         except Exception as e:
-            sync_log.mark_error(f"Retry failed: {str(e)}")
+            # The API service already recorded HTTP errors on the log
+            if sync_log.status != 'error':
+                sync_log.mark_error(f"Retry failed: {str(e)}")
             return False
     
     def _retry_webhook(self, sync_log):
@@ -371,7 +673,7 @@ class SyncManager(models.AbstractModel):
                 # Process sync
                 property_record = self.env['cloudconnect.property'].browse(sync_job['property_id'])
                 if property_record.exists() and property_record.sync_enabled:
-                    self.sync_property(property_record)
+                    self.sync_property(property_record, operation_type='scheduled')
                     processed += 1
                     
             except Exception as e:
@@ -380,63 +682,110 @@ class SyncManager(models.AbstractModel):
         return processed
     
     @api.model
-    def get_sync_statistics(self, hours=24):
-        """Get synchronization statistics."""
+    def get_sync_statistics(self, hours=24, percentiles=False):
+        """
+        Get synchronization statistics.
+        
+        Counts come from the hourly rollup (plus the raw logs of the hours not
+        rolled up yet), so the cost stays flat as the log table grows.
+        Percentiles cannot be rolled up and are computed from the raw logs.
+        
+        :param hours: Time window in hours
+        :param percentiles: Also compute p50/p95 durations per operation type
+        :return: Dictionary of statistics
+        """
         since = datetime.now() - timedelta(hours=hours)
         
-        # Get sync logs
-        sync_logs = self.env['cloudconnect.sync.log'].search([
-            ('sync_date', '>=', since),
-            ('operation_type', 'in', ['manual', 'scheduled'])
-        ])
+        counts = self.env['cloudconnect.sync.log.rollup'].read_counts(
+            since,
+            ['property_id', 'hour', 'status'],
+            [('operation_type', 'in', ['manual', 'scheduled'])],
+        )
         
-        # Calculate statistics
         stats = {
-            'total_syncs': len(sync_logs),
-            'successful_syncs': len(sync_logs.filtered(lambda l: l.status == 'success')),
-            'failed_syncs': len(sync_logs.filtered(lambda l: l.status == 'error')),
-            'average_duration': sum(sync_logs.mapped('duration')) / len(sync_logs) if sync_logs else 0,
+            'total_syncs': 0,
+            'successful_syncs': 0,
+            'failed_syncs': 0,
+            'average_duration': 0,
             'syncs_by_property': {},
             'syncs_by_hour': {},
         }
         
-        # Group by property
-        for log in sync_logs:
-            if log.property_id:
-                prop_name = log.property_id.name
-                if prop_name not in stats['syncs_by_property']:
-                    stats['syncs_by_property'][prop_name] = 0
-                stats['syncs_by_property'][prop_name] += 1
-        
-        # Group by hour
-        for log in sync_logs:
-            hour = log.sync_date.strftime('%Y-%m-%d %H:00')
-            if hour not in stats['syncs_by_hour']:
-                stats['syncs_by_hour'][hour] = 0
-            stats['syncs_by_hour'][hour] += 1
+        duration_sum = 0.0
+        property_counts = {}
+        for (property_id, hour, status), totals in counts.items():
+            count = totals['count']
+            stats['total_syncs'] += count
+            if status == 'success':
+                stats['successful_syncs'] += count
+            elif status == 'error':
+                stats['failed_syncs'] += count
+            duration_sum += totals['duration_sum']
+            
+            if property_id:
+                property_counts[property_id] = property_counts.get(property_id, 0) + count
+                
+            hour_key = hour.strftime('%Y-%m-%d %H:00')
+            stats['syncs_by_hour'][hour_key] = stats['syncs_by_hour'].get(hour_key, 0) + count
+            
+        if stats['total_syncs']:
+            stats['average_duration'] = duration_sum / stats['total_syncs']
         
+        # Group by property name
+        for prop in self.env['cloudconnect.property'].browse(list(property_counts)):
+            stats['syncs_by_property'][prop.name] = (
+                stats['syncs_by_property'].get(prop.name, 0) + property_counts[prop.id]
+            )
+        
+        if percentiles:
+            stats['duration_by_operation'] = self._get_duration_percentiles(since)
+            
         return stats
     
+    def _get_duration_percentiles(self, since):
+        """Compute p50/p95 sync durations per operation type from the raw logs."""
+        SyncLog = self.env['cloudconnect.sync.log']
+        SyncLog.check_access_rights('read')
+        SyncLog.flush_model(['sync_date', 'operation_type', 'duration'])
+        
+        self.env.cr.execute("""
+            SELECT operation_type,
+                   COUNT(*) AS count,
+                   AVG(COALESCE(duration, 0)) AS average,
+                   percentile_cont(0.5) WITHIN GROUP (ORDER BY COALESCE(duration, 0)) AS p50,
+                   percentile_cont(0.95) WITHIN GROUP (ORDER BY COALESCE(duration, 0)) AS p95
+              FROM cloudconnect_sync_log
+             WHERE sync_date >= %s
+               AND operation_type IN ('manual', 'scheduled')
+          GROUP BY operation_type
+        """, [since])
+        
+        return {
+            row['operation_type']: {
+                'count': row['count'],
+                'average': row['average'] or 0,
+                'p50': row['p50'] or 0,
+                'p95': row['p95'] or 0,
+            }
+            for row in self.env.cr.dictfetchall()
+        }
+    
     @api.model
     def _cron_scheduled_sync(self):
-        """Cron job to run scheduled synchronizations."""
+        """
+        Cron job to run scheduled synchronizations.
+        
+        Properties are scheduled by the adaptive scheduler, which derives the
+        interval of each property from its activity and enforces the API
+        budget of each configuration.
+        """
+        scheduled = self.env['cloudconnect.sync.scheduler'].schedule_due_syncs()
+        
+        if scheduled:
+            _logger.info(f"Scheduled {scheduled} property syncs")
+            
         # Process sync queue
         processed = self.process_sync_queue()
         
         if processed:
-            _logger.info(f"Processed {processed} scheduled syncs")
-        
-        # Check for properties that need periodic sync
-        properties = self.env['cloudconnect.property'].search([
-            ('sync_enabled', '=', True),
-            ('config_id.active', '=', True),
-        ])
-        
-        for prop in properties:
-            # Check last sync time
-            if prop.last_sync_date:
-                hours_since_sync = (datetime.now() - prop.last_sync_date).total_seconds() / 3600
-                
-                # Sync if more than 6 hours since last sync
-                if hours_since_sync >= 6:
-                    self.schedule_sync(prop.id, priority=7)
\ No newline at end of file
+            _logger.info(f"Processed {processed} scheduled syncs")
\ No newline at end of file
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, api, fields
+import json
+import logging
+from datetime import timedelta
+
+_logger = logging.getLogger(__name__)
+
+
+class SyncScheduler(models.AbstractModel):
+    _name = 'cloudconnect.sync.scheduler'
+    _description = 'CloudConnect Adaptive Sync Scheduler'
+    
+    @api.model
+    def _get_scheduler_params(self):
+        """Read scheduler tuning parameters from system parameters."""
+        ICP = self.env['ir.config_parameter'].sudo()
+        return {
+            'base_interval': float(ICP.get_param('cloudconnect.sync_base_interval_hours', '6')),
+            'min_interval': float(ICP.get_param('cloudconnect.sync_min_interval_hours', '1')),
+            'max_interval': float(ICP.get_param('cloudconnect.sync_max_interval_hours', '24')),
+            'history_size': int(ICP.get_param('cloudconnect.sync_history_size', '10')),
+            'api_budget_per_hour': int(ICP.get_param('cloudconnect.api_budget_per_hour', '3000')),
+        }
+    
+    @api.model
+    def _get_sync_history(self, property_record, limit):
+        """
+        Summarize the last sync runs of a property from the sync log.
+        
+        :return: Dictionary with change ratio, consecutive failures and the
+                 average number of API calls per run
+        """
+        runs = self.env['cloudconnect.sync.log'].search_read([
+            ('property_id', '=', property_record.id),
+            ('operation_type', 'in', ['manual', 'scheduled']),
+            ('status', '!=', 'pending'),
+        ], ['status', 'response_data'], order='sync_date desc', limit=limit)
+        
+        records = changed = api_calls = 0
+        consecutive_failures = 0
+        counting_failures = True
+        
+        for run in runs:
+            if counting_failures and run['status'] == 'error':
+                consecutive_failures += 1
+            else:
+                counting_failures = False
+                
+            try:
+                summary = json.loads(run['response_data']) if run['response_data'] else {}
+            except ValueError:
+                summary = {}
+            records += summary.get('records', 0)
+            changed += summary.get('changed', 0)
+            api_calls += summary.get('api_calls', 0)
+            
+        return {
+            'runs': len(runs),
+            'change_ratio': changed / records if records else 0.0,
+            'consecutive_failures': consecutive_failures,
+            'avg_api_calls': api_calls / len(runs) if runs else 0,
+        }
+    
+    @api.model
+    def _get_webhook_activity(self, properties):
+        """
+        Count webhook events received in the last 24 hours per property.
+        
+        :return: Dictionary mapping property id to (events, errors)
+        """
+        since = fields.Datetime.now() - timedelta(hours=24)
+        activity = {}
+        
+        for prop, status, count in self.env['cloudconnect.sync.log']._read_group(
+            [
+                ('operation_type', '=', 'webhook'),
+                ('property_id', 'in', properties.ids),
+                ('sync_date', '>=', since),
+            ],
+            ['property_id', 'status'],
+            ['__count'],
+        ):
+            events, errors = activity.get(prop.id, (0, 0))
+            activity[prop.id] = (
+                events + count,
+                errors + (count if status == 'error' else 0),
+            )
+            
+        return activity
+    
+    @api.model
+    def compute_interval(self, property_record, history=None, webhook_activity=None):
+        """
+        Derive the sync interval of a property from its observed activity.
+        
+        - Properties whose syncs keep finding changes sync more often.
+        - Properties receiving webhook events reliably are already kept up
+          to date in real time and sync less often.
+        - Consecutive failed syncs back off exponentially.
+        
+        :param property_record: cloudconnect.property record
+        :param history: Optional result of _get_sync_history()
+        :param webhook_activity: Optional (events, errors) tuple for the property
+        :return: Interval in hours
+        """
+        params = self._get_scheduler_params()
+        if history is None:
+            history = self._get_sync_history(property_record, params['history_size'])
+            
+        if webhook_activity is None:
+            webhook_activity = self._get_webhook_activity(property_record).get(
+                property_record.id, (0, 0)
+            )
+        events, errors = webhook_activity
+        
+        interval = params['base_interval']
+        
+        # Busy properties: up to 5 times more often when every record changes
+        interval /= 1 + 4 * history['change_ratio']
+        
+        # Well covered by webhooks: changes already arrive in real time
+        if events and (events - errors) / events >= 0.9:
+            interval *= 3
+            
+        # Back off while syncs keep failing
+        if history['consecutive_failures']:
+            interval *= 2 ** min(history['consecutive_failures'], 5)
+            
+        return min(max(interval, params['min_interval']), params['max_interval'])
+    
+    @api.model
+    def update_schedule(self, property_record):
+        """Recompute the interval and next sync date after a sync run."""
+        interval = self.compute_interval(property_record)
+        property_record.write({
+            'sync_interval_hours': interval,
+            'next_sync_date': fields.Datetime.now() + timedelta(hours=interval),
+        })
+        return interval
+    
+    @api.model
+    def _get_api_calls_last_hour(self, config):
+        """Count API calls made for a configuration during the last hour."""
+        return self.env['cloudconnect.sync.log'].search_count([
+            ('config_id', '=', config.id),
+            ('operation_type', '=', 'api_call'),
+            ('sync_date', '>=', fields.Datetime.now() - timedelta(hours=1)),
+        ])
+    
+    @api.model
+    def schedule_due_syncs(self):
+        """
+        Schedule syncs for properties whose adaptive interval has elapsed.
+        
+        Most overdue properties go first. Each configuration has an hourly API
+        call budget (cloudconnect.api_budget_per_hour); properties that would
+        exceed it are deferred to a later run.
+        
+        :return: Number of scheduled syncs
+        """
+        params = self._get_scheduler_params()
+        now = fields.Datetime.now()
+        sync_manager = self.env['cloudconnect.sync.manager']
+        
+        properties = self.env['cloudconnect.property'].search([
+            ('sync_enabled', '=', True),
+            ('config_id.active', '=', True),
+            ('last_sync_date', '!=', False),
+        ])
+        
+        due = []
+        for prop in properties:
+            next_sync = prop.next_sync_date or (
+                prop.last_sync_date + timedelta(hours=params['base_interval'])
+            )
+            if next_sync <= now:
+                due.append((next_sync, prop))
+                
+        if not due:
+            return 0
+            
+        due.sort(key=lambda item: item[0])
+        webhook_activity = self._get_webhook_activity(
+            self.env['cloudconnect.property'].browse([prop.id for _next, prop in due])
+        )
+        
+        budget_left = {}
+        scheduled = 0
+        
+        for _next_sync, prop in due:
+            config = prop.config_id
+            if config.id not in budget_left:
+                budget_left[config.id] = params['api_budget_per_hour'] - self._get_api_calls_last_hour(config)
+                
+            history = self._get_sync_history(prop, params['history_size'])
+            # Unknown cost for properties without history: assume a small run
+            expected_calls = history['avg_api_calls'] or 10
+            
+            if expected_calls > budget_left[config.id]:
+                _logger.info(
+                    f"Deferring sync of {prop.name}: API budget of {config.name} exhausted "
+                    f"({budget_left[config.id]} calls left, {expected_calls:.0f} expected)"
+                )
+                continue
+                
+            budget_left[config.id] -= expected_calls
+            interval = self.compute_interval(prop, history, webhook_activity.get(prop.id, (0, 0)))
+            # Push the next sync date now so the property is not queued twice
+            prop.write({
+                'sync_interval_hours': interval,
+                'next_sync_date': now + timedelta(hours=interval),
+            })
+            sync_manager.schedule_sync(prop.id, priority=7)
+            scheduled += 1
+            
+        return scheduled
\ No newline at end of file
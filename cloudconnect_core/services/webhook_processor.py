@@ -20,8 +20,59 @@ class WebhookProcessor(models.AbstractModel):
         :param event_data: Dictionary with event data
         :return: Boolean indicating success
         """
-        # Create sync log for tracking
-        sync_log = self.env['cloudconnect.sync.log'].create({
+        # Create sync log for tracking, spooled when the log table is under pressure
+        Spool = self.env['cloudconnect.sync.log.spool']
+        sync_log = Spool.create_log(self._prepare_sync_log_vals(webhook, event_data))
+        
+        try:
+            outcome = self._handle_event(webhook, event_data, sync_log)
+            if outcome['status'] == 'success':
+                sync_log.mark_success(response_data=outcome['response_data'])
+            else:
+                sync_log.mark_warning(outcome['message'])
+        except Exception as e:
+            _logger.error(f"Error processing webhook event: {str(e)}", exc_info=True)
+            sync_log.mark_error(str(e))
+            raise
+        finally:
+            Spool.finalize(sync_log)
+        return True
+    
+    def process_events(self, webhook, events):
+        """
+        Process a batch of webhook events received for the same subscription.
+        
+        Sync logs are created with one INSERT and their outcomes recorded with
+        one UPDATE, or spooled like in process_event() when the log table is
+        under pressure. Each event runs in its own savepoint, so a failing
+        event does not prevent the others from being processed.
+        
+        :param webhook: cloudconnect.webhook record
+        :param events: List of event data dictionaries
+        :return: Tuple (processed, errors) where errors lists the error messages
+        """
+        Spool = self.env['cloudconnect.sync.log.spool']
+        sync_logs = Spool.create_logs([
+            self._prepare_sync_log_vals(webhook, event_data) for event_data in events
+        ])
+        
+        outcomes = []
+        errors = []
+        for sync_log, event_data in zip(sync_logs, events):
+            try:
+                with self.env.cr.savepoint():
+                    outcomes.append(self._handle_event(webhook, event_data, sync_log))
+            except Exception as e:
+                _logger.error(f"Error processing webhook event: {str(e)}", exc_info=True)
+                outcomes.append({'id': sync_log.id, 'status': 'error', 'message': str(e)})
+                errors.append(str(e))
+                
+        Spool.mark_batch(sync_logs, outcomes)
+        return len(events) - len(errors), errors
+    
+    def _prepare_sync_log_vals(self, webhook, event_data):
+        """Values of the sync log tracking a webhook event."""
+        return {
             'operation_type': 'webhook',
             'model_name': webhook.event_object or 'unknown',
             'action': webhook.event_action or 'process',
@@ -30,40 +81,46 @@ class WebhookProcessor(models.AbstractModel):
             'request_data': json.dumps(event_data, indent=2),
             'api_endpoint': webhook.event_type,
             'status': 'pending',
-        })
+        }
+    
+    def _handle_event(self, webhook, event_data, sync_log):
+        """
+        Route a webhook event to its processor.
         
-        try:
-            # Extract common event data
-            version = event_data.get('version', '1.0')
-            timestamp = event_data.get('timestamp')
-            property_id = event_data.get('propertyID') or event_data.get('propertyId')
-            
-            # Log event details
-            _logger.info(f"Processing webhook event: {webhook.event_type} for property {property_id}")
+        :return: Outcome dictionary for cloudconnect.sync.log.mark_batch()
+        """
+        # Extract common event data
+        version = event_data.get('version', '1.0')
+        timestamp = event_data.get('timestamp')
+        property_id = event_data.get('propertyID') or event_data.get('propertyId')
+        
+        # Log event details
+        _logger.info(f"Processing webhook event: {webhook.event_type} for property {property_id}")
+        
+        # Validate property if specified
+        if webhook.property_id and str(property_id) != webhook.property_id.cloudbeds_id:
+            raise ValueError(f"Property mismatch: expected {webhook.property_id.cloudbeds_id}, got {property_id}")
             
-            # Validate property if specified
-            if webhook.property_id and str(property_id) != webhook.property_id.cloudbeds_id:
-                raise ValueError(f"Property mismatch: expected {webhook.property_id.cloudbeds_id}, got {property_id}")
+        # Route to specific processor based on event type
+        processor_method = self._get_processor_method(webhook.event_type)
+        if processor_method:
+            result = processor_method(webhook, event_data, sync_log)
+            return {
+                'id': sync_log.id,
+                'status': 'success',
+                'response_data': {'processed': True, 'result': result},
+            }
             
-            # Route to specific processor based on event type
-            processor_method = self._get_processor_method(webhook.event_type)
-            if processor_method:
-                result = processor_method(webhook, event_data, sync_log)
-                sync_log.mark_success(response_data={'processed': True, 'result': result})
-                return True
-            else:
-                # No specific processor, just log the event
-                _logger.warning(f"No specific processor for event type: {webhook.event_type}")
-                sync_log.mark_warning(f"Event type {webhook.event_type} has no specific processor")
-                
-                # Notify subscribed modules through bus
-                self._notify_event(webhook, event_data)
-                return True
-                
-        except Exception as e:
-            _logger.error(f"Error processing webhook event: {str(e)}", exc_info=True)
-            sync_log.mark_error(str(e))
-            raise
+        # No specific processor, just log the event
+        _logger.warning(f"No specific processor for event type: {webhook.event_type}")
+        
+        # Notify subscribed modules through bus
+        self._notify_event(webhook, event_data)
+        return {
+            'id': sync_log.id,
+            'status': 'warning',
+            'message': f"Event type {webhook.event_type} has no specific processor",
+        }
     
     def _get_processor_method(self, event_type):
         """Get the appropriate processor method for event type."""
@@ -60,7 +60,7 @@ export class CloudConnectDashboard extends Component {
             // Load recent logs
             const recentLogs = await this.rpc("/web/dataset/search_read", {
                 model: "cloudconnect.sync.log",
-                fields: ["sync_date", "operation_type", "model_name", "status", "summary"],
+                fields: ["sync_date", "operation_type", "model_name", "action", "status", "error_message", "warning_message"],
                 limit: 10,
                 order: "sync_date desc",
             });
@@ -160,6 +160,21 @@ export class CloudConnectDashboard extends Component {
         return statusIcons[status] || "fa-question-circle";
     }
 
+    getLogSummary(log) {
+        // Rendered from the stored fields, no per-row compute on the server
+        const message = { error: log.error_message, warning: log.warning_message }[log.status];
+        if (message) {
+            return message.split("\n", 1)[0];
+        }
+        const labels = {
+            success: _t("Successfully"),
+            error: _t("Error during"),
+            warning: _t("Warning during"),
+            pending: _t("Pending"),
+        };
+        return `${labels[log.status] || ""} ${log.action} ${log.model_name}`;
+    }
+
     formatDate(dateStr) {
         if (!dateStr) return "";
         const date = new Date(dateStr);
@@ -266,7 +281,7 @@ CloudConnectDashboard.template = xml`
                                     <span class="ml-2" t-esc="formatDate(log.sync_date)"/>
                                     <span class="ml-2 font-weight-bold" t-esc="log.operation_type"/>
                                     <span class="ml-1" t-esc="log.model_name"/>
-                                    <div class="small text-muted ml-4" t-esc="log.summary"/>
+                                    <div class="small text-muted ml-4" t-esc="getLogSummary(log)"/>
                                 </li>
                             </ul>
                         </div>
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+
+from . import test_sync_fingerprint
+from . import test_sync_checkpoint
+from . import test_sync_log_rollup
+from . import test_sync_log_partitioning
+from . import test_sync_log_spool
\ No newline at end of file
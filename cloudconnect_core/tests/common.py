@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests.common import TransactionCase
+
+
+class CloudConnectTestCase(TransactionCase):
+    """Base test case with a configuration and a property."""
+    
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.config = cls.env['cloudconnect.config'].create({
+            'name': 'Test configuration',
+            'client_id': 'test-client',
+        })
+        cls.property = cls.env['cloudconnect.property'].create({
+            'name': 'Test property',
+            'cloudbeds_id': 'test-property',
+            'config_id': cls.config.id,
+        })
\ No newline at end of file
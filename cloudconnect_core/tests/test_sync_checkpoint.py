@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import tagged
+
+from .common import CloudConnectTestCase
+
+
+@tagged('post_install', '-at_install')
+class TestSyncCheckpoint(CloudConnectTestCase):
+    
+    def _fetch_pages(self, pages, fail_on=None):
+        """Build a fetch method serving the given pages and recording calls."""
+        calls = []
+        
+        def fetch(config, filters):
+            calls.append(filters['pageNumber'])
+            if filters['pageNumber'] == fail_on:
+                raise ConnectionError("Worker killed")
+            return pages[filters['pageNumber'] - 1]
+        return fetch, calls
+    
+    def test_resume_after_interruption(self):
+        self.env['ir.config_parameter'].sudo().set_param('cloudconnect.sync_page_size', '2')
+        SyncManager = self.env['cloudconnect.sync.manager']
+        Checkpoint = self.env['cloudconnect.sync.checkpoint']
+        pages = [
+            [{'guestID': '1'}, {'guestID': '2'}],
+            [{'guestID': '3'}, {'guestID': '4'}],
+            [{'guestID': '5'}],
+        ]
+        filters = {'resultsFrom': '2024-01-01'}
+        
+        fetch, calls = self._fetch_pages(pages, fail_on=2)
+        # Not assertRaises(): its savepoint would roll back the committed pages
+        try:
+            SyncManager._sync_paginated(self.property, 'Guests', fetch, filters, 'guest', 'guestID')
+        except ConnectionError:
+            pass
+        else:
+            self.fail("The interrupted sync should have raised")
+        checkpoint = Checkpoint.get_resume_state(self.property)['Guests']
+        self.assertEqual((checkpoint.state, checkpoint.page_number, checkpoint.records_processed), ('running', 1, 2))
+        
+        # The resumed run reads the stored window from the page after the checkpoint
+        fetch, calls = self._fetch_pages(pages)
+        result = SyncManager._sync_paginated(
+            self.property, 'Guests', fetch, {'resultsFrom': '2024-06-01'}, 'guest', 'guestID'
+        )
+        self.assertEqual(calls, [2, 3])
+        self.assertEqual(result['count'], 5)
+        self.assertEqual(checkpoint.get_cursor(), filters)
+        self.assertEqual(checkpoint.page_number, 3)
+    
+    def test_done_checkpoint_is_reset(self):
+        Checkpoint = self.env['cloudconnect.sync.checkpoint']
+        Checkpoint.mark_done(self.property, 'Guests')
+        
+        checkpoint = Checkpoint.begin(self.property, 'Guests', {'resultsFrom': '2024-01-01'})
+        self.assertEqual(checkpoint.state, 'running')
+        self.assertEqual(checkpoint.page_number, 0)
+        self.assertEqual(checkpoint.get_cursor(), {'resultsFrom': '2024-01-01'})
+        self.assertEqual(Checkpoint.search_count([('property_id', '=', self.property.id)]), 1)
\ No newline at end of file
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import tagged
+
+from .common import CloudConnectTestCase
+
+
+@tagged('post_install', '-at_install')
+class TestSyncFingerprint(CloudConnectTestCase):
+    
+    def test_volatile_keys_ignored(self):
+        Fingerprint = self.env['cloudconnect.sync.fingerprint']
+        self.assertEqual(
+            Fingerprint.compute_fingerprint({'guestID': '1', 'name': 'Ann', 'dateModified': '2024-01-01'}),
+            Fingerprint.compute_fingerprint({'name': 'Ann', 'guestID': '1', 'dateModified': '2024-02-01'}),
+        )
+    
+    def test_split_and_store(self):
+        Fingerprint = self.env['cloudconnect.sync.fingerprint']
+        records = [{'guestID': '1', 'name': 'Ann'}, {'guestID': '2', 'name': 'Bob'}]
+        
+        changed, unchanged = Fingerprint.split_changed(self.property, 'guest', records, 'guestID')
+        self.assertEqual((len(changed), unchanged), (2, 0))
+        Fingerprint.store_fingerprints(self.property, 'guest', changed)
+        
+        records[1] = {'guestID': '2', 'name': 'Bobby'}
+        records.append({'guestID': '3', 'name': 'Cy'})
+        changed, unchanged = Fingerprint.split_changed(self.property, 'guest', records, 'guestID')
+        self.assertEqual(unchanged, 1)
+        self.assertEqual(sorted(cb_id for _payload, cb_id, _hash in changed), ['2', '3'])
+        
+        Fingerprint.store_fingerprints(self.property, 'guest', changed)
+        fingerprints = Fingerprint.search([('property_id', '=', self.property.id)])
+        self.assertEqual(len(fingerprints), 3)
+        stored = {fp.cloudbeds_id: fp.fingerprint for fp in fingerprints}
+        self.assertEqual(stored['2'], Fingerprint.compute_fingerprint(records[1]))
+        
+        changed, unchanged = Fingerprint.split_changed(self.property, 'guest', records, 'guestID')
+        self.assertEqual((changed, unchanged), ([], 3))
\ No newline at end of file
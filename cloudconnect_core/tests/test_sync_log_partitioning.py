@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+
+from odoo import fields
+from odoo.exceptions import UserError
+from odoo.tests import tagged
+
+from .common import CloudConnectTestCase
+
+
+@tagged('post_install', '-at_install')
+class TestSyncLogPartitioning(CloudConnectTestCase):
+    
+    def _create_log(self, days_ago):
+        return self.env['cloudconnect.sync.log'].create({
+            'operation_type': 'api_call',
+            'model_name': 'res.partner',
+            'action': 'fetch',
+            'config_id': self.config.id,
+            'status': 'success',
+            'sync_date': fields.Datetime.now() - timedelta(days=days_ago),
+        })
+    
+    def test_partitioning_is_opt_in(self):
+        SyncLog = self.env['cloudconnect.sync.log']
+        self.assertFalse(SyncLog._is_partitioned())
+        SyncLog.init()
+        self.assertFalse(SyncLog._is_partitioned())
+    
+    def test_setup_partitioning(self):
+        SyncLog = self.env['cloudconnect.sync.log']
+        expired = self._create_log(90)
+        recent = self._create_log(0)
+        
+        SyncLog.setup_partitioning('monthly')
+        self.assertTrue(SyncLog._is_partitioned())
+        self.assertTrue(SyncLog._get_partitions())
+        self.assertEqual((expired | recent).exists(), expired | recent)
+        # A module update must neither fail nor recreate the table
+        SyncLog._auto_init()
+        SyncLog.init()
+        with self.assertRaises(UserError):
+            SyncLog.setup_partitioning('monthly')
+            
+        SyncLog._cron_cleanup_old_logs()
+        self.assertEqual((expired | recent).exists(), recent)
\ No newline at end of file
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests import tagged
+
+from .common import CloudConnectTestCase
+
+
+@tagged('post_install', '-at_install')
+class TestSyncLogRollup(CloudConnectTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.SyncLog = self.env['cloudconnect.sync.log']
+        self.Rollup = self.env['cloudconnect.sync.log.rollup']
+        self.now = fields.Datetime.now()
+    
+    def _create_logs(self, specs):
+        """Create logs from (minutes ago, model name, status, duration) tuples."""
+        return self.SyncLog.create([{
+            'operation_type': 'api_call',
+            'model_name': model_name,
+            'action': 'fetch',
+            'config_id': self.config.id,
+            'property_id': self.property.id,
+            'status': status,
+            'duration': duration,
+            'sync_date': self.now - timedelta(minutes=minutes),
+        } for minutes, model_name, status, duration in specs])
+    
+    def test_counts_match_raw_logs(self):
+        self._create_logs([
+            (5, 'res.partner', 'success', 1.0),
+            (20, 'res.partner', 'error', 2.0),
+            (70, 'res.partner', 'success', 0.5),
+            (95, 'sale.order', 'warning', 1.5),
+            (150, 'sale.order', 'success', 1.0),
+            (175, 'sale.order', 'error', 3.0),
+            (190, 'res.partner', 'success', 1.0),
+            (600, 'res.partner', 'success', 1.0),
+        ])
+        self.Rollup.refresh()
+        # Logs written after the refresh are only in the raw table
+        self._create_logs([(0, 'res.partner', 'pending', 0.0)])
+        
+        # Starts in the middle of an hour: that hour is read from the raw logs
+        since = self.now - timedelta(minutes=182)
+        counts = self.Rollup.read_counts(since, ['model_name', 'status'])
+        
+        raw = {
+            (model_name, status): (count, duration_sum)
+            for model_name, status, count, duration_sum in self.SyncLog._read_group(
+                [('sync_date', '>=', since)], ['model_name', 'status'], ['__count', 'duration:sum'],
+            )
+        }
+        self.assertEqual(
+            {key: (totals['count'], totals['duration_sum']) for key, totals in counts.items()},
+            raw,
+        )
+        self.assertEqual(counts[('sale.order', 'error')]['error_count'], 1)
+        self.assertEqual(counts[('res.partner', 'success')]['count'], 2)
+    
+    def test_purged_hours_are_not_rebuilt(self):
+        ICP = self.env['ir.config_parameter'].sudo()
+        ICP.set_param('cloudconnect.log_retention_days', '60')
+        logs = self._create_logs([
+            (40 * 24 * 60, 'res.partner', 'success', 1.0),
+            (40 * 24 * 60, 'res.partner', 'pending', 0.0),
+        ])
+        self.Rollup.refresh()
+        hour_rollup = self.Rollup.search([('model_name', '=', 'res.partner')])
+        self.assertEqual(sum(hour_rollup.mapped('log_count')), 2)
+        
+        # The cleanup keeps the pending log, which is then updated
+        ICP.set_param('cloudconnect.log_retention_days', '30')
+        logs.filtered(lambda log: log.status == 'success').unlink()
+        logs.exists().write({'status': 'warning'})
+        self.Rollup.refresh()
+        
+        hour_rollup = self.Rollup.search([('model_name', '=', 'res.partner')])
+        self.assertEqual(sum(hour_rollup.mapped('log_count')), 2)
\ No newline at end of file
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+from unittest.mock import patch
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from odoo.tests import tagged
+
+from odoo.addons.cloudconnect_core.models import cloudconnect_sync_log_spool
+from .common import CloudConnectTestCase
+
+
+@tagged('post_install', '-at_install')
+class TestSyncLogSpool(CloudConnectTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.Spool = self.env['cloudconnect.sync.log.spool']
+        self.spool_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.spool_dir)
+        patcher = patch.object(type(self.Spool), '_get_spool_dir', return_value=self.spool_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def _log_vals(self, cloudbeds_id):
+        return {
+            'operation_type': 'webhook',
+            'model_name': 'reservation',
+            'action': 'update',
+            'config_id': self.config.id,
+            'cloudbeds_id': cloudbeds_id,
+            'status': 'pending',
+        }
+    
+    def _read_spool(self):
+        entries = []
+        for name in sorted(os.listdir(self.spool_dir)):
+            with open(os.path.join(self.spool_dir, name), encoding='utf-8') as spool_file:
+                entries += [json.loads(line) for line in spool_file]
+        return entries
+    
+    def test_entry_is_not_a_fake_record(self):
+        entry = self.Spool._spooled_entry(self._log_vals('R1'))
+        self.assertEqual(entry.cloudbeds_id, 'R1')
+        self.assertFalse(entry.request_id)
+        with self.assertRaises(AttributeError):
+            entry.exists()
+        with self.assertRaises(AttributeError):
+            entry.sudo()
+        with self.assertRaises(AttributeError):
+            entry.not_a_field = True
+    
+    def test_final_state_is_spooled(self):
+        entry = self.Spool._spooled_entry(self._log_vals('R1'))
+        entry.mark_success({'processed': True}, 0.5, 200)
+        entry.mark_error("Failed after all")
+        self.assertEqual(self._read_spool(), [])
+        
+        self.Spool.finalize(entry)
+        self.Spool.finalize(entry)
+        entries = self._read_spool()
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]['status'], 'error')
+        self.assertEqual(entries[0]['error_message'], "Failed after all")
+        self.assertEqual(entries[0]['http_status'], 200)
+    
+    def test_batch_webhook_logs_are_spooled(self):
+        self.env['ir.config_parameter'].sudo().set_param('cloudconnect.log_spool_enabled', 'True')
+        breaker = cloudconnect_sync_log_spool._breaker_open_until
+        self.addCleanup(breaker.pop, self.env.cr.dbname, None)
+        breaker[self.env.cr.dbname] = time.monotonic() + 60
+        
+        entries = self.Spool.create_logs([self._log_vals('R1'), self._log_vals('R2')])
+        self.Spool.mark_batch(entries, [
+            {'id': False, 'status': 'success', 'response_data': {'processed': True}},
+            {'id': False, 'status': 'error', 'message': "Property mismatch"},
+        ])
+        self.assertEqual(
+            [(entry['cloudbeds_id'], entry['status']) for entry in self._read_spool()],
+            [('R1', 'success'), ('R2', 'error')],
+        )
+    
+    def test_copy_file_in_batches(self):
+        self.env['ir.config_parameter'].sudo().set_param('cloudconnect.log_spool_copy_batch_size', '2')
+        for cloudbeds_id in ('R1', 'R2', 'R3'):
+            entry = self.Spool._spooled_entry(self._log_vals(cloudbeds_id))
+            entry.mark_success(duration=0.1)
+            self.Spool.finalize(entry)
+        paths = [os.path.join(self.spool_dir, name) for name in sorted(os.listdir(self.spool_dir))]
+        with open(paths[-1], 'a', encoding='utf-8') as spool_file:
+            spool_file.write('{"torn": ')
+            
+        self.assertEqual(sum(self.Spool._copy_file(path) for path in paths), 3)
+        logs = self.env['cloudconnect.sync.log'].search([('cloudbeds_id', 'in', ['R1', 'R2', 'R3'])])
+        self.assertEqual(sorted(logs.mapped('cloudbeds_id')), ['R1', 'R2', 'R3'])
+        self.assertEqual(set(logs.mapped('status')), {'success'})
+    
+    def test_failed_file_does_not_block_loader(self):
+        def write_spool(name, entries, extra=b''):
+            with open(os.path.join(self.spool_dir, name), 'wb') as spool_file:
+                for vals in entries:
+                    entry = dict(vals, sync_date='2020-01-01 00:00:00', create_uid=self.env.uid)
+                    spool_file.write(json.dumps(entry).encode() + b'\n')
+                spool_file.write(extra)
+                
+        # Log of a deleted configuration: the foreign key rejects the whole file
+        write_spool('202001010000-host-1.jsonl', [dict(self._log_vals('F1'), config_id=999999999)])
+        write_spool('202001010001-host-1.jsonl', [self._log_vals('F2')], extra=b'\xff\xfe undecodable\n')
+        
+        self.assertEqual(self.Spool._cron_load_spool(), 1)
+        self.assertEqual(sorted(os.listdir(self.spool_dir)), ['202001010000-host-1.jsonl.failed'])
+        logs = self.env['cloudconnect.sync.log'].search([('cloudbeds_id', 'in', ['F1', 'F2'])])
+        self.assertEqual(logs.mapped('cloudbeds_id'), ['F2'])
\ No newline at end of file
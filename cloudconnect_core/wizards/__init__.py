@@ -1,3 +1,4 @@
 # -*- coding: utf-8 -*-
 
-from . import cloudconnect_setup_wizard
\ No newline at end of file
+from . import cloudconnect_setup_wizard
+from . import cloudconnect_sync_log_export_wizard
\ No newline at end of file
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError, ValidationError
+from odoo.tools import SQL
+from datetime import timedelta
+import logging
+
+_logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+class CloudConnectSyncLogExportWizard(models.TransientModel):
+    _name = 'cloudconnect.sync.log.export.wizard'
+    _description = 'CloudConnect Sync Log Export'
+    
+    date_from = fields.Datetime(
+        string='From',
+        required=True,
+        default=lambda self: fields.Datetime.now() - timedelta(days=30)
+    )
+    
+    date_to = fields.Datetime(
+        string='To',
+        required=True,
+        default=fields.Datetime.now
+    )
+    
+    property_ids = fields.Many2many(
+        'cloudconnect.property',
+        string='Properties',
+        help='Leave empty to export the logs of all properties'
+    )
+    
+    status = fields.Selection(
+        selection=lambda self: self.env['cloudconnect.sync.log']._fields['status'].selection,
+        string='Status',
+        help='Leave empty to export logs of any status'
+    )
+    
+    file_format = fields.Selection([
+        ('csv', 'CSV'),
+        ('parquet', 'Parquet'),
+        ('arrow', 'Arrow IPC Stream'),
+    ], string='Format', required=True, default='csv')
+    
+    include_payloads = fields.Boolean(
+        string='Include Request/Response Data',
+        help='Export the JSON request and response payloads (much larger files)'
+    )
+    
+    # Exported columns and their Arrow type; payload columns are optional
+    _EXPORT_COLUMNS = [
+        ('id', 'int64'),
+        ('sync_date', 'timestamp'),
+        ('operation_type', 'string'),
+        ('model_name', 'string'),
+        ('action', 'string'),
+        ('status', 'string'),
+        ('config_id', 'int64'),
+        ('property_id', 'int64'),
+        ('cloudbeds_id', 'string'),
+        ('odoo_id', 'int64'),
+        ('api_endpoint', 'string'),
+        ('http_method', 'string'),
+        ('http_status', 'int64'),
+        ('request_id', 'string'),
+        ('duration', 'float64'),
+        ('retry_count', 'int64'),
+        ('next_retry', 'timestamp'),
+        ('error_message', 'string'),
+        ('warning_message', 'string'),
+    ]
+    _PAYLOAD_COLUMNS = [
+        ('request_data', 'string'),
+        ('response_data', 'string'),
+    ]
+    
+    @api.constrains('date_from', 'date_to')
+    def _check_dates(self):
+        for wizard in self:
+            if wizard.date_from > wizard.date_to:
+                raise ValidationError(_("The start date must be before the end date."))
+    
+    def _get_columns(self):
+        """Return the (column, arrow type) pairs to export."""
+        self.ensure_one()
+        return self._EXPORT_COLUMNS + (self._PAYLOAD_COLUMNS if self.include_payloads else [])
+    
+    def _get_domain(self):
+        """Return the sync log domain matching the wizard filters."""
+        self.ensure_one()
+        domain = [
+            ('sync_date', '>=', self.date_from),
+            ('sync_date', '<=', self.date_to),
+        ]
+        if self.property_ids:
+            domain.append(('property_id', 'in', self.property_ids.ids))
+        if self.status:
+            domain.append(('status', '=', self.status))
+        return domain
+    
+    def _get_export_query(self):
+        """
+        Build the export query, with access rights and record rules applied.
+        
+        :return: SQL object selecting the exported columns ordered by date
+        """
+        self.ensure_one()
+        SyncLog = self.env['cloudconnect.sync.log']
+        SyncLog.check_access_rights('read')
+        SyncLog.flush_model()
+        
+        query = SyncLog._search(self._get_domain(), order='sync_date, id')
+        return query.select(*[
+            SQL.identifier(SyncLog._table, column) for column, _type in self._get_columns()
+        ])
+    
+    def _get_filename(self):
+        """Return the download file name."""
+        self.ensure_one()
+        extension = {'csv': 'csv', 'parquet': 'parquet', 'arrow': 'arrows'}[self.file_format]
+        return f"sync_logs_{self.date_from:%Y%m%d}_{self.date_to:%Y%m%d}.{extension}"
+    
+    def action_export(self):
+        """Download the export through the streaming endpoint."""
+        self.ensure_one()
+        if self.file_format != 'csv' and pyarrow is None:
+            raise UserError(_(
+                "Parquet and Arrow exports require the pyarrow Python package. "
+                "Please install it or export as CSV."
+            ))
+            
+        return {
+            'type': 'ir.actions.act_url',
+            'url': f'/cloudconnect/sync_log/export/{self.id}',
+            'target': 'self',
+        }
\ No newline at end of file
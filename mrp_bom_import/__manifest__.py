@@ -3,19 +3,24 @@
     'name': 'MRP BoM Import',
     'version': '17.0.1.0.0',
     'category': 'Manufacturing',
-    'summary': 'Import Bill of Materials from CSV files',
+    'summary': 'Import Bill of Materials from CSV and XLSX files',
     'description': """
         This module allows to import Bill of Materials (BoM) from CSV files.
         Features:
-        - Import BoMs with components from CSV
+        - Import BoMs with components from CSV (plain, gzip or zip) or XLSX
+        - Saved column mapping profiles
         - Validation of products and quantities
         - Error handling and reporting
+        - Background import jobs with progress tracking
     """,
     'author': 'Almus Dev (JDV-ALM)',
     'website': 'https://www.almus.dev',
     'depends': ['mrp'],
     'data': [
         'security/ir.model.access.csv',
+        'data/ir_cron_data.xml',
+        'views/mrp_bom_import_job_views.xml',
+        'views/mrp_bom_import_mapping_views.xml',
         'wizard/mrp_bom_import_wizard_view.xml',
         'data/server_action.xml',
         'data/menu_action.xml',
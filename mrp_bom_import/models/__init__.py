@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+
+from . import mrp_bom
+from . import mrp_bom_import_job
+from . import mrp_bom_import_job_bom
+from . import mrp_bom_import_mapping
\ No newline at end of file
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api
+
+
+class MrpBom(models.Model):
+    _inherit = 'mrp.bom'
+
+    import_hash = fields.Char(
+        string='Import Hash',
+        readonly=True,
+        copy=False,
+        help='Hash of the content of the last import of this BoM, used to skip unchanged BoMs on re-import'
+    )
+
+    # Campos cubiertos por el hash de importación
+    _IMPORT_HASH_FIELDS = {'product_tmpl_id', 'product_id', 'product_qty', 'product_uom_id', 'type', 'bom_line_ids'}
+
+    def write(self, vals):
+        # Un cambio hecho fuera de la importación invalida el hash
+        if 'import_hash' not in vals and self._IMPORT_HASH_FIELDS.intersection(vals):
+            vals = dict(vals, import_hash=False)
+        return super().write(vals)
+
+
+class MrpBomLine(models.Model):
+    _inherit = 'mrp.bom.line'
+
+    # Campos de línea cubiertos por el hash de importación de la BoM
+    _IMPORT_HASH_FIELDS = {'bom_id', 'product_id', 'product_qty', 'product_uom_id', 'operation_id'}
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super().create(vals_list)
+        lines._reset_import_hash()
+        return lines
+
+    def write(self, vals):
+        if not self._IMPORT_HASH_FIELDS.intersection(vals):
+            return super().write(vals)
+        # Antes y después, por si la línea cambia de BoM
+        self._reset_import_hash()
+        res = super().write(vals)
+        self._reset_import_hash()
+        return res
+
+    def unlink(self):
+        self._reset_import_hash()
+        return super().unlink()
+
+    def _reset_import_hash(self):
+        """Invalidate the import hash of the BoMs of these lines, unless the import itself edits them"""
+        if self.env.context.get('mrp_bom_import'):
+            return
+        boms = self.bom_id.filtered('import_hash')
+        if boms:
+            boms.write({'import_hash': False})
\ No newline at end of file
@@ -0,0 +1,1239 @@
+# -*- coding: utf-8 -*-
+
+import base64
+import csv
+import gzip
+import hashlib
+import io
+import itertools
+import json
+import logging
+import time
+import zipfile
+from datetime import date
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+from odoo.tools import float_round, split_every
+
+_logger = logging.getLogger(__name__)
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+BOM_TYPES = ('normal', 'phantom')
+
+
+def _parse_quantity(value):
+    """Return a quantity as float (1.0 when the column is missing), or None if invalid"""
+    try:
+        return float(1.0 if value is None else value)
+    except ValueError:
+        return None
+
+
+def validate_bom_rows(rows):
+    """Validate a chunk of CSV rows that starts on a BoM boundary
+
+    Pure function on plain data, kept apart from the ORM: errors are
+    returned as (row number, error key, value) and translated by the caller.
+
+    :param rows: List of (row number, row dict)
+    :return: Dictionary with errors, the codes of the BoMs with an invalid
+             row (rejected_codes), the product codes used, and the number
+             of rows and BoMs
+    """
+    result = {
+        'errors': [],
+        'rejected_codes': set(),
+        'product_codes': set(),
+        'rows': len(rows),
+        'boms': 0,
+    }
+    current_code = None
+    for row_number, row in rows:
+        bom_code = row.get('bom_code')
+        if not bom_code:
+            result['errors'].append((row_number, 'missing_code', None))
+            continue
+        
+        if row.get('product_code'):
+            current_code = bom_code
+            result['boms'] += 1
+            result['product_codes'].add(row['product_code'])
+            product_qty = _parse_quantity(row.get('product_qty'))
+            if product_qty is None or product_qty <= 0:
+                result['errors'].append((row_number, 'invalid_qty', row.get('product_qty')))
+                result['rejected_codes'].add(bom_code)
+            if row.get('type') and row['type'] not in BOM_TYPES:
+                result['errors'].append((row_number, 'unknown_type', row['type']))
+                result['rejected_codes'].add(bom_code)
+        
+        if row.get('component_code'):
+            # Una fila de componente pertenece a la BoM abierta con el mismo código
+            if bom_code != current_code:
+                result['errors'].append((row_number, 'orphan_component', bom_code))
+                continue
+            result['product_codes'].add(row['component_code'])
+            if _parse_quantity(row.get('component_qty')) is None:
+                result['errors'].append((row_number, 'invalid_qty', row.get('component_qty')))
+                result['rejected_codes'].add(bom_code)
+    return result
+
+
+class BomImportResolver:
+    """Resolve products, UoMs and operations of an import file with a few bulk queries
+
+    One resolver is built per chunk of BoMs; every row of the chunk is then
+    resolved from memory.
+    """
+
+    # Códigos por consulta IN
+    QUERY_CHUNK_SIZE = 10000
+
+    def __init__(self, env, product_codes, bom_codes=(), shared=None):
+        """
+        :param shared: Resolver of a previous chunk of the same import, whose
+                       UoMs and operations are reused instead of loaded again
+        """
+        self.env = env
+        self.products = self._load_products({code for code in product_codes if code})
+        if shared:
+            self.uoms, self.uom_aliases, self.operations = shared.uoms, shared.uom_aliases, shared.operations
+        else:
+            self._load_uoms()
+            self._load_operations()
+        self.existing_boms = self._load_existing_boms({code for code in bom_codes if code})
+
+    def product(self, product_code):
+        """Return the product of a code, barcode or external ID (empty recordset if unknown)"""
+        return self.products.get(product_code) or self.env['product.product']
+
+    def uom(self, uom_name, default_uom):
+        """Get UoM by name or return default"""
+        if not uom_name:
+            return default_uom
+        
+        if uom_name not in self.uoms:
+            alias = uom_name.casefold()
+            uom = self.uom_aliases.get(alias)
+            if not uom:
+                # Equivalente al ilike: primera UoM cuyo nombre contiene el texto
+                uom = next((
+                    candidate for candidate in self.uom_aliases.values()
+                    if alias in candidate.name.casefold()
+                ), None)
+            self.uoms[uom_name] = uom
+        return self.uoms[uom_name] or default_uom
+
+    def operation(self, operation_name):
+        """Return the template operation with this name (empty recordset if unknown)"""
+        return self.operations.get(operation_name) or self.env['mrp.routing.workcenter']
+
+    def _load_uoms(self):
+        """Index all UoMs by exact name and by case-folded name"""
+        self.uoms = {}
+        self.uom_aliases = {}
+        for uom in self.env['uom.uom'].search([]):
+            self.uoms.setdefault(uom.name, uom)
+            self.uom_aliases.setdefault(uom.name.casefold(), uom)
+
+    def _load_operations(self):
+        """Index the template operations (not linked to a BoM) by name"""
+        self.operations = {}
+        for operation in self.env['mrp.routing.workcenter'].search([('bom_id', '=', False)]):
+            self.operations.setdefault(operation.name, operation)
+
+    def _load_existing_boms(self, codes):
+        """Map the codes already used by a BoM to (BoM id, import hash)"""
+        existing_boms = {}
+        for chunk in split_every(self.QUERY_CHUNK_SIZE, codes, list):
+            for bom in self.env['mrp.bom'].search_fetch([('code', 'in', chunk)], ['code', 'import_hash']):
+                existing_boms.setdefault(bom.code, (bom.id, bom.import_hash))
+        return existing_boms
+
+    def _load_products(self, codes):
+        """Map codes to products: external ID first, then internal reference or barcode"""
+        products = {}
+        for chunk in split_every(self.QUERY_CHUNK_SIZE, codes, list):
+            # Mismo orden que la búsqueda individual: el primer producto encontrado gana
+            for product in self.env['product.product'].search([
+                '|',
+                ('default_code', 'in', chunk),
+                ('barcode', 'in', chunk)
+            ]):
+                if product.default_code in codes:
+                    products.setdefault(product.default_code, product)
+                if product.barcode in codes:
+                    products.setdefault(product.barcode, product)
+        
+        products.update(self._load_external_ids(codes))
+        return products
+
+    def _load_external_ids(self, codes):
+        """Resolve the codes that are external IDs (module.name) of products or templates"""
+        xmlids = [code for code in codes if '.' in code]
+        product_ids = {}
+        template_ids = {}
+        for chunk in split_every(self.QUERY_CHUNK_SIZE, xmlids, list):
+            modules, names = zip(*(code.split('.', 1) for code in chunk))
+            for data in self.env['ir.model.data'].sudo().search_read([
+                ('module', 'in', list(set(modules))),
+                ('name', 'in', list(set(names))),
+                ('model', 'in', ['product.product', 'product.template'])
+            ], ['module', 'name', 'model', 'res_id']):
+                code = '%s.%s' % (data['module'], data['name'])
+                if code not in codes:
+                    continue
+                if data['model'] == 'product.product':
+                    product_ids[code] = data['res_id']
+                else:
+                    template_ids[code] = data['res_id']
+        
+        products = {}
+        variants = self.env['product.product'].browse(set(product_ids.values())).exists()
+        by_id = {product.id: product for product in variants}
+        for code, res_id in product_ids.items():
+            if res_id in by_id:
+                products[code] = by_id[res_id]
+        
+        # Una plantilla se resuelve a su primera variante
+        templates = self.env['product.template'].browse(set(template_ids.values())).exists()
+        by_id = {template.id: template.product_variant_ids[:1] for template in templates}
+        for code, res_id in template_ids.items():
+            if by_id.get(res_id):
+                products[code] = by_id[res_id]
+        return products
+
+
+class MrpBomImportJob(models.Model):
+    _name = 'mrp.bom.import.job'
+    _description = 'BoM Import Job'
+    _order = 'id desc'
+
+    # BoMs creadas por llamada a create() y por commit
+    _CREATE_CHUNK_SIZE = 500
+    # Segundos de trabajo por ejecución del cron antes de volver a programarlo,
+    # si no se fija el parámetro mrp_bom_import.cron_time_budget
+    _CRON_TIME_BUDGET = 60
+    # Errores guardados en el trabajo (el resto solo se cuenta)
+    _MAX_ERRORS = 50
+    # Clave del advisory lock que impide procesar un trabajo dos veces a la vez
+    _LOCK_KEY = 7431
+    # Filas por bloque validado (la memoria usada no depende del tamaño del archivo)
+    _VALIDATION_CHUNK_ROWS = 20000
+    # BoMs detalladas en el informe de previsualización
+    _PREVIEW_MAX_LINES = 500
+
+    name = fields.Char(string='Name', required=True)
+    import_mode = fields.Selection([
+        ('create', 'Create Only'),
+        ('update', 'Create or Update'),
+    ], string='Import Mode', default='create', required=True,
+        help='Create or Update replaces the content of the BoMs whose code already exists')
+    file_data = fields.Binary(string='File', attachment=True)
+    file_name = fields.Char(string='File Name')
+    mapping_id = fields.Many2one('mrp.bom.import.mapping', string='Column Mapping', ondelete='set null')
+    delimiter = fields.Selection([
+        (',', 'Comma (,)'),
+        (';', 'Semicolon (;)'),
+        ('|', 'Pipe (|)'),
+        ('\t', 'Tab'),
+    ], string='Delimiter', default=',', required=True)
+    state = fields.Selection([
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('error', 'Error')
+    ], string='Status', default='queued', required=True, readonly=True)
+
+    # Progreso, guardado con cada commit
+    rows_parsed = fields.Integer(string='Rows Parsed', readonly=True)
+    total_boms = fields.Integer(string='BoMs in File', readonly=True)
+    boms_done = fields.Integer(string='Processed BoMs', readonly=True)
+    imported_count = fields.Integer(string='Imported BoMs', readonly=True)
+    updated_count = fields.Integer(string='Updated BoMs', readonly=True)
+    unchanged_count = fields.Integer(string='Unchanged BoMs', readonly=True)
+    max_depth = fields.Integer(
+        string='Explosion Depth',
+        readonly=True,
+        help='Number of BoM levels below the deepest BoM of the file, existing BoMs included'
+    )
+    error_count = fields.Integer(string='Errors', readonly=True)
+    progress = fields.Float(string='Progress', compute='_compute_progress')
+    result_message = fields.Text(string='Import Results', readonly=True)
+    error_message = fields.Text(string='Error Details', readonly=True)
+
+    @api.depends('total_boms', 'boms_done', 'state')
+    def _compute_progress(self):
+        for job in self:
+            if job.state in ('done', 'error'):
+                job.progress = 100.0
+            elif job.total_boms:
+                job.progress = 100.0 * job.boms_done / job.total_boms
+            else:
+                job.progress = 0.0
+
+    def _enqueue(self):
+        """Have the cron process the jobs right away"""
+        self.env.ref('mrp_bom_import.ir_cron_mrp_bom_import_jobs')._trigger()
+
+    @api.model
+    def _cron_process_jobs(self):
+        """Process queued jobs, and resume the ones interrupted by a restart"""
+        ICP = self.env['ir.config_parameter'].sudo()
+        time_budget = int(ICP.get_param('mrp_bom_import.cron_time_budget', self._CRON_TIME_BUDGET))
+        deadline = time.monotonic() + time_budget
+        for job in self.search([('state', 'in', ('queued', 'running'))], order='id'):
+            # Importar con los permisos de quien lanzó el trabajo
+            job.with_user(job.create_uid)._run(deadline)
+            if time.monotonic() > deadline:
+                self._enqueue()
+                break
+
+    def _run(self, deadline=None):
+        """Run or resume the import
+        
+        Progress is committed after every chunk, so an interrupted job resumes
+        after the last committed BoM. A session advisory lock, released when
+        the worker dies, keeps two workers from running the same job.
+        
+        :param deadline: time.monotonic() value after which the job pauses
+        :return: True when the job is finished
+        """
+        self.ensure_one()
+        cr = self.env.cr
+        cr.execute("SELECT pg_try_advisory_lock(%s, %s)", [self._LOCK_KEY, self.id])
+        if not cr.fetchone()[0]:
+            return False
+        
+        try:
+            finished = self._process(deadline)
+        except Exception as e:
+            if not self.env.registry.in_test_mode():
+                cr.rollback()
+            _logger.exception("BoM import job %s failed", self.id)
+            if isinstance(e, (UnicodeDecodeError, csv.Error, EOFError, OSError, zipfile.BadZipFile)):
+                message = _('Error reading file: %s') % str(e)
+            else:
+                message = str(e)
+            self._clear_staged_boms()
+            self.write({'state': 'error', 'result_message': message, 'file_data': False})
+            finished = True
+        finally:
+            cr.execute("SELECT pg_advisory_unlock(%s, %s)", [self._LOCK_KEY, self.id])
+        return finished
+
+    def _process(self, deadline):
+        """Import the file in committed chunks, resuming after the last committed chunk
+        
+        While the job is queued, the file is read, validated and staged a
+        chunk at a time, from the row after the last staged chunk; once it is
+        all staged, its BoMs are planned by level and a resumed run reads back
+        the staged BoMs not processed yet.
+        """
+        if self.state == 'queued' and not self._read_file(deadline):
+            return False
+        
+        # Crear las BoMs válidas nivel por nivel, componentes primero;
+        # los errores de lectura ya se registraron
+        if not self._create_boms(self._iter_staged_boms(), deadline):
+            return False
+        
+        self._finish()
+        return True
+
+    def _read_file(self, deadline=None):
+        """Stage the BoMs of the file, resuming after the rows already staged, and plan their levels
+        
+        :return: False when the deadline is reached before the end of the file
+        """
+        if not self.rows_parsed:
+            self._clear_staged_boms()
+        with self._open_file() as binary_file:
+            if not self._stage_file(binary_file, deadline, commit=True):
+                return False
+        
+        # La planificación necesita todo el archivo y se hace en una sola transacción
+        self._plan_staged_boms()
+        
+        # El estado running indica que las BoMs del archivo ya están guardadas
+        self.state = 'running'
+        self._commit_progress()
+        return True
+
+    def _commit_progress(self):
+        """Commit the job progress, so that it survives an interrupted run"""
+        if not self.env.registry.in_test_mode():
+            self.env.cr.commit()
+
+    def _finish(self):
+        """Write the import results and drop the stored file"""
+        if self.imported_count or self.updated_count or self.unchanged_count:
+            state = 'done'
+            result_message = _('Successfully imported %d Bill of Materials') % self.imported_count
+            if self.import_mode == 'update':
+                result_message += _(', updated %d, %d unchanged') % (self.updated_count, self.unchanged_count)
+        else:
+            state = 'error'
+            result_message = _('No Bill of Materials were imported')
+        
+        self._clear_staged_boms()
+        error_message = self.error_message
+        if self.error_count > self._MAX_ERRORS:
+            error_message += _('\n... and %d more errors') % (self.error_count - self._MAX_ERRORS)
+        
+        self.write({
+            'state': state,
+            'result_message': result_message,
+            'error_message': error_message,
+            'file_data': False,
+        })
+
+    def _record_progress(self, processed, imported, errors, updated=0, unchanged=0):
+        """Add the outcome of a chunk to the job counters"""
+        vals = {
+            'boms_done': self.boms_done + processed,
+            'imported_count': self.imported_count + imported,
+            'updated_count': self.updated_count + updated,
+            'unchanged_count': self.unchanged_count + unchanged,
+            'error_count': self.error_count + len(errors),
+        }
+        room = self._MAX_ERRORS - self.error_count
+        if errors and room > 0:
+            vals['error_message'] = '\n'.join(filter(None, [self.error_message] + errors[:room]))
+        self.write(vals)
+
+    def _open_file(self, record=None):
+        """Open the uploaded file as a binary stream, without loading it in memory
+        
+        :param record: Record whose file_data to open (the job by default)
+        """
+        record = record or self
+        attachment = self.env['ir.attachment'].sudo().search([
+            ('res_model', '=', record._name),
+            ('res_field', '=', 'file_data'),
+            ('res_id', '=', record.id)
+        ], limit=1)
+        if attachment.store_fname:
+            return open(attachment._full_path(attachment.store_fname), 'rb')
+        if attachment:
+            return io.BytesIO(attachment.raw)
+        return io.BytesIO(base64.b64decode(record.file_data))
+
+    @api.model
+    def _get_file_format(self, file_name):
+        """Return the format of a file from its name: csv, csv.gz, zip, xlsx or None"""
+        file_name = (file_name or '').lower()
+        for file_format in ('csv.gz', 'csv', 'zip', 'xlsx'):
+            if file_name.endswith('.' + file_format):
+                return file_format
+        return None
+
+    def _read_rows(self, binary_file):
+        """Decode the file incrementally and yield (row number, row dict)
+        
+        Compressed files are decompressed on the fly and XLSX files are read
+        in openpyxl read-only mode, so no format needs the whole file in
+        memory. File headers are renamed to import columns through the column
+        mapping, if any.
+        """
+        file_format = self._get_file_format(self.file_name) or 'csv'
+        if file_format == 'xlsx':
+            rows = self._read_xlsx(binary_file)
+        else:
+            if file_format == 'csv.gz':
+                binary_file = gzip.GzipFile(fileobj=binary_file)
+            elif file_format == 'zip':
+                binary_file = self._open_zip_member(binary_file)
+            csv_file = io.TextIOWrapper(binary_file, encoding='utf-8', newline='')
+            rows = csv.DictReader(csv_file, delimiter=self.delimiter)
+        
+        header_map = self.mapping_id._get_header_map() if self.mapping_id else None
+        if header_map and all(column == header for column, header in header_map.items()):
+            header_map = None
+        for row_number, row in enumerate(rows, start=2):
+            if header_map:
+                row = {column: row[header] for column, header in header_map.items() if header in row}
+            yield row_number, row
+
+    def _open_zip_member(self, binary_file):
+        """Open the first CSV file of a ZIP archive as a decompressing stream"""
+        archive = zipfile.ZipFile(binary_file)
+        names = [name for name in archive.namelist() if name.lower().endswith('.csv')]
+        if not names:
+            raise UserError(_('The ZIP archive does not contain any CSV file.'))
+        return archive.open(names[0])
+
+    def _read_xlsx(self, binary_file):
+        """Yield the rows of the first sheet of an XLSX file as dictionaries"""
+        if openpyxl is None:
+            raise UserError(_(
+                "XLSX imports require the openpyxl Python package. "
+                "Please install it or import a CSV file."
+            ))
+        
+        workbook = openpyxl.load_workbook(binary_file, read_only=True, data_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            header = [self._xlsx_cell_to_str(value).strip() for value in next(rows, ())]
+            for values in rows:
+                # Como el lector CSV, ignorar las filas vacías
+                if all(value is None for value in values):
+                    continue
+                yield dict(zip(header, (self._xlsx_cell_to_str(value) for value in values)))
+        finally:
+            workbook.close()
+
+    @api.model
+    def _xlsx_cell_to_str(self, value):
+        """Convert a cell value to the text a CSV export would contain"""
+        if value is None:
+            return ''
+        if isinstance(value, float) and value.is_integer():
+            # Códigos numéricos: 1001 y no 1001.0
+            return str(int(value))
+        if isinstance(value, date):
+            return value.isoformat()
+        return str(value)
+
+    def _split_rows(self, rows):
+        """Yield lists of about _VALIDATION_CHUNK_ROWS rows, cut on BoM boundaries
+        
+        :param rows: Iterable of (row number, row dict), as read by _read_rows()
+        """
+        chunk = []
+        for row_number, row in rows:
+            if len(chunk) >= self._VALIDATION_CHUNK_ROWS and row.get('bom_code') and row.get('product_code'):
+                yield chunk
+                chunk = []
+            chunk.append((row_number, row))
+        if chunk:
+            yield chunk
+
+    def _stage_file(self, binary_file, deadline=None, commit=False):
+        """Read the file a chunk of rows at a time, validating and staging each chunk
+        
+        Only one chunk of rows is in memory. Chunks are validated in this
+        process: parsing the rows costs about three times the validation
+        itself, so validating in worker processes would not pay for sending
+        them the parsed rows (see scripts/benchmark_bom_validation.py).
+        
+        The rows_parsed first rows, staged by a previous run, are skipped:
+        they are decoded again but neither validated nor staged.
+        
+        :param deadline: time.monotonic() value after which staging pauses
+        :param commit: Commit each staged chunk with the job counters
+        :return: False when the deadline is reached before the end of the file
+        """
+        resolver = None
+        rows = itertools.islice(self._read_rows(binary_file), self.rows_parsed, None)
+        for chunk in self._split_rows(rows):
+            resolver = self._stage_chunk(chunk, resolver)
+            if commit:
+                self._commit_progress()
+            if deadline and time.monotonic() > deadline:
+                return False
+        return True
+
+    def _stage_chunk(self, chunk, resolver=None):
+        """Validate a chunk of rows, stage its BoMs and record its errors and counters
+        
+        BoMs are staged with the ids of their product and components, from
+        which _plan_staged_boms() builds the dependency graph; BoMs with an
+        invalid row are flagged as rejected.
+        
+        :param resolver: Resolver of the previous chunk, to reuse its UoMs and operations
+        :return: Resolver of this chunk
+        """
+        result = validate_bom_rows(chunk)
+        resolver = BomImportResolver(self.env, result['product_codes'], shared=resolver)
+        vals_list = []
+        for bom_info in self._iter_boms(chunk, []):
+            bom_info['product_id'] = resolver.product(bom_info['product_code']).id or None
+            for component in bom_info['components']:
+                component['product_id'] = resolver.product(component['product_code']).id or None
+            vals_list.append({
+                'job_id': self.id,
+                'row_number': bom_info['row'],
+                'code': bom_info['code'],
+                'skip_reason': 'rejected' if bom_info['code'] in result['rejected_codes'] else False,
+                'data': bom_info,
+            })
+        Staged = self.env['mrp.bom.import.job.bom']
+        Staged.create(vals_list)
+        # Solo se leen por SQL: no guardarlas en la caché
+        Staged.invalidate_model()
+        
+        self.write({
+            'rows_parsed': self.rows_parsed + result['rows'],
+            'total_boms': self.total_boms + result['boms'],
+        })
+        self._record_progress(0, 0, self._format_validation_errors(result['errors']))
+        return resolver
+
+    def _format_validation_errors(self, errors):
+        """Translate the (row number, error key, value) tuples of the validation"""
+        messages = {
+            'missing_code': _('Row %d: BoM code is required'),
+            'invalid_qty': _('Row %d: Invalid quantity "%s"'),
+            'unknown_type': _('Row %d: Unknown BoM type "%s" (expected normal or phantom)'),
+            'orphan_component': _('Row %d: Component row of BoM %s does not follow the row defining that BoM'),
+        }
+        return [
+            messages[key] % (row_number,) if value is None else messages[key] % (row_number, value)
+            for row_number, key, value in errors
+        ]
+
+    def _preview(self, binary_file):
+        """Report what importing the file would do, without creating any BoM
+        
+        The file is staged and planned as for the import, then each staged
+        BoM is classified, in file order, as new, duplicate, invalid or with
+        missing products, UoMs or operations. The caller rolls back what the
+        staging writes.
+        
+        :return: Text report
+        """
+        self._stage_file(binary_file)
+        self._plan_staged_boms()
+        
+        counts = dict.fromkeys(['new', 'existing', 'duplicate', 'invalid', 'missing'], 0)
+        lines = []
+        resolver = None
+        for boms in self._iter_staged_boms(file_order=True):
+            resolver = self._chunk_resolver(boms, resolver)
+            for bom_info in boms:
+                status, detail = self._preview_status(bom_info, resolver)
+                counts[status] += 1
+                if status not in ('new', 'existing'):
+                    lines.append(_('Row %d, BoM %s: %s') % (bom_info['row'], bom_info['code'], detail))
+        
+        report = [
+            _('%d rows, %d BoMs') % (self.rows_parsed, self.total_boms),
+            _('Explosion depth: %d') % self.max_depth,
+            _('New: %d') % counts['new'],
+            _('Existing, to update: %d') % counts['existing'],
+            _('Duplicate code: %d') % counts['duplicate'],
+            _('Missing products, UoMs or operations: %d') % counts['missing'],
+            _('Invalid: %d') % counts['invalid'],
+        ]
+        if lines:
+            report += [''] + lines[:self._PREVIEW_MAX_LINES]
+            if len(lines) > self._PREVIEW_MAX_LINES:
+                report.append(_('... and %d more BoMs') % (len(lines) - self._PREVIEW_MAX_LINES))
+        if self.error_count:
+            report += ['', _('Errors:'), self.error_message]
+            if self.error_count > self._MAX_ERRORS:
+                report.append(_('... and %d more errors') % (self.error_count - self._MAX_ERRORS))
+        return '\n'.join(report)
+
+    def _preview_status(self, bom_info, resolver):
+        """Return the preview (status, detail) of a staged BoM"""
+        if bom_info['skip_reason'] == 'rejected':
+            return 'invalid', _('invalid rows, see errors below')
+        if bom_info['skip_reason'] == 'cycle':
+            return 'invalid', _('part of a cycle, see errors below')
+        if bom_info['skip_reason'] == 'duplicate':
+            return 'duplicate', _('duplicate code')
+        if bom_info['code'] in resolver.existing_boms:
+            if self.import_mode == 'update':
+                return 'existing', _('existing code, updated if its content changed')
+            return 'duplicate', _('duplicate code')
+        
+        components = bom_info['components']
+        missing = []
+        product_codes = {bom_info['product_code']} | {component['product_code'] for component in components}
+        products = sorted(code for code in product_codes if not resolver.product(code))
+        if products:
+            missing.append(_('products %s') % ', '.join(products))
+        uom_names = {bom_info['product_uom']} | {component['uom'] for component in components}
+        uoms = sorted(name for name in uom_names if name and not resolver.uom(name, None))
+        if uoms:
+            missing.append(_('UoMs %s') % ', '.join(uoms))
+        operation_names = {component['operation'] for component in components if component['operation']}
+        operations = sorted(name for name in operation_names if not resolver.operation(name))
+        if operations:
+            missing.append(_('operations %s') % ', '.join(operations))
+        if missing:
+            return 'missing', _('missing %s') % '; '.join(missing)
+        return 'new', ''
+
+    def _iter_staged_boms(self, file_order=False):
+        """Yield the staged BoMs in chunks, by increasing level and in file order within a level
+
+        Reads one chunk per query, so only a chunk of BoMs is in memory. Each
+        BoM comes with its level and skip reason.
+        
+        :param file_order: Yield the BoMs in file order instead
+        """
+        cr = self.env.cr
+        last_key = (-1, 0)
+        while True:
+            if file_order:
+                cr.execute("""
+                    SELECT level, row_number, skip_reason, data FROM mrp_bom_import_job_bom
+                     WHERE job_id = %s AND row_number > %s
+                  ORDER BY row_number
+                     LIMIT %s
+                """, [self.id, last_key[1], self._CREATE_CHUNK_SIZE])
+            else:
+                cr.execute("""
+                    SELECT level, row_number, skip_reason, data FROM mrp_bom_import_job_bom
+                     WHERE job_id = %s AND (level, row_number) > (%s, %s)
+                  ORDER BY level, row_number
+                     LIMIT %s
+                """, [self.id, *last_key, self._CREATE_CHUNK_SIZE])
+            rows = cr.fetchall()
+            if not rows:
+                return
+            yield [dict(data, level=level, skip_reason=skip_reason) for level, _row_number, skip_reason, data in rows]
+            last_key = rows[-1][:2]
+
+    def _clear_staged_boms(self):
+        """Delete all the staged BoMs of the job"""
+        self.env.cr.execute("DELETE FROM mrp_bom_import_job_bom WHERE job_id = %s", [self.id])
+
+    def _unstage_boms(self, last_key):
+        """Delete the staged BoMs processed so far, up to (level, row number) included"""
+        self.env.cr.execute(
+            "DELETE FROM mrp_bom_import_job_bom WHERE job_id = %s AND (level, row_number) <= (%s, %s)",
+            [self.id, *last_key]
+        )
+
+    def _plan_staged_boms(self):
+        """Order the staged BoMs by dependency and flag the ones not to create
+        
+        The level of a BoM is the explosion depth of its product: 1 when its
+        components have no BoM, one more than its deepest component otherwise.
+        Creating BoMs by increasing level creates components before the BoMs
+        using them. The dependency graph is built in SQL from the staged BoMs
+        and levels are assigned with set-based UPDATEs, so memory use does
+        not depend on the size of the file.
+        
+        BoMs whose product is in a cycle are flagged, with an error per cycle,
+        and so are the BoMs of a code with an invalid BoM and every BoM of a
+        code already staged before it in creation order.
+        """
+        self.env['mrp.bom.import.job.bom'].flush_model()
+        self._build_dependency_graph()
+        if self._assign_levels():
+            # Quedan productos sin nivel: en un ciclo o por encima de uno
+            self._mark_cycles()
+            self._assign_levels()
+
+        cr = self.env.cr
+        cr.execute("""
+            UPDATE mrp_bom_import_job_bom AS staged
+               SET level = COALESCE(node.level, 0),
+                   skip_reason = CASE WHEN node.cyclic THEN COALESCE(staged.skip_reason, 'cycle')
+                                      ELSE staged.skip_reason END
+              FROM mrp_bom_import_node AS node
+             WHERE staged.job_id = %s AND node.product_id = (staged.data->>'product_id')::integer
+        """, [self.id])
+        # Un código con una BoM inválida se rechaza entero
+        cr.execute("""
+            UPDATE mrp_bom_import_job_bom
+               SET skip_reason = 'rejected'
+             WHERE job_id = %(job_id)s AND skip_reason IS NULL AND code IN (
+                   SELECT code FROM mrp_bom_import_job_bom
+                    WHERE job_id = %(job_id)s AND skip_reason = 'rejected'
+             )
+        """, {'job_id': self.id})
+        # Solo la primera BoM de cada código, en orden de creación, se crea
+        cr.execute("""
+            UPDATE mrp_bom_import_job_bom AS staged
+               SET skip_reason = 'duplicate'
+              FROM (
+                    SELECT id, row_number() OVER (PARTITION BY code ORDER BY level, row_number) AS occurrence
+                      FROM mrp_bom_import_job_bom
+                     WHERE job_id = %s AND skip_reason IS NULL
+                   ) AS ranked
+             WHERE staged.id = ranked.id AND ranked.occurrence > 1
+        """, [self.id])
+        cr.execute("SELECT max(level) FROM mrp_bom_import_job_bom WHERE job_id = %s", [self.id])
+        self.max_depth = cr.fetchone()[0] or 0
+
+    def _build_dependency_graph(self):
+        """Build the product → components graph of the staged BoMs and of the existing BoMs
+        
+        The graph goes to two temporary tables dropped at the end of the
+        transaction: mrp_bom_import_node holds the products with their level,
+        mrp_bom_import_edge their components. Components without a BoM in
+        the file are exploded through their existing BoM (as the BoM cycle
+        check of mrp does), with one _bom_find() per chunk of products.
+        """
+        cr = self.env.cr
+        cr.execute("""
+            DROP TABLE IF EXISTS mrp_bom_import_node, mrp_bom_import_edge;
+            CREATE TEMPORARY TABLE mrp_bom_import_node (
+                product_id integer PRIMARY KEY,
+                has_bom boolean NOT NULL,
+                level integer,
+                cyclic boolean NOT NULL DEFAULT false
+            ) ON COMMIT DROP;
+            CREATE TEMPORARY TABLE mrp_bom_import_edge (
+                product_id integer NOT NULL,
+                component_id integer NOT NULL,
+                PRIMARY KEY (product_id, component_id)
+            ) ON COMMIT DROP;
+            INSERT INTO mrp_bom_import_node (product_id, has_bom)
+            SELECT DISTINCT (data->>'product_id')::integer, true
+              FROM mrp_bom_import_job_bom
+             WHERE job_id = %(job_id)s AND data->>'product_id' IS NOT NULL;
+            INSERT INTO mrp_bom_import_edge (product_id, component_id)
+            SELECT DISTINCT (staged.data->>'product_id')::integer, (component->>'product_id')::integer
+              FROM mrp_bom_import_job_bom AS staged,
+                   jsonb_array_elements(staged.data->'components') AS component
+             WHERE staged.job_id = %(job_id)s
+               AND staged.data->>'product_id' IS NOT NULL
+               AND component->>'product_id' IS NOT NULL;
+        """, {'job_id': self.id})
+        
+        while True:
+            # Componentes aún sin explorar
+            cr.execute("""
+                SELECT DISTINCT edge.component_id
+                  FROM mrp_bom_import_edge AS edge
+                 WHERE NOT EXISTS (
+                       SELECT 1 FROM mrp_bom_import_node AS node WHERE node.product_id = edge.component_id
+                 )
+                 LIMIT %s
+            """, [BomImportResolver.QUERY_CHUNK_SIZE])
+            products = self.env['product.product'].browse([product_id for product_id, in cr.fetchall()])
+            if not products:
+                break
+            boms = self.env['mrp.bom']._bom_find(products)
+            edges = [
+                (product.id, component_id)
+                for product in products if boms[product]
+                for component_id in boms[product].bom_line_ids.product_id.ids
+            ]
+            cr.execute("""
+                INSERT INTO mrp_bom_import_node (product_id, has_bom)
+                SELECT * FROM unnest(%s::integer[], %s::boolean[])
+            """, [products.ids, [bool(boms[product]) for product in products]])
+            if edges:
+                cr.execute("""
+                    INSERT INTO mrp_bom_import_edge (product_id, component_id)
+                    SELECT * FROM unnest(%s::integer[], %s::integer[])
+                        ON CONFLICT DO NOTHING
+                """, [[edge[0] for edge in edges], [edge[1] for edge in edges]])
+            self.env.invalidate_all()
+        cr.execute("ANALYZE mrp_bom_import_node, mrp_bom_import_edge")
+
+    def _assign_levels(self):
+        """Level the graph products whose components with a BoM all have a level, one level per UPDATE
+        
+        Products in a cycle, and the ones above, never get a level; once
+        flagged by _mark_cycles(), cyclic products are ignored as components.
+        
+        :return: Number of products with a BoM left without level
+        """
+        cr = self.env.cr
+        level = 1
+        while True:
+            cr.execute("""
+                UPDATE mrp_bom_import_node AS node
+                   SET level = %(level)s
+                 WHERE node.has_bom AND node.level IS NULL AND NOT node.cyclic
+                   AND NOT EXISTS (
+                       SELECT 1
+                         FROM mrp_bom_import_edge AS edge
+                         JOIN mrp_bom_import_node AS component ON component.product_id = edge.component_id
+                        WHERE edge.product_id = node.product_id
+                          AND component.has_bom AND NOT component.cyclic
+                          AND (component.level IS NULL OR component.level >= %(level)s)
+                   )
+            """, {'level': level})
+            cr.execute("""
+                SELECT max(level), count(*) FILTER (WHERE has_bom AND level IS NULL AND NOT cyclic)
+                  FROM mrp_bom_import_node
+            """)
+            max_level, pending = cr.fetchone()
+            # Ningún producto ha recibido este nivel: los pendientes dependen de un ciclo
+            if not pending or level > (max_level or 0):
+                return pending
+            level += 1
+
+    def _mark_cycles(self):
+        """Flag the graph products that are part of a cycle and record an error per cycle"""
+        cr = self.env.cr
+        cr.execute("""
+            WITH RECURSIVE reach (start_id, product_id) AS (
+                SELECT edge.product_id, edge.component_id
+                  FROM mrp_bom_import_edge AS edge
+                  JOIN mrp_bom_import_node AS node ON node.product_id = edge.product_id
+                 WHERE node.has_bom AND node.level IS NULL
+                 UNION
+                SELECT reach.start_id, edge.component_id
+                  FROM reach
+                  JOIN mrp_bom_import_edge AS edge ON edge.product_id = reach.product_id
+                  JOIN mrp_bom_import_node AS node ON node.product_id = edge.product_id
+                 WHERE node.has_bom AND node.level IS NULL
+            )
+            UPDATE mrp_bom_import_node
+               SET cyclic = true
+             WHERE product_id IN (SELECT reach.start_id FROM reach WHERE reach.start_id = reach.product_id)
+         RETURNING product_id
+        """)
+        cyclic_ids = [product_id for product_id, in cr.fetchall()]
+        
+        # Solo los productos de los ciclos pasan a memoria, para describir cada ciclo
+        cr.execute("""
+            SELECT product_id, component_id FROM mrp_bom_import_edge
+             WHERE product_id = ANY(%s) AND component_id = ANY(%s)
+        """, [cyclic_ids, cyclic_ids])
+        graph = {product_id: set() for product_id in cyclic_ids}
+        for product_id, component_id in cr.fetchall():
+            graph[product_id].add(component_id)
+        errors = []
+        for cycle in self._explosion_depths(graph)[1]:
+            names = self.env['product.product'].browse(cycle).mapped('display_name')
+            errors.append(_('Cycle between BoMs: %s') % ' → '.join(names + names[:1]))
+        self._record_progress(0, 0, errors)
+
+    def _explosion_depths(self, graph):
+        """Compute the explosion depth of each product and find the cycles
+        
+        Iterative depth-first search, linear in the size of the graph. Edges
+        closing a cycle are ignored for the depth.
+        
+        :return: (depth of each product having a BoM, list of cycles as lists
+                 of product ids)
+        """
+        depths = {}
+        cycles = []
+        for root in graph:
+            if root in depths:
+                continue
+            path = [root]
+            position = {root: 0}
+            children = [iter(graph[root])]
+            while path:
+                node = path[-1]
+                child = next(children[-1], None)
+                if child is None:
+                    depths[node] = 1 + max(
+                        (depths.get(component, 0) for component in graph[node] if component not in position),
+                        default=0,
+                    )
+                    path.pop()
+                    children.pop()
+                    del position[node]
+                elif child in position:
+                    cycles.append(path[position[child]:])
+                elif child in graph and child not in depths:
+                    position[child] = len(path)
+                    path.append(child)
+                    children.append(iter(graph[child]))
+        return depths, cycles
+
+    def _iter_boms(self, rows, errors):
+        """Parse the rows and yield each BoM as soon as its last row is read
+        
+        Only the BoM being read is kept in memory. Row errors are appended to
+        ``errors``.
+        
+        :param rows: Iterable of (row number, row dict), starting on a BoM boundary
+        """
+        current_bom = None
+        
+        for row_number, row in rows:
+            try:
+                # Validate required fields
+                if not row.get('bom_code'):
+                    errors.append(_('Row %d: BoM code is required') % row_number)
+                    continue
+                
+                # Si es una nueva BoM
+                if row.get('product_code'):
+                    # Emitir BoM anterior si existe
+                    if current_bom:
+                        yield current_bom
+                    # Una cabecera inválida no debe dejar abierta la BoM anterior
+                    current_bom = None
+                    
+                    # Iniciar nueva BoM
+                    current_bom = {
+                        'row': row_number,
+                        'code': row['bom_code'],
+                        'product_code': row['product_code'],
+                        'product_qty': _parse_quantity(row.get('product_qty')),
+                        'product_uom': row.get('product_uom', ''),
+                        'type': row.get('type', 'normal'),
+                        'components': []
+                    }
+                
+                # Agregar componente
+                if row.get('component_code'):
+                    if current_bom and current_bom['code'] == row['bom_code']:
+                        current_bom['components'].append({
+                            'product_code': row['component_code'],
+                            'qty': _parse_quantity(row.get('component_qty')),
+                            'uom': row.get('component_uom', ''),
+                            'operation': row.get('operation_name', '')
+                        })
+            
+            except Exception as e:
+                errors.append(_('Row %d: %s') % (row_number, str(e)))
+        
+        # Emitir última BoM
+        if current_bom:
+            yield current_bom
+
+    def _create_boms(self, chunks, deadline=None):
+        """Create (or update) the staged BoMs, committing progress after each chunk
+        
+        Processed BoMs are unstaged in the transaction of their chunk, so a
+        resumed job starts with the first BoM not committed yet.
+        
+        :param chunks: Chunks of staged BoMs, as yielded by _iter_staged_boms()
+        :return: False when the deadline is reached before the last BoM
+        """
+        resolver = None
+        for boms in chunks:
+            resolver = self._chunk_resolver(boms, resolver)
+            vals_list = []
+            updates = []
+            errors = []
+            unchanged = 0
+            for bom_info in boms:
+                # Los errores de las BoMs rechazadas ya se registraron
+                if bom_info['skip_reason'] in ('rejected', 'cycle'):
+                    continue
+                if bom_info['skip_reason'] == 'duplicate':
+                    errors.append(_('BoM with code %s already exists') % bom_info['code'])
+                    continue
+                
+                result = self._prepare_bom_vals(bom_info, resolver)
+                if not result.get('success'):
+                    errors.append(result['error'])
+                    continue
+                
+                vals = result['vals']
+                vals['import_hash'] = self._content_hash(vals)
+                existing = resolver.existing_boms.get(bom_info['code'])
+                if not existing:
+                    vals_list.append(vals)
+                elif existing[1] == vals['import_hash']:
+                    # Mismo contenido que la última importación
+                    unchanged += 1
+                else:
+                    updates.append((existing[0], vals))
+            
+            last_key = (boms[-1]['level'], boms[-1]['row'])
+            self._flush_bom_chunk(vals_list, errors, len(boms), updates, unchanged, last_key)
+            if deadline and time.monotonic() > deadline:
+                return False
+        return True
+
+    def _chunk_resolver(self, boms, shared=None):
+        """Build the resolver of a chunk of staged BoMs
+        
+        :param shared: Resolver of the previous chunk, whose UoMs and operations are reused
+        """
+        product_codes = set()
+        for bom_info in boms:
+            product_codes.add(bom_info['product_code'])
+            product_codes.update(component['product_code'] for component in bom_info['components'])
+        return BomImportResolver(self.env, product_codes, {bom_info['code'] for bom_info in boms}, shared)
+
+    def _flush_bom_chunk(self, vals_list, errors, processed, updates=(), unchanged=0, last_key=None):
+        """Create and update a chunk of BoMs and commit it with the job progress
+        
+        :param last_key: (level, row number) of the last staged BoM of the chunk
+        """
+        boms = self._create_bom_chunk(vals_list, errors) if vals_list else self.env['mrp.bom']
+        updated = self._update_bom_chunk(updates, errors) if updates else 0
+        self._record_progress(processed, len(boms), errors, updated, unchanged)
+        if last_key:
+            self._unstage_boms(last_key)
+        self._commit_progress()
+        self.env.invalidate_all()
+
+    def _update_bom_chunk(self, updates, errors):
+        """Apply the changes of a chunk of existing BoMs, each in its own savepoint
+        
+        :param updates: List of (BoM id, values built by _prepare_bom_vals)
+        :return: Number of updated BoMs
+        """
+        # Un solo browse para leer las líneas de todas las BoMs juntas
+        boms = self.env['mrp.bom'].with_context(mrp_bom_import=True).browse([bom_id for bom_id, vals in updates])
+        updated = 0
+        for bom, (bom_id, vals) in zip(boms, updates):
+            try:
+                with self.env.cr.savepoint():
+                    bom.write(self._prepare_bom_update(bom, vals))
+                updated += 1
+            except Exception as e:
+                errors.append(_('BoM %s: %s') % (vals['code'], str(e)))
+        return updated
+
+    def _prepare_bom_update(self, bom, vals):
+        """Return the write values turning an existing BoM into the imported one
+        
+        Header fields are written only when they differ, and lines are diffed
+        so that only the added, changed and removed lines get a command.
+        """
+        update = {
+            field: vals[field]
+            for field in ('product_tmpl_id', 'product_id', 'product_qty', 'product_uom_id', 'type')
+            if (bom[field].id if isinstance(bom[field], models.BaseModel) else bom[field]) != vals[field]
+        }
+        update['import_hash'] = vals['import_hash']
+        line_commands = self._diff_bom_lines(bom, [line_vals for _c, _i, line_vals in vals['bom_line_ids']])
+        if line_commands:
+            update['bom_line_ids'] = line_commands
+        return update
+
+    def _diff_bom_lines(self, bom, lines_vals):
+        """Return the minimal bom_line_ids commands turning the BoM lines into lines_vals
+        
+        Identical lines are kept as they are, lines of the same product are
+        updated in place, the others are created or deleted.
+        """
+        digits = self.env['decimal.precision'].precision_get('Product Unit of Measure')
+        
+        def line_key(product_id, qty, uom_id, operation_id):
+            return product_id, float_round(qty, precision_digits=digits), uom_id, operation_id
+        
+        existing = {}
+        for line in bom.bom_line_ids:
+            key = line_key(line.product_id.id, line.product_qty, line.product_uom_id.id, line.operation_id.id)
+            existing.setdefault(key, []).append(line)
+        
+        # Líneas idénticas: nada que hacer
+        changed = []
+        for line_vals in lines_vals:
+            same_lines = existing.get(line_key(
+                line_vals['product_id'], line_vals['product_qty'],
+                line_vals['product_uom_id'], line_vals.get('operation_id', False),
+            ))
+            if same_lines:
+                same_lines.pop(0)
+            else:
+                changed.append(line_vals)
+        
+        remaining = {}
+        for lines in existing.values():
+            for line in lines:
+                remaining.setdefault(line.product_id.id, []).append(line)
+        
+        commands = []
+        for line_vals in changed:
+            lines = remaining.get(line_vals['product_id'])
+            if lines:
+                commands.append((1, lines.pop(0).id, {
+                    'product_qty': line_vals['product_qty'],
+                    'product_uom_id': line_vals['product_uom_id'],
+                    'operation_id': line_vals.get('operation_id', False),
+                }))
+            else:
+                commands.append((0, 0, line_vals))
+        commands += [(2, line.id) for lines in remaining.values() for line in lines]
+        return commands
+
+    def _content_hash(self, vals):
+        """Hash the resolved content of a BoM, to skip it when re-imported unchanged"""
+        content = [
+            vals['product_id'],
+            vals['product_qty'],
+            vals['product_uom_id'],
+            vals['type'],
+            sorted(
+                [line['product_id'], line['product_qty'], line['product_uom_id'], line.get('operation_id', False)]
+                for _c, _i, line in vals['bom_line_ids']
+            ),
+        ]
+        return hashlib.sha1(json.dumps(content).encode()).hexdigest()
+
+    def _create_bom_chunk(self, vals_list, errors):
+        """Create a chunk of BoMs at once; on failure, retry one by one to isolate the error"""
+        # Las líneas creadas por la importación no invalidan el hash
+        Bom = self.env['mrp.bom'].with_context(mrp_bom_import=True)
+        try:
+            with self.env.cr.savepoint():
+                return Bom.create(vals_list)
+        except Exception:
+            pass
+        
+        boms = Bom
+        for vals in vals_list:
+            try:
+                with self.env.cr.savepoint():
+                    boms |= Bom.create(vals)
+            except Exception as e:
+                errors.append(_('BoM %s: %s') % (vals['code'], str(e)))
+        return boms
+
+    def _prepare_bom_vals(self, bom_info, resolver):
+        """Validate a BoM and build its create values"""
+        try:
+            # Buscar producto principal
+            product = resolver.product(bom_info['product_code'])
+            
+            if not product:
+                return {
+                    'success': False,
+                    'error': _('BoM %s: Product %s not found') % (bom_info['code'], bom_info['product_code'])
+                }
+            
+            # Obtener UoM
+            uom = resolver.uom(bom_info['product_uom'], product.uom_id)
+            
+            # Verificar si ya existe una BoM con este código
+            if bom_info['code'] in resolver.existing_boms and self.import_mode != 'update':
+                return {
+                    'success': False,
+                    'error': _('BoM with code %s already exists') % bom_info['code']
+                }
+            
+            # Crear BoM
+            bom_vals = {
+                'code': bom_info['code'],
+                'product_tmpl_id': product.product_tmpl_id.id,
+                'product_id': product.id,
+                'product_qty': bom_info['product_qty'],
+                'product_uom_id': uom.id,
+                'type': bom_info['type'] if bom_info['type'] in ['normal', 'phantom'] else 'normal',
+                'bom_line_ids': []
+            }
+            
+            # Procesar componentes
+            for comp in bom_info['components']:
+                comp_product = resolver.product(comp['product_code'])
+                
+                if not comp_product:
+                    return {
+                        'success': False,
+                        'error': _('BoM %s: Component %s not found') % (bom_info['code'], comp['product_code'])
+                    }
+                
+                comp_uom = resolver.uom(comp['uom'], comp_product.uom_id)
+                
+                line_vals = {
+                    'product_id': comp_product.id,
+                    'product_qty': comp['qty'],
+                    'product_uom_id': comp_uom.id,
+                }
+                
+                # Si hay operación especificada
+                if comp['operation']:
+                    operation = resolver.operation(comp['operation'])
+                    if operation:
+                        line_vals['operation_id'] = operation.id
+                
+                bom_vals['bom_line_ids'].append((0, 0, line_vals))
+            
+            return {
+                'success': True,
+                'vals': bom_vals
+            }
+        
+        except Exception as e:
+            return {
+                'success': False,
+                'error': _('BoM %s: %s') % (bom_info['code'], str(e))
+            }
\ No newline at end of file
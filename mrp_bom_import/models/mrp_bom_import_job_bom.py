@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields
+from odoo.tools.sql import create_index
+
+
+class MrpBomImportJobBom(models.Model):
+    _name = 'mrp.bom.import.job.bom'
+    _description = 'BoM Read from an Import File'
+    _order = 'level, row_number'
+    # Tabla de trabajo: se vacía al terminar la importación
+    _log_access = False
+
+    job_id = fields.Many2one('mrp.bom.import.job', string='Import Job', required=True, ondelete='cascade')
+    row_number = fields.Integer(string='Row', required=True, help='Row of the file defining the BoM')
+    level = fields.Integer(
+        string='Level',
+        default=0,
+        help='Explosion depth of the BoM, 0 when it has none (invalid BoM or unknown product)'
+    )
+    code = fields.Char(string='BoM Code')
+    skip_reason = fields.Selection([
+        ('rejected', 'Invalid'),
+        ('duplicate', 'Duplicate Code'),
+        ('cycle', 'Part of a Cycle'),
+    ], string='Skip Reason', help='Why the BoM is not created, if it is not')
+    data = fields.Json(string='Parsed BoM', help='BoM as read from the file')
+
+    def init(self):
+        """Index the BoMs of a job in creation order"""
+        super().init()
+        create_index(
+            self._cr,
+            'mrp_bom_import_job_bom_job_level_idx',
+            self._table,
+            ['job_id', 'level', 'row_number'],
+        )
\ No newline at end of file
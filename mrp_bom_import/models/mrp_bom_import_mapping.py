@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields
+
+
+class MrpBomImportMapping(models.Model):
+    _name = 'mrp.bom.import.mapping'
+    _description = 'BoM Import Column Mapping'
+    _order = 'name'
+
+    # Columnas del formato de importación
+    _COLUMNS = [
+        'bom_code', 'product_code', 'product_qty', 'product_uom', 'type',
+        'component_code', 'component_qty', 'component_uom', 'operation_name',
+    ]
+
+    name = fields.Char(string='Name', required=True)
+    active = fields.Boolean(default=True)
+    bom_code_column = fields.Char(string='BoM Code', default='bom_code')
+    product_code_column = fields.Char(string='Product Code', default='product_code')
+    product_qty_column = fields.Char(string='Product Quantity', default='product_qty')
+    product_uom_column = fields.Char(string='Product UoM', default='product_uom')
+    type_column = fields.Char(string='BoM Type', default='type')
+    component_code_column = fields.Char(string='Component Code', default='component_code')
+    component_qty_column = fields.Char(string='Component Quantity', default='component_qty')
+    component_uom_column = fields.Char(string='Component UoM', default='component_uom')
+    operation_name_column = fields.Char(string='Operation', default='operation_name')
+
+    def _get_header_map(self):
+        """Return the file header of each import column"""
+        self.ensure_one()
+        return {
+            column: (self['%s_column' % column] or '').strip() or column
+            for column in self._COLUMNS
+        }
\ No newline at end of file
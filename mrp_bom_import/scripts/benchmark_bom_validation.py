@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark the validation of a large BoM import file.
+
+Generates a CSV file of BOMS BoMs with COMPONENTS components each, then
+times reading the rows, validating them in this process, pickling the
+chunks (what sending them to worker processes costs) and validating them
+in a pool of worker processes. Nothing is written to the database.
+
+Run it from an Odoo shell with the module installed:
+
+    odoo-bin shell -d <database> < mrp_bom_import/scripts/benchmark_bom_validation.py
+
+Set MRP_BENCH_BOMS, MRP_BENCH_COMPONENTS and MRP_BENCH_WORKERS to change
+the size of the file and of the pool.
+"""
+
+import io
+import multiprocessing
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from odoo.addons.mrp_bom_import.models.mrp_bom_import_job import validate_bom_rows
+
+BOMS = int(os.environ.get('MRP_BENCH_BOMS', '30000'))
+COMPONENTS = int(os.environ.get('MRP_BENCH_COMPONENTS', '9'))
+WORKERS = int(os.environ.get('MRP_BENCH_WORKERS', '4'))
+REPEAT = 3
+
+
+def build_file():
+    """Return the CSV content, one header row and COMPONENTS component rows per BoM."""
+    lines = ['bom_code,product_code,product_qty,product_uom,type,component_code,component_qty,component_uom,operation_name']
+    for bom in range(BOMS):
+        lines.append(f'BOM{bom},PROD{bom},1,Units,normal,,,,')
+        for component in range(COMPONENTS):
+            lines.append(f'BOM{bom},,,,,COMP{component},2,Units,')
+    return '\n'.join(lines).encode('utf-8')
+
+
+def best_of(function):
+    """Run function REPEAT times and return the fastest wall time."""
+    timings = []
+    for _i in range(REPEAT):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def validate_in_process(job, data):
+    """Read the rows and validate each chunk in this process, as the import does."""
+    return [validate_bom_rows(chunk) for chunk in job._split_rows(job._read_rows(io.BytesIO(data)))]
+
+
+def validate_in_pool(job, data):
+    """Read the rows here and validate each chunk in a worker process."""
+    with ProcessPoolExecutor(WORKERS, mp_context=multiprocessing.get_context('fork')) as executor:
+        return list(executor.map(validate_bom_rows, job._split_rows(job._read_rows(io.BytesIO(data)))))
+
+
+def run(env):
+    data = build_file()
+    job = env['mrp.bom.import.job'].new({'name': 'Benchmark', 'file_name': 'benchmark.csv', 'delimiter': ','})
+    chunks = list(job._split_rows(job._read_rows(io.BytesIO(data))))
+    rows = sum(len(chunk) for chunk in chunks)
+    print(f"{rows} rows, {BOMS} BoMs, {len(data) / 1e6:.1f} MB, {os.cpu_count()} CPUs")
+
+    timings = [
+        ('read rows', best_of(lambda: sum(1 for _row in job._read_rows(io.BytesIO(data))))),
+        ('read rows + validate in process', best_of(lambda: validate_in_process(job, data))),
+        ('validate parsed rows only', best_of(lambda: [validate_bom_rows(chunk) for chunk in chunks])),
+        ('pickle parsed rows only', best_of(lambda: [pickle.dumps(chunk) for chunk in chunks])),
+        (f'read rows + validate in {WORKERS} workers', best_of(lambda: validate_in_pool(job, data))),
+    ]
+    for name, seconds in timings:
+        print(f"{name:<40} {seconds:6.2f}s")
+
+
+run(env)  # noqa: F821 - provided by odoo-bin shell
\ No newline at end of file
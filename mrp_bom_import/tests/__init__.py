@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+
+from . import test_bom_import_levels
+from . import test_bom_import_resume
+from . import test_bom_import_update
+from . import test_bom_import_formats
\ No newline at end of file
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+import base64
+
+from odoo.tests.common import TransactionCase
+
+HEADER = 'bom_code,product_code,product_qty,product_uom,type,component_code,component_qty,component_uom,operation_name'
+
+
+class BomImportTestCase(TransactionCase):
+    """Base test case with a product, a subassembly and two components"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.product, cls.subassembly, cls.component_a, cls.component_b = cls.env['product.product'].create([
+            {'name': 'Test %s' % code, 'default_code': code, 'type': 'consu'}
+            for code in ('PROD', 'SUB', 'COMPA', 'COMPB')
+        ])
+
+    @classmethod
+    def _csv(cls, *lines):
+        """Build a CSV file in the import format from its data lines"""
+        return '\n'.join((HEADER,) + lines).encode('utf-8')
+
+    def _create_job(self, content, file_name='boms.csv', **vals):
+        """Create an import job for a file content (bytes)"""
+        return self.env['mrp.bom.import.job'].create(dict({
+            'name': file_name,
+            'file_name': file_name,
+            'delimiter': ',',
+            'file_data': base64.b64encode(content),
+        }, **vals))
+
+    def _import(self, content, file_name='boms.csv', **vals):
+        """Run an import job to the end and return it"""
+        job = self._create_job(content, file_name, **vals)
+        self.assertTrue(job._run())
+        return job
+
+    def _find_bom(self, code):
+        """Return the BoMs with a code"""
+        return self.env['mrp.bom'].search([('code', '=', code)])
\ No newline at end of file
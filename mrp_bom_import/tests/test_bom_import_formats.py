@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+import gzip
+import io
+import zipfile
+
+from odoo.tests import tagged
+
+from .common import BomImportTestCase
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+LINES = (
+    'B-PROD,PROD,2,,phantom,,,,',
+    'B-PROD,,,,,COMPA,1.5,,',
+    'B-PROD,,,,,COMPB,4,,',
+)
+
+
+@tagged('post_install', '-at_install')
+class TestBomImportFormats(BomImportTestCase):
+
+    def _assert_imported(self, job):
+        self.assertEqual((job.state, job.rows_parsed, job.imported_count), ('done', 3, 1))
+        bom = self._find_bom('B-PROD')
+        self.assertEqual((bom.product_id, bom.product_qty, bom.type), (self.product, 2, 'phantom'))
+        self.assertEqual(
+            sorted((line.product_id.default_code, line.product_qty) for line in bom.bom_line_ids),
+            [('COMPA', 1.5), ('COMPB', 4)],
+        )
+
+    def test_csv_gz(self):
+        self._assert_imported(self._import(gzip.compress(self._csv(*LINES)), 'boms.csv.gz'))
+
+    def test_zip(self):
+        content = io.BytesIO()
+        with zipfile.ZipFile(content, 'w') as archive:
+            archive.writestr('boms.csv', self._csv(*LINES))
+        self._assert_imported(self._import(content.getvalue(), 'boms.zip'))
+
+    def test_xlsx(self):
+        if openpyxl is None:
+            self.skipTest("openpyxl is not installed")
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        for line in self._csv(*LINES).decode().split('\n'):
+            # Cantidades como números, como las guarda una hoja de cálculo
+            sheet.append([
+                float(value) if value.replace('.', '', 1).isdigit() else value or None
+                for value in line.split(',')
+            ])
+        content = io.BytesIO()
+        workbook.save(content)
+        self._assert_imported(self._import(content.getvalue(), 'boms.xlsx'))
\ No newline at end of file
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import tagged
+
+from .common import BomImportTestCase
+
+
+@tagged('post_install', '-at_install')
+class TestBomImportLevels(BomImportTestCase):
+
+    def test_components_first(self):
+        # La BoM del subconjunto va después de la que lo usa en el archivo
+        job = self._import(self._csv(
+            'B-PROD,PROD,1,,normal,,,,',
+            'B-PROD,,,,,SUB,2,,',
+            'B-SUB,SUB,1,,normal,,,,',
+            'B-SUB,,,,,COMPA,3,,',
+        ))
+        self.assertEqual(job.state, 'done')
+        self.assertEqual((job.total_boms, job.imported_count, job.max_depth), (2, 2, 2))
+        parent, subassembly = self._find_bom('B-PROD'), self._find_bom('B-SUB')
+        self.assertLess(subassembly.id, parent.id)
+        self.assertEqual(parent.bom_line_ids.product_id, self.subassembly)
+        self.assertFalse(self.env['mrp.bom.import.job.bom'].search([('job_id', '=', job.id)]))
+
+    def test_cycle_rejected(self):
+        job = self._import(self._csv(
+            'B-A,COMPA,1,,normal,,,,',
+            'B-A,,,,,COMPB,1,,',
+            'B-B,COMPB,1,,normal,,,,',
+            'B-B,,,,,COMPA,1,,',
+            'B-PROD,PROD,1,,normal,,,,',
+            'B-PROD,,,,,COMPA,1,,',
+        ))
+        self.assertEqual(job.state, 'done')
+        self.assertEqual(job.imported_count, 1)
+        self.assertTrue(self._find_bom('B-PROD'))
+        self.assertFalse(self._find_bom('B-A') | self._find_bom('B-B'))
+        self.assertIn('Cycle between BoMs', job.error_message)
+
+    def test_invalid_header_not_merged(self):
+        # Una cabecera con cantidad inválida no añade sus componentes a la BoM anterior
+        job = self._import(self._csv(
+            'B-SUB,SUB,1,,normal,,,,',
+            'B-SUB,,,,,COMPA,1,,',
+            'B-PROD,PROD,abc,,normal,,,,',
+            'B-PROD,,,,,COMPB,1,,',
+        ))
+        self.assertEqual(job.imported_count, 1)
+        self.assertEqual(self._find_bom('B-SUB').bom_line_ids.product_id, self.component_a)
+        self.assertFalse(self._find_bom('B-PROD'))
+        self.assertIn('Invalid quantity "abc"', job.error_message)
+        self.assertNotIn('already exists', job.error_message)
+
+    def test_existing_bom_depth(self):
+        # Una BoM existente de un componente cuenta en la profundidad
+        self.env['mrp.bom'].create({
+            'product_tmpl_id': self.subassembly.product_tmpl_id.id,
+            'product_id': self.subassembly.id,
+            'bom_line_ids': [(0, 0, {'product_id': self.component_a.id, 'product_qty': 1})],
+        })
+        job = self._import(self._csv(
+            'B-PROD,PROD,1,,normal,,,,',
+            'B-PROD,,,,,SUB,2,,',
+        ))
+        self.assertEqual((job.imported_count, job.max_depth), (1, 2))
\ No newline at end of file
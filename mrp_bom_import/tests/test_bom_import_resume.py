@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+import time
+from unittest.mock import patch
+
+from odoo.tests import tagged
+
+from .common import BomImportTestCase
+
+
+@tagged('post_install', '-at_install')
+class TestBomImportResume(BomImportTestCase):
+
+    def test_resume_without_reading_file(self):
+        Job = type(self.env['mrp.bom.import.job'])
+        job = self._create_job(self._csv(
+            'B-SUB,SUB,1,,normal,,,,',
+            'B-SUB,,,,,COMPA,1,,',
+            'B-PROD,PROD,1,,normal,,,,',
+            'B-PROD,,,,,SUB,1,,',
+            'B-PROD,,,,,COMPB,1,,',
+        ))
+        
+        # Una BoM por bloque y el plazo ya vencido: la ejecución para tras el primer bloque
+        with patch.object(Job, '_CREATE_CHUNK_SIZE', 1):
+            self.assertFalse(job._run(deadline=time.monotonic() - 1))
+        self.assertEqual((job.state, job.boms_done, job.imported_count), ('running', 1, 1))
+        staged = self.env['mrp.bom.import.job.bom'].search([('job_id', '=', job.id)])
+        self.assertEqual(staged.mapped('code'), ['B-PROD'])
+        
+        # La reanudación parte de las BoMs guardadas, sin volver a leer el archivo
+        with patch.object(Job, '_open_file', side_effect=AssertionError("File read again")):
+            self.assertTrue(job._run())
+        self.assertEqual((job.state, job.boms_done, job.imported_count), ('done', 2, 2))
+        self.assertEqual(
+            self._find_bom('B-PROD').bom_line_ids.product_id,
+            self.subassembly | self.component_b,
+        )
+
+    def test_resume_staging(self):
+        Job = type(self.env['mrp.bom.import.job'])
+        job = self._create_job(self._csv(
+            'B-SUB,SUB,1,,normal,,,,',
+            'B-SUB,,,,,COMPA,1,,',
+            'B-PROD,PROD,abc,,normal,,,,',
+            'B-PROD,,,,,SUB,1,,',
+            'B-PROD2,PROD,1,,normal,,,,',
+            'B-PROD2,,,,,SUB,1,,',
+        ))
+        
+        # Dos filas por bloque y el plazo ya vencido: la lectura para tras el primer bloque
+        with patch.object(Job, '_VALIDATION_CHUNK_ROWS', 2):
+            self.assertFalse(job._run(deadline=time.monotonic() - 1))
+            self.assertEqual((job.state, job.rows_parsed, job.total_boms, job.error_count), ('queued', 2, 1, 0))
+            staged = self.env['mrp.bom.import.job.bom'].search([('job_id', '=', job.id)])
+            self.assertEqual(staged.mapped('code'), ['B-SUB'])
+            
+            # La reanudación sigue en la fila siguiente al último bloque guardado
+            self.assertTrue(job._run())
+        self.assertEqual((job.state, job.rows_parsed, job.total_boms), ('done', 6, 3))
+        self.assertEqual((job.imported_count, job.error_count), (2, 1))
+        self.assertEqual(job.max_depth, 2)
+        self.assertEqual(self._find_bom('B-PROD2').bom_line_ids.product_id, self.subassembly)
\ No newline at end of file
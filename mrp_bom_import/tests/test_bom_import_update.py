@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import tagged
+
+from .common import BomImportTestCase
+
+
+@tagged('post_install', '-at_install')
+class TestBomImportUpdate(BomImportTestCase):
+
+    def test_update_diffs_lines(self):
+        self._import(self._csv(
+            'B-PROD,PROD,1,,normal,,,,',
+            'B-PROD,,,,,COMPA,2,,',
+            'B-PROD,,,,,COMPB,1,,',
+        ))
+        bom = self._find_bom('B-PROD')
+        line_a = bom.bom_line_ids.filtered(lambda line: line.product_id == self.component_a)
+        
+        # Mismo contenido: la BoM no se toca
+        job = self._import(self._csv(
+            'B-PROD,PROD,1,,normal,,,,',
+            'B-PROD,,,,,COMPB,1,,',
+            'B-PROD,,,,,COMPA,2,,',
+        ), import_mode='update')
+        self.assertEqual((job.state, job.updated_count, job.unchanged_count), ('done', 0, 1))
+        
+        # La línea de COMPA se modifica en su sitio, la de COMPB se borra y la de SUB se crea
+        job = self._import(self._csv(
+            'B-PROD,PROD,1,,normal,,,,',
+            'B-PROD,,,,,COMPA,3,,',
+            'B-PROD,,,,,SUB,1,,',
+        ), import_mode='update')
+        self.assertEqual((job.state, job.imported_count, job.updated_count), ('done', 0, 1))
+        self.assertEqual(self._find_bom('B-PROD'), bom)
+        self.assertEqual(bom.bom_line_ids.product_id, self.component_a | self.subassembly)
+        self.assertIn(line_a, bom.bom_line_ids)
+        self.assertEqual(line_a.product_qty, 3)
+
+    def test_create_mode_keeps_existing(self):
+        self._import(self._csv('B-PROD,PROD,1,,normal,,,,', 'B-PROD,,,,,COMPA,2,,'))
+        job = self._import(self._csv('B-PROD,PROD,1,,normal,,,,', 'B-PROD,,,,,COMPA,5,,'))
+        self.assertEqual(job.state, 'error')
+        self.assertIn('BoM with code B-PROD already exists', job.error_message)
+        self.assertEqual(self._find_bom('B-PROD').bom_line_ids.product_qty, 2)
+
+    def test_line_edit_resets_hash(self):
+        content = self._csv('B-PROD,PROD,1,,normal,,,,', 'B-PROD,,,,,COMPA,2,,')
+        self._import(content)
+        bom = self._find_bom('B-PROD')
+        self.assertTrue(bom.import_hash)
+        
+        # Un cambio hecho directamente en una línea invalida el hash
+        bom.bom_line_ids.write({'product_qty': 7})
+        self.assertFalse(bom.import_hash)
+        
+        job = self._import(content, import_mode='update')
+        self.assertEqual((job.updated_count, job.unchanged_count), (1, 0))
+        self.assertEqual(bom.bom_line_ids.product_qty, 2)
+        self.assertTrue(bom.import_hash)
+        
+        # Igual al añadir una línea
+        self.env['mrp.bom.line'].create({'bom_id': bom.id, 'product_id': self.component_b.id, 'product_qty': 1})
+        self.assertFalse(bom.import_hash)
\ No newline at end of file
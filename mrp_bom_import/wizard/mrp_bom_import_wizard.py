@@ -2,7 +2,7 @@
 
 import base64
 import csv
-import io
+import zipfile
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError, ValidationError
 
@@ -12,118 +12,136 @@ class MrpBomImportWizard(models.TransientModel):
     _description = 'Import Bill of Materials Wizard'
 
     file_data = fields.Binary(
-        string='CSV File',
+        string='File',
         required=True,
-        help='Select CSV file to import Bill of Materials'
+        help='Select a CSV file (optionally compressed as .csv.gz or .zip) or an XLSX file to import Bill of Materials'
     )
     file_name = fields.Char(string='File Name')
+    mapping_id = fields.Many2one(
+        'mrp.bom.import.mapping',
+        string='Column Mapping',
+        help='Saved profile giving the file header of each column, for files whose headers differ from the template'
+    )
     delimiter = fields.Selection([
         (',', 'Comma (,)'),
         (';', 'Semicolon (;)'),
         ('|', 'Pipe (|)'),
         ('\t', 'Tab'),
     ], string='Delimiter', default=',', required=True)
+    import_mode = fields.Selection([
+        ('create', 'Create Only'),
+        ('update', 'Create or Update'),
+    ], string='Import Mode', default='create', required=True,
+        help='Create or Update replaces the content of the BoMs whose code already exists; '
+             'BoMs whose content did not change since their last import are skipped')
     
     # Campos para mostrar resultados
     state = fields.Selection([
         ('draft', 'Draft'),
+        ('preview', 'Preview'),
+        ('queued', 'In Progress'),
         ('done', 'Done'),
         ('error', 'Error')
     ], default='draft')
+    job_id = fields.Many2one('mrp.bom.import.job', string='Import Job', readonly=True)
+    job_state = fields.Selection(related='job_id.state', string='Job Status')
+    rows_parsed = fields.Integer(related='job_id.rows_parsed')
+    total_boms = fields.Integer(related='job_id.total_boms')
+    boms_done = fields.Integer(related='job_id.boms_done')
+    error_count = fields.Integer(related='job_id.error_count')
+    progress = fields.Float(related='job_id.progress')
     result_message = fields.Text(string='Import Results', readonly=True)
     error_message = fields.Text(string='Errors', readonly=True)
     imported_count = fields.Integer(string='Imported BoMs', readonly=True)
+    preview_message = fields.Text(string='Preview', readonly=True)
 
     @api.constrains('file_name')
     def _check_file_name(self):
         for record in self:
-            if record.file_name and not record.file_name.lower().endswith('.csv'):
-                raise ValidationError(_('Please upload only CSV files.'))
+            if record.file_name and not self.env['mrp.bom.import.job']._get_file_format(record.file_name):
+                raise ValidationError(_('Please upload a CSV, CSV.GZ, ZIP or XLSX file.'))
 
     def action_import(self):
-        """Main method to import BoMs from CSV file"""
+        """Queue the import of the file in a background job"""
         self.ensure_one()
         
-        if not self.file_data:
-            raise UserError(_('Please select a CSV file to import.'))
-        
-        # Decode file
-        try:
-            csv_data = base64.b64decode(self.file_data)
-            csv_file = io.StringIO(csv_data.decode('utf-8'))
-            csv_reader = csv.DictReader(csv_file, delimiter=self.delimiter)
-        except Exception as e:
-            raise UserError(_('Error reading CSV file: %s') % str(e))
-        
-        # Process CSV
-        imported_boms = []
-        errors = []
-        bom_data = {}
-        current_bom_code = None
+        if not self.with_context(bin_size=True).file_data:
+            raise UserError(_('Please select a file to import.'))
         
-        for row_number, row in enumerate(csv_reader, start=2):
-            try:
-                # Validate required fields
-                if not row.get('bom_code'):
-                    errors.append(_('Row %d: BoM code is required') % row_number)
-                    continue
-                
-                # Si es una nueva BoM
-                if row.get('product_code'):
-                    # Procesar BoM anterior si existe
-                    if current_bom_code and current_bom_code in bom_data:
-                        result = self._create_bom(bom_data[current_bom_code])
-                        if result.get('success'):
-                            imported_boms.append(result['bom'])
-                        else:
-                            errors.append(result['error'])
-                    
-                    # Iniciar nueva BoM
-                    current_bom_code = row['bom_code']
-                    bom_data[current_bom_code] = {
-                        'code': current_bom_code,
-                        'product_code': row['product_code'],
-                        'product_qty': float(row.get('product_qty', 1.0)),
-                        'product_uom': row.get('product_uom', ''),
-                        'type': row.get('type', 'normal'),
-                        'components': []
-                    }
-                
-                # Agregar componente
-                if row.get('component_code'):
-                    if current_bom_code and current_bom_code in bom_data:
-                        bom_data[current_bom_code]['components'].append({
-                            'product_code': row['component_code'],
-                            'qty': float(row.get('component_qty', 1.0)),
-                            'uom': row.get('component_uom', ''),
-                            'operation': row.get('operation_name', '')
-                        })
-                    
-            except Exception as e:
-                errors.append(_('Row %d: %s') % (row_number, str(e)))
+        job = self.env['mrp.bom.import.job'].create({
+            'name': self.file_name or _('BoM Import'),
+            'file_name': self.file_name,
+            'delimiter': self.delimiter,
+            'import_mode': self.import_mode,
+            'mapping_id': self.mapping_id.id,
+        })
+        # El archivo pasa al trabajo sin copiarlo
+        self.env['ir.attachment'].sudo().search([
+            ('res_model', '=', self._name),
+            ('res_field', '=', 'file_data'),
+            ('res_id', '=', self.id)
+        ]).write({'res_model': job._name, 'res_id': job.id})
+        job.invalidate_recordset(['file_data'])
+        self.job_id = job
+        # El cron importa el archivo en cuanto se confirma esta transacción
+        job._enqueue()
+        self.state = 'queued'
+        return self._reopen()
+
+    def action_preview(self):
+        """Report what the import would do, without creating anything"""
+        self.ensure_one()
         
-        # Procesar última BoM
-        if current_bom_code and current_bom_code in bom_data:
-            result = self._create_bom(bom_data[current_bom_code])
-            if result.get('success'):
-                imported_boms.append(result['bom'])
-            else:
-                errors.append(result['error'])
+        if not self.with_context(bin_size=True).file_data:
+            raise UserError(_('Please select a file to import.'))
         
-        # Actualizar resultados
-        if imported_boms:
-            self.state = 'done'
-            self.imported_count = len(imported_boms)
-            self.result_message = _('Successfully imported %d Bill of Materials') % len(imported_boms)
-        else:
-            self.state = 'error'
-            self.result_message = _('No Bill of Materials were imported')
+        try:
+            # Trabajo temporal para reutilizar la lectura y la planificación;
+            # todo lo que escribe se deshace con el savepoint
+            with self.env.cr.savepoint() as savepoint:
+                job = self.env['mrp.bom.import.job'].create({
+                    'name': self.file_name or _('BoM Import'),
+                    'file_name': self.file_name,
+                    'delimiter': self.delimiter,
+                    'import_mode': self.import_mode,
+                    'mapping_id': self.mapping_id.id,
+                })
+                with job._open_file(self) as binary_file:
+                    preview_message = job._preview(binary_file)
+                savepoint.rollback()
+        except (UnicodeDecodeError, csv.Error, EOFError, OSError, zipfile.BadZipFile) as e:
+            raise UserError(_('Error reading file: %s') % str(e))
         
-        if errors:
-            self.error_message = '\n'.join(errors[:50])  # Limitar a 50 errores
-            if len(errors) > 50:
-                self.error_message += _('\n... and %d more errors') % (len(errors) - 50)
+        self.write({'state': 'preview', 'preview_message': preview_message})
+        return self._reopen()
+
+    def action_back(self):
+        """Go back to the file selection after a preview"""
+        self.ensure_one()
+        self.state = 'draft'
+        return self._reopen()
+
+    def action_refresh(self):
+        """Refresh the progress of a background import"""
+        self.ensure_one()
+        self._update_from_job()
+        return self._reopen()
+
+    def _update_from_job(self):
+        """Show the results of the import job once it is finished"""
+        job = self.job_id
+        if job.state not in ('done', 'error'):
+            return
         
+        self.write({
+            'state': job.state,
+            'imported_count': job.imported_count,
+            'result_message': job.result_message,
+            'error_message': job.error_message,
+        })
+
+    def _reopen(self):
+        """Reopen the wizard on its current state"""
         return {
             'type': 'ir.actions.act_window',
             'res_model': 'mrp.bom.import.wizard',
@@ -133,127 +151,6 @@ class MrpBomImportWizard(models.TransientModel):
             'context': self.env.context,
         }
 
-    def _create_bom(self, bom_info):
-        """Create a BoM with its components"""
-        try:
-            # Buscar producto principal
-            product = self._find_product(bom_info['product_code'])
-            
-            if not product:
-                return {
-                    'success': False,
-                    'error': _('BoM %s: Product %s not found') % (bom_info['code'], bom_info['product_code'])
-                }
-            
-            # Obtener UoM
-            uom = self._get_uom(bom_info['product_uom'], product.uom_id)
-            
-            # Verificar si ya existe una BoM con este código
-            existing_bom = self.env['mrp.bom'].search([('code', '=', bom_info['code'])], limit=1)
-            if existing_bom:
-                return {
-                    'success': False,
-                    'error': _('BoM with code %s already exists') % bom_info['code']
-                }
-            
-            # Crear BoM
-            bom_vals = {
-                'code': bom_info['code'],
-                'product_tmpl_id': product.product_tmpl_id.id,
-                'product_id': product.id,
-                'product_qty': bom_info['product_qty'],
-                'product_uom_id': uom.id,
-                'type': bom_info['type'] if bom_info['type'] in ['normal', 'phantom'] else 'normal',
-                'bom_line_ids': []
-            }
-            
-            # Procesar componentes
-            for comp in bom_info['components']:
-                comp_product = self._find_product(comp['product_code'])
-                
-                if not comp_product:
-                    return {
-                        'success': False,
-                        'error': _('BoM %s: Component %s not found') % (bom_info['code'], comp['product_code'])
-                    }
-                
-                comp_uom = self._get_uom(comp['uom'], comp_product.uom_id)
-                
-                line_vals = {
-                    'product_id': comp_product.id,
-                    'product_qty': comp['qty'],
-                    'product_uom_id': comp_uom.id,
-                }
-                
-                # Si hay operación especificada
-                if comp['operation']:
-                    operation = self.env['mrp.routing.workcenter'].search([
-                        ('name', '=', comp['operation']),
-                        ('bom_id', '=', False)  # Buscaremos operaciones plantilla
-                    ], limit=1)
-                    if operation:
-                        line_vals['operation_id'] = operation.id
-                
-                bom_vals['bom_line_ids'].append((0, 0, line_vals))
-            
-            # Crear BoM
-            bom = self.env['mrp.bom'].create(bom_vals)
-            
-            return {
-                'success': True,
-                'bom': bom
-            }
-            
-        except Exception as e:
-            return {
-                'success': False,
-                'error': _('BoM %s: %s') % (bom_info['code'], str(e))
-            }
-
-    def _get_uom(self, uom_name, default_uom):
-        """Get UoM by name or return default"""
-        if not uom_name:
-            return default_uom
-        
-        uom = self.env['uom.uom'].search([('name', '=', uom_name)], limit=1)
-        if not uom:
-            # Buscar por nombre corto
-            uom = self.env['uom.uom'].search([('name', 'ilike', uom_name)], limit=1)
-        
-        return uom or default_uom
-
-    def _find_product(self, product_code):
-        """Find product by code, barcode or external ID"""
-        if not product_code:
-            return False
-        
-        # Primero buscar por ID externo (formato: __export__.model_name_id_hash)
-        if product_code.startswith('__export__.'):
-            try:
-                # Extraer el modelo y buscar
-                if 'product_template_' in product_code:
-                    # Es una plantilla de producto
-                    template = self.env.ref(product_code, raise_if_not_found=False)
-                    if template and template._name == 'product.template':
-                        # Retornar la primera variante
-                        return template.product_variant_ids[:1]
-                elif 'product_product_' in product_code:
-                    # Es una variante de producto
-                    product = self.env.ref(product_code, raise_if_not_found=False)
-                    if product and product._name == 'product.product':
-                        return product
-            except:
-                pass
-        
-        # Buscar por código interno o código de barras
-        product = self.env['product.product'].search([
-            '|',
-            ('default_code', '=', product_code),
-            ('barcode', '=', product_code)
-        ], limit=1)
-        
-        return product
-
     def action_view_boms(self):
         """Open BoMs list view"""
         return {